@@ -0,0 +1,191 @@
+# Times every engine on random boards of several densities and on well-known patterns,
+# at sizes from 20x20 to 4096x4096, writes the results as JSON and compares them with a
+# checked-in baseline. Timings depend on the machine, so the baseline should be
+# regenerated (--update-baseline) on the machine the comparison runs on.
+#
+#   python -m benchmarks.engines --quick                 # small boards only, compare with the baseline
+#   python -m benchmarks.engines --output results.json   # full sweep
+#   python -m benchmarks.engines --update-baseline       # record a new baseline
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+import numpy as np
+from src.textual_game_of_life.engines import ENGINES, Engine
+from src.textual_game_of_life.patterns import PATTERNS, place, read_rle
+from src.textual_game_of_life.rules import LeniaRule
+
+BASELINE: Path = Path(__file__).with_name("baseline.json")
+
+SIZES: tuple[int, ...] = (20, 100, 512, 1024, 2048, 4096)
+QUICK_SIZES: tuple[int, ...] = (20, 100, 512)
+DENSITIES: tuple[float, ...] = (0.05, 0.35, 0.7)
+# Cells per side of the lattice of blocks on the settled board
+SETTLED_CELL: int = 8
+
+# Each timed run is repeated with twice the generations until it lasts at least this long
+MIN_TIME: float = 0.05
+MAX_GENERATIONS: int = 1 << 12
+REPEATS: int = 3
+
+# A case is a regression when it is this much slower than the baseline
+THRESHOLD: float = 0.25
+
+
+def make_board(board: str, size: int, seed: int = 0) -> np.ndarray | None:
+    # "density-0.35" is a random board with that fraction of live cells,
+    # "pattern-glider" a known pattern in the middle of an empty board, and
+    # "settled-blocks" a mostly settled board: a lattice of block still lifes with one
+    # blinker in the middle, where engines skipping unchanged cells should shine
+    kind, _, name = board.partition("-")
+    if kind == "density":
+        return (np.random.default_rng(seed).random((size, size)) < float(name)).astype(np.uint8)
+    if kind == "settled":
+        cell = SETTLED_CELL
+        lattice = np.zeros((cell, cell), dtype=np.uint8)
+        lattice[3:5, 3:5] = 1
+        whole = size - size % cell
+        board_cells = np.zeros((size, size), dtype=np.uint8)
+        board_cells[:whole, :whole] = np.tile(lattice, (whole // cell, whole // cell))
+        middle = size // 2 // cell * cell
+        board_cells[middle : middle + cell, middle : middle + cell] = 0
+        board_cells[middle + 4, middle + 3 : middle + 6] = 1
+        return board_cells
+    cells, _ = read_rle(PATTERNS[name])
+    if cells.shape[0] > size or cells.shape[1] > size:
+        return None
+    return place(cells, size, size)
+
+
+def time_engine(engine: Engine, board: np.ndarray) -> float:
+    # Seconds per generation, the best of several identical runs. Every run starts from a
+    # copy of the board stepped once untimed, so per-size buffers and caches already exist,
+    # and runs enough generations to last at least MIN_TIME.
+    def timed(generations: int) -> float:
+        cells = board.copy()
+        engine.reset()
+        engine.advance_into(cells, cells, 1)
+        start = time.perf_counter()
+        engine.advance_into(cells, cells, generations)
+        return time.perf_counter() - start
+
+    generations = 1
+    elapsed = timed(generations)
+    while elapsed < MIN_TIME and generations < MAX_GENERATIONS:
+        generations *= 2
+        elapsed = timed(generations)
+    return min([elapsed] + [timed(generations) for _ in range(REPEATS - 1)]) / generations
+
+
+def run(engines: list[str], sizes: tuple[int, ...], boards: list[str]) -> dict[str, dict[str, float | int | str]]:
+    results: dict[str, dict[str, float | int | str]] = {}
+    for name in engines:
+        for size in sizes:
+            for board_name in boards:
+                board = make_board(board_name, size)
+                if board is None:
+                    continue
+                engine = ENGINES[name]()
+                if isinstance(engine.rule, LeniaRule):
+                    board = board.astype(np.float32)
+
+                seconds = time_engine(engine, board)
+                key = f"{name}/{size}x{size}/{board_name}"
+                results[key] = {
+                    "engine": name,
+                    "size": size,
+                    "board": board_name,
+                    "seconds_per_generation": seconds,
+                    "cells_per_second": size * size / seconds,
+                }
+                print(f"{key:<45} {seconds * 1000:>12.4f} ms/gen {size * size / seconds:>12.4g} cells/s", flush=True)
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float | int | str]],
+    baseline: dict[str, dict[str, float | int | str]],
+    threshold: float = THRESHOLD,
+) -> list[str]:
+    # Keys of the cases that are slower than the baseline by more than the threshold
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = float(result["seconds_per_generation"]) / float(baseline[key]["seconds_per_generation"])
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            print(f"REGRESSION {key}: {ratio:.2f}x the baseline time")
+    return regressions
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the simulation engines")
+    _ = parser.add_argument("--engines", type=str, default=",".join(ENGINES), help="Comma separated engine names")
+    _ = parser.add_argument("--sizes", type=str, help="Comma separated board sizes (default: 20 up to 4096)")
+    _ = parser.add_argument("--quick", action="store_true", help="Only boards up to 512x512, e.g. for CI")
+    _ = parser.add_argument("--output", type=str, help="Write the results to this JSON file")
+    _ = parser.add_argument(
+        "--baseline", type=str, default=str(BASELINE), help=f"Baseline to compare with (default: {BASELINE.name})"
+    )
+    _ = parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help=f"Allowed slowdown against the baseline as a fraction (default: {THRESHOLD})",
+    )
+    _ = parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    engines = args.engines.split(",")
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        parser.error(f"Unknown engines: {', '.join(sorted(unknown))}")
+    if args.sizes:
+        sizes = tuple(int(size) for size in args.sizes.split(","))
+    else:
+        sizes = QUICK_SIZES if args.quick else SIZES
+    boards = [f"density-{density}" for density in DENSITIES] + [f"pattern-{name}" for name in PATTERNS]
+    boards.append("settled-blocks")
+
+    results = run(engines, sizes, boards)
+    report = {"environment": environment(), "results": results}
+
+    if args.output:
+        _ = Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        # Keep the baseline's cases that weren't run this time
+        if baseline_path.exists():
+            previous = json.loads(baseline_path.read_text())["results"]
+            report["results"] = {**previous, **results}
+        _ = baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}, nothing to compare with")
+        return 0
+    regressions = compare(results, json.loads(baseline_path.read_text())["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# Runs the full TUI headless with Textual's Pilot, lets the simulation run at maximum
+# speed on random boards and records every frame: the time spent in Canvas.render_line,
+# the regions the canvas asked to refresh, the bytes the update would write to the
+# terminal and the frame latency, from the first refresh request to the frame being
+# displayed. Reports p50/p95/p99 so the UI can be compared with refresh_interval.
+#
+#   python -m benchmarks.tui                       # 3 boards of 100x100 for 5 seconds each
+#   python -m benchmarks.tui --boards 1 --seconds 2 --output tui.json
+import argparse
+import asyncio
+import json
+import sys
+import time
+import numpy as np
+from rich.console import RenderableType
+from textual._compositor import CompositorUpdate
+from textual.geometry import Region
+from textual.screen import Screen
+from textual.strip import Strip
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.tui import CellularAutomatonTui
+
+WIDTH: int = 100
+HEIGHT: int = 100
+SECONDS: float = 5.0
+BOARDS: int = 3
+
+# The metrics summarised for every run, all per frame
+METRICS: tuple[str, ...] = ("latency", "render_line_seconds", "render_lines", "refresh_regions", "bytes")
+
+
+class FrameRecorder:
+    # Wraps the canvas' render_line and refresh and the app's display hook to collect
+    # per-frame numbers. A headless driver writes nothing, so the bytes are those the
+    # update would have written to a real terminal.
+    def __init__(self, app: CellularAutomatonTui, canvas: Canvas) -> None:
+        self.frames: list[dict[str, float | int]] = []
+        self._render_seconds: float = 0.0
+        self._render_lines: int = 0
+        self._refresh_regions: int = 0
+        self._first_request: float | None = None
+
+        render_line, refresh = canvas.render_line, canvas.refresh
+        display = app._display  # pyright: ignore[reportPrivateUsage]
+
+        def timed_render_line(y: int) -> Strip:
+            start = time.perf_counter()
+            strip = render_line(y)
+            self._render_seconds += time.perf_counter() - start
+            self._render_lines += 1
+            return strip
+
+        def counted_refresh(*regions: Region, **kwargs: bool) -> Canvas:
+            # A refresh without regions repaints the whole widget, which counts as one region
+            self._refresh_regions += max(1, len(regions))
+            if self._first_request is None:
+                self._first_request = time.perf_counter()
+            return refresh(*regions, **kwargs)
+
+        def recorded_display(screen: Screen[None], renderable: RenderableType | None) -> None:
+            display(screen, renderable)
+            if not isinstance(renderable, CompositorUpdate) or not self._render_lines:
+                # Updates that don't involve the canvas, e.g. the footer
+                return
+            now = time.perf_counter()
+            self.frames.append(
+                {
+                    "time": now,
+                    "latency": now - (self._first_request or now),
+                    "render_line_seconds": self._render_seconds,
+                    "render_lines": self._render_lines,
+                    "refresh_regions": self._refresh_regions,
+                    "bytes": len(renderable.render_segments(app.console).encode()),
+                }
+            )
+            self._render_seconds, self._render_lines, self._refresh_regions = 0.0, 0, 0
+            self._first_request = None
+
+        canvas.render_line = timed_render_line  # pyright: ignore[reportAttributeAccessIssue]
+        canvas.refresh = counted_refresh  # pyright: ignore[reportAttributeAccessIssue]
+        app._display = recorded_display  # pyright: ignore[reportAttributeAccessIssue]
+
+
+async def measure(
+    seed: int,
+    seconds: float,
+    width: int = WIDTH,
+    height: int = HEIGHT,
+    rate: float | None = None,
+    fps: float = 30.0,
+    display_mode: str = "blocks",
+) -> dict[str, object]:
+    # One random board, toggled on at maximum speed (or the target rate) for the given
+    # time and then off again
+    np.random.seed(seed)
+    app = CellularAutomatonTui(
+        width=width, height=height, speed=0.1, random_start=True, rate=rate, fps=fps, display_mode=display_mode
+    )
+    # Room for every cell, the margins and the footer
+    columns, across, down = Canvas.DISPLAY_MODES[display_mode]
+    size = (-(-width // across) * columns + 10, -(-height // down) + 10)
+    async with app.run_test(size=size) as pilot:
+        await pilot.pause()
+        recorder = FrameRecorder(app, app.canvas)
+        start = time.perf_counter()
+        await pilot.press("t")
+        await asyncio.sleep(seconds)
+        # Generations are computed on the canvas' simulation thread
+        simulation = app.canvas.simulation
+        generations = simulation.generation if simulation is not None else 0
+        # A busy event loop oversleeps, so rates use the time that actually passed
+        elapsed = time.perf_counter() - start
+        await pilot.press("t")
+        await pilot.pause()
+
+        frames = recorder.frames
+        intervals = np.diff([frame["time"] for frame in frames])
+        return {
+            "seed": seed,
+            "seconds": elapsed,
+            "refresh_interval": app.canvas.refresh_interval,
+            "fps": app.canvas.fps,
+            "display_mode": display_mode,
+            "generations": generations,
+            "frames": [{key: frame[key] for key in METRICS} for frame in frames],
+            "frame_interval": float(intervals.mean()) if len(intervals) else None,
+        }
+
+
+def percentiles(values: list[float | int]) -> dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+def summarise(runs: list[dict[str, object]]) -> dict[str, object]:
+    frames: list[dict[str, float | int]] = [frame for run in runs for frame in run["frames"]]  # pyright: ignore
+    intervals = [run["frame_interval"] for run in runs if run["frame_interval"] is not None]
+    seconds = sum(float(run["seconds"]) for run in runs)  # pyright: ignore[reportArgumentType]
+    generations = sum(int(run["generations"]) for run in runs)  # pyright: ignore[reportArgumentType]
+    return {
+        "frames": len(frames),
+        "frames_per_second": len(frames) / seconds if seconds else 0.0,
+        "generations_per_second": generations / seconds if seconds else 0.0,
+        "refresh_interval": runs[0]["refresh_interval"] if runs else None,
+        "fps": runs[0]["fps"] if runs else None,
+        "mean_frame_interval": float(np.mean(intervals)) if intervals else None,
+        **{metric: percentiles([frame[metric] for frame in frames]) for metric in METRICS},
+    }
+
+
+def format_summary(summary: dict[str, object]) -> str:
+    lines = [
+        f"{summary['frames']} frames, {summary['frames_per_second']:.1f} frames/sec,"
+        f" {summary['generations_per_second']:.1f} generations/sec",
+    ]
+    if summary["mean_frame_interval"] is not None:
+        lines.append(
+            f"mean frame interval {summary['mean_frame_interval'] * 1000:.1f} ms"
+            f" (refresh_interval {summary['refresh_interval'] * 1000:.0f} ms,"  # pyright: ignore[reportOperatorIssue]
+            f" {summary['fps']:g} fps cap)"
+        )
+    units = {"latency": 1000, "render_line_seconds": 1000}
+    for metric in METRICS:
+        values: dict[str, float] = summary[metric]  # pyright: ignore[reportAssignmentType]
+        scale = units.get(metric, 1)
+        suffix = " ms" if metric in units else ""
+        lines.append(
+            f"{metric:<20} " + "  ".join(f"{name} {value * scale:>10.2f}{suffix}" for name, value in values.items())
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the TUI's frames while the simulation runs")
+    _ = parser.add_argument("--boards", type=int, default=BOARDS, help=f"Random boards to run (default: {BOARDS})")
+    _ = parser.add_argument("--seconds", type=float, default=SECONDS, help=f"Run time per board (default: {SECONDS})")
+    _ = parser.add_argument("--width", type=int, default=WIDTH, help=f"Board width (default: {WIDTH})")
+    _ = parser.add_argument("--height", type=int, default=HEIGHT, help=f"Board height (default: {HEIGHT})")
+    _ = parser.add_argument(
+        "--rate", type=float, help="Target generations per second instead of maximum speed, 0 for unlimited"
+    )
+    _ = parser.add_argument("--fps", type=float, default=30.0, help="Canvas frame rate cap (default: 30)")
+    _ = parser.add_argument(
+        "--display", choices=list(Canvas.DISPLAY_MODES), default="blocks", help="Canvas display mode (default: blocks)"
+    )
+    _ = parser.add_argument("--output", type=str, help="Write the summary and every frame to this JSON file")
+    args = parser.parse_args(argv)
+
+    runs = [
+        asyncio.run(measure(seed, args.seconds, args.width, args.height, args.rate, args.fps, args.display))
+        for seed in range(args.boards)
+    ]
+    summary = summarise(runs)
+    print(format_summary(summary))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"summary": summary, "runs": runs}, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
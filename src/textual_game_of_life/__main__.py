@@ -1,5 +1,6 @@
 import argparse
-from .tui import CellularAutomatonTui
+from .engines import DEFAULT_ENGINE, ENGINES, create_engine, engine_for
+from .rules import DEFAULT_RULE, parse_rule
 
 
 def main():
@@ -9,12 +10,98 @@ def main():
     _ = parser.add_argument(
         "--speed", type=float, default=0.5, help="Simulation speed - lower is faster (default: 0.5)"
     )
+    _ = parser.add_argument(
+        "--rate",
+        type=float,
+        help="Target generations per second instead of --speed, 0 for as fast as possible",
+    )
+    _ = parser.add_argument(
+        "--fps", type=float, default=30.0, help="Most times per second the running canvas is redrawn (default: 30)"
+    )
+    _ = parser.add_argument(
+        "--display",
+        choices=["blocks", "half", "braille"],
+        default="blocks",
+        help=(
+            "Draw cells as blocks two columns wide, as half blocks two rows to a line, or as braille dots"
+            " 2x4 to a character for very large boards (default: blocks)"
+        ),
+    )
+    _ = parser.add_argument(
+        "--minimap", action="store_true", help="Show an overview of the whole board beside the canvas"
+    )
     _ = parser.add_argument("--brush-size", type=int, default=1, help="Initial brush size (default: 1)")
-    _ = parser.add_argument("--load", type=str, help="Load a saved game state from file")
+    _ = parser.add_argument(
+        "--load", type=str, help="Load a saved game state (.textual), macrocell (.mc) or RLE pattern (.rle) file"
+    )
     _ = parser.add_argument("--random", action="store_true", help="Start with a random pattern")
+    _ = parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        help=f"Simulation engine (default: {DEFAULT_ENGINE}, or the first engine able to run the rule)",
+    )
+    _ = parser.add_argument(
+        "--rule",
+        default=DEFAULT_RULE,
+        help=(
+            "Life-like rule in B/S notation, e.g. B36/S23, an isotropic rule in Hensel notation, e.g. B3/S2-i34q,"
+            " a Generations rule in B/S/C notation, e.g. B2/S/C3, a Larger than Life rule, e.g."
+            " R5,C0,M1,S34..58,B34..45,NM, a continuous Lenia rule, e.g. R=13;T=10;m=0.15;s=0.015;b=1,"
+            f" or a name such as highlife, briansbrain, bosco or orbium (default: {DEFAULT_RULE})"
+        ),
+    )
+    _ = parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run the simulation without the terminal UI and report its throughput (starts random unless --load)",
+    )
+    _ = parser.add_argument("--generations", type=int, help="Number of generations to run in headless mode")
+    _ = parser.add_argument(
+        "--output",
+        type=str,
+        help="File the final headless state is written to, .mc for a macrocell (default: not written)",
+    )
+    _ = parser.add_argument("--seed", type=int, help="Seed for the random starting board in headless mode")
 
     args = parser.parse_args()
 
+    # Check the rule, and that the chosen engine can run it, before starting the UI
+    try:
+        rule = parse_rule(args.rule)
+        _ = create_engine(args.engine or engine_for(rule), rule)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.rate is not None and args.rate < 0:
+        parser.error("--rate can't be negative")
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+
+    if args.headless:
+        if args.generations is None or args.generations < 0:
+            parser.error("--headless needs --generations N")
+
+        # Imported here so headless runs never load the terminal UI
+        from .headless import format_report, run
+
+        try:
+            report = run(
+                args.generations,
+                width=args.width,
+                height=args.height,
+                rule=args.rule,
+                engine=args.engine,
+                load_file=args.load,
+                output=args.output,
+                seed=args.seed,
+            )
+        except (OSError, ValueError) as error:
+            parser.exit(1, f"error: {error}\n")
+        print(format_report(report))
+        return
+
+    from .tui import CellularAutomatonTui
+
     app = CellularAutomatonTui(
         width=args.width,
         height=args.height,
@@ -22,6 +109,12 @@ def main():
         brush_size=args.brush_size,
         load_file=args.load,
         random_start=args.random,
+        engine=args.engine,
+        rule=args.rule,
+        rate=args.rate,
+        fps=args.fps,
+        display_mode=args.display,
+        minimap=args.minimap,
     )
     _ = app.run()
 
@@ -1,10 +1,14 @@
 import asyncio
+import math
 import random
 import time
+import weakref
 import numpy as np
+from rich.color import Color, blend_rgb
 from rich.segment import Segment
 from rich.style import Style
 from textual import events
+from textual.cache import LRUCache
 from textual.geometry import Offset, Region
 from textual.message import Message
 from textual.reactive import var
@@ -12,6 +16,11 @@ from textual.strip import Strip
 from textual.widget import Widget
 from typing_extensions import override
 from . import Operation
+from .engines import create_engine, engine_for
+from .hashlife import HashlifeEngine
+from .patterns import place
+from .rules import DEFAULT_RULE, AnyRule, LeniaRule, parse_rule
+from .simulation import SimulationThread
 
 
 class Canvas(Widget):
@@ -49,15 +58,62 @@ class Canvas(Widget):
     """
     ROW_HEIGHT: int = 2
 
+    # How cells are drawn, as the terminal columns of one glyph and the cells across and
+    # down it shows. "blocks" draws each cell as ROW_HEIGHT spaces; "half" stacks two cells
+    # in one column of a ▀ glyph, the top cell in its foreground colour and the bottom one
+    # in its background, so the same terminal shows twice the columns and twice the rows.
+    # "braille" shows 2x4 cells per column as the dots of one braille character, for
+    # boards far bigger than the terminal; cells are only shown as live or dead.
+    DISPLAY_MODES: dict[str, tuple[int, int, int]] = {
+        "blocks": (ROW_HEIGHT, 1, 1),
+        "half": (1, 1, 2),
+        "braille": (1, 2, 4),
+    }
+    HALF_BLOCK: str = "\u2580"
+    # A braille character is U+2800 plus the weight of each raised dot, by row and column
+    BRAILLE_BLANK: int = 0x2800
+    BRAILLE_WEIGHTS: np.ndarray = np.array([[1, 8], [2, 16], [4, 32], [64, 128]], dtype=np.uint8)
+
     CANVAS_OFFSET: int = 2
 
-    MAX_CANVAS_HEIGHT: int = 100
-    MAX_CANVAS_WIDTH: int = 100
+    # The board's size is independent of the terminal, which shows a view of it
+    MAX_CANVAS_HEIGHT: int = 10_000
+    MAX_CANVAS_WIDTH: int = 10_000
+    # Panning with the keyboard moves the view by this part of its size
+    PAN_FRACTION: float = 0.25
+    # Cells the view moves per step of the mouse wheel
+    WHEEL_CELLS: int = 3
+    # Zoomed out, each glyph shows blocks of zoom x zoom cells, for zooms up to this
+    MAX_ZOOM: int = 64
+    # How a block of cells is shown: live if any cell is, or shaded by its live fraction
+    ZOOM_REDUCTIONS: tuple[str, ...] = ("max", "density")
+
+    # Continuous cell values are rendered as one of this many shades
+    GRADIENT_LEVELS: int = 16
+
+    # Rendered rows kept for reuse; still lifes, oscillators and empty space repeat
+    # the same rows over and over
+    ROW_CACHE_SIZE: int = 1024
 
     MAX_BRUSH_SIZE: int = 10
     MIN_BRUSH_SIZE: int = 1
 
     refresh_interval: float = 0.5
+    MIN_REFRESH_INTERVAL: float = 0.1
+    # At the minimum interval several generations are computed per refresh
+    MAX_SPEED_BATCH: int = 3
+    # While running, the canvas is repainted at most this many times per second. Changes
+    # are collected between frames and refreshed together, and generations computed in
+    # between are simulated but never shown.
+    fps: float = 30.0
+    # With a target rate, generations are computed in batches filling this many seconds
+    FRAME_BUDGET: float = 1 / 30
+    MIN_TARGET_RATE: float = 1.0
+
+    # Generations per second to aim for instead of one step per refresh_interval;
+    # math.inf runs as fast as possible
+    target_rate: float | None = None
+    rate_style: Style = Style(color="bright_white", bgcolor="dark_green", bold=True)
 
     message: str = ""
     message_visible: bool = False
@@ -68,19 +124,49 @@ class Canvas(Widget):
 
     brush_size: int = 1
 
+    # Jump ahead advances 2**jump_exponent generations at once
+    jump_exponent: int = 10
+    # A jump is being computed in the background
+    jumping: bool = False
+
     canvas_height: int = 20
     canvas_width: int = 20
     cursor_square: var[Offset] = var(Offset(0, 0))
+    # The board cell at the top left of the view
+    view_origin: Offset = Offset(0, 0)
+    # Cells per side of the blocks shown as one cell, a power of two
+    zoom: int = 1
+    zoom_reduce: str = "max"
     running: bool = False
     x: int = -1
     y: int = -1
-    cursor_colour: str = "black"
-
-    def __init__(self, width: int = 20, height: int = 20, speed: float = 0.5, brush_size: int = 1) -> None:
+    cursor_colour: var[str] = var("black")
+    display_mode: str = "blocks"
+
+    def __init__(
+        self,
+        width: int = 20,
+        height: int = 20,
+        speed: float = 0.5,
+        brush_size: int = 1,
+        engine: str | None = None,
+        rule: str = DEFAULT_RULE,
+        rate: float | None = None,
+        fps: float = 30.0,
+        display_mode: str = "blocks",
+    ) -> None:
         super().__init__()
+        self.rule: AnyRule = parse_rule(rule)
+        self.engine = create_engine(engine or engine_for(self.rule), self.rule)
         self.canvas_width = width
         self.canvas_height = height
         self.refresh_interval = speed
+        # A rate of 0 asks for as fast as possible
+        self.target_rate = math.inf if rate == 0 else rate
+        self.fps = fps
+        if display_mode not in self.DISPLAY_MODES:
+            raise ValueError(f"Unknown display mode {display_mode!r}, choose from {', '.join(self.DISPLAY_MODES)}")
+        self.display_mode = display_mode
         self.brush_size = max(min(brush_size, self.MAX_BRUSH_SIZE), self.MIN_BRUSH_SIZE)
         self.mouse_captured: bool = True
 
@@ -90,14 +176,59 @@ class Canvas(Widget):
         self.effective_max_width: int = 0  # Min of terminal constraint and MAX_CANVAS_WIDTH
         self.effective_max_height: int = 0  # Min of terminal constraint and MAX_CANVAS_HEIGHT
 
-        self.matrix: np.ndarray[tuple[int, int], np.dtype[np.int8]] = np.zeros(
-            (self.canvas_height + 1, self.canvas_width + 1), dtype=np.int8
+        self.matrix: np.ndarray[tuple[int, int], np.dtype[np.uint8 | np.float32]] = np.zeros(
+            (self.canvas_height + 1, self.canvas_width + 1), dtype=self.cell_dtype
         )
+        # Generations are computed into this buffer and then swapped with matrix
+        self.back_matrix: np.ndarray[tuple[int, int], np.dtype[np.uint8 | np.float32]] = np.zeros_like(self.matrix)
         self.message_visible = False
         self.message_timestamp = 0.0
         self.message_timeout = 3.0  # Default timeout in seconds
         self.message_task = None
 
+        # Computes generations off the event loop while the simulation runs
+        self.simulation: SimulationThread | None = None
+        # The matrix and board version when the last generation was shown, and its
+        # number; a newer version or another matrix means the board was edited since
+        self._shown: tuple[np.ndarray, int] | None = None
+        self._shown_generation: int = 0
+
+        # Areas to repaint with the next frame; _dirty_all repaints the whole canvas
+        self._dirty_regions: set[Region] = set()
+        self._dirty_all: bool = False
+        # XOR of the last two generations, see changed_spans
+        self._diff: np.ndarray = np.empty((0, 0), dtype=np.uint8)
+
+        # The cell a right button drag started on, see on_mouse_down
+        self._drag_anchor: Offset | None = None
+
+        # Counts changes to the board made in place, see board_changed
+        self.board_version: int = 0
+        # Rows changed since take_changed_rows was last called, and the matrix they were
+        # changed in, weakly held: a matrix replaced other than by own_matrix or a shown
+        # generation may differ in any row
+        self._changed_rows: np.ndarray = np.zeros(0, dtype=bool)
+        self._changed_in: weakref.ref[np.ndarray] | None = None
+        # The board reduced by 2, 4, 8... for zooming out, built from the matrix and kept
+        # until the board changes, see pyramid_level
+        self._pyramid: list[np.ndarray] = []
+        self._pyramid_source: np.ndarray | None = None
+        self._pyramid_key: tuple[int, str, int, int] | None = None
+
+        # Created on first use so its node caches are kept between jumps
+        self.hashlife: HashlifeEngine | None = None
+
+        # Style for each cell state, resolved from the CSS once and kept until the rule's
+        # state count changes or the CSS or theme is updated (see notify_style_update)
+        self._palette_key: tuple[int, bool] | None = None
+        self._palette: np.ndarray = np.empty(0, dtype=object)
+        self._state_styles: list[Style] = []
+        self._cursor_style: Style | None = None
+        # Foreground/background styles of half block glyphs, by top and bottom state
+        self._half_block_styles: dict[tuple[int, int], Style] = {}
+        # Lines without the cursor, keyed on their cells, the canvas width and the palette
+        self._row_strips: LRUCache[tuple[object, ...], Strip] = LRUCache(self.ROW_CACHE_SIZE)
+
     def request_message(self, text: str, timeout: float = 2.0) -> None:
         # Set message properties directly first to ensure it's displayed
         self.message = text
@@ -151,29 +282,164 @@ class Canvas(Widget):
             _ = self.refresh()
 
     def clear(self) -> None:
-        self.matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=np.int8)
+        self.reset_engine()
+        self.matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=self.cell_dtype)
         _ = self.refresh()
 
-    def step(self) -> None:
-        # Store old matrix to calculate changes
-        old_matrix = self.matrix.copy()
-        self.matrix = self.get_next_generation()
-
-        # Find regions that changed
-        changed = np.where(
-            old_matrix[: self.canvas_height, : self.canvas_width]
-            != self.matrix[: self.canvas_height, : self.canvas_width]
+    def reset_engine(self) -> None:
+        # While the simulation thread owns the engine it resets it itself, when it
+        # picks up the edited board
+        if self.simulation is None:
+            self.engine.reset()
+
+    def advance_buffers(self, generations: int = 1) -> np.ndarray:
+        # Compute into the back buffer and swap it with the front one, so stepping
+        # never copies or allocates a whole matrix. Returns the previous generation.
+        if (
+            self.back_matrix.shape != self.matrix.shape
+            or self.back_matrix.dtype != self.matrix.dtype
+            or not self.back_matrix.flags.writeable
+        ):
+            self.back_matrix = np.zeros_like(self.matrix)
+
+        self.engine.advance_into(
+            self.matrix[: self.canvas_height, : self.canvas_width],
+            self.back_matrix[: self.canvas_height, : self.canvas_width],
+            generations,
         )
+        # The spare row/column outside the canvas is always dead in a new generation
+        self.back_matrix[self.canvas_height :, :] = 0
+        self.back_matrix[:, self.canvas_width :] = 0
+
+        old_matrix = self.matrix
+        self.matrix, self.back_matrix = self.back_matrix, old_matrix
+        self.board_changed()
+        return old_matrix
+
+    def board_changed(self, rows: np.ndarray | slice | None = None) -> None:
+        # Call after changing cells of the matrix in place, with the rows changed (a
+        # slice or a mask) if they are known
+        self.board_version += 1
+        if rows is None or not self.tracking_rows:
+            self._changed_in = None
+        else:
+            self._changed_rows[rows] = True
+
+    @property
+    def tracking_rows(self) -> bool:
+        # Shrinking the canvas keeps the matrix but not its rows
+        return (
+            self._changed_in is not None
+            and self._changed_in() is self.matrix
+            and len(self._changed_rows) == self.canvas_height
+        )
+
+    def take_changed_rows(self) -> np.ndarray | None:
+        # The rows changed since the last call, or None if any may have, for views of the
+        # whole board that only redo the rows that changed (the minimap)
+        changed = self._changed_rows if self.tracking_rows else None
+        self._changed_in = weakref.ref(self.matrix)
+        self._changed_rows = np.zeros(self.canvas_height, dtype=bool)
+        return changed
+
+    def replace_matrix(self, matrix: np.ndarray) -> None:
+        # Swap in a matrix holding the same cells, keeping the rows changed so far
+        tracking = self.tracking_rows
+        self.matrix = matrix
+        if tracking:
+            self._changed_in = weakref.ref(matrix)
+
+    def own_matrix(self) -> None:
+        # Call before editing the matrix in place. Generations shown while running are the
+        # simulation thread's read-only snapshots, which are copied before being edited.
+        if not self.matrix.flags.writeable:
+            self.replace_matrix(self.matrix.copy())
+
+    def cells_edited(self, x: int, y: int, width: int = 1, height: int = 1) -> None:
+        # Call after editing cells of the matrix in place, rather than board_changed, so
+        # an engine keeping its own form of the board updates just those cells. While
+        # running, the simulation thread picks up the edited board instead.
+        if self.simulation is None:
+            self.engine.mark_edited(x, y, width, height)
+        self.board_changed(slice(y, y + height))
+
+    def step(self) -> None:
+        # The simulation thread owns the engine while it runs
+        if self.simulation is not None:
+            return
+        old_matrix = self.advance_buffers()
+        self.refresh_changes(old_matrix)
+        _ = self.flush_dirty()
+
+    def mark_dirty(self, *regions: Region) -> None:
+        # Collect areas to repaint with the next frame; no regions means the whole canvas
+        if not regions:
+            self._dirty_all = True
+            self._dirty_regions.clear()
+        elif not self._dirty_all:
+            self._dirty_regions.update(regions)
+
+    def flush_dirty(self) -> int:
+        # Repaint everything collected since the last frame with a single refresh.
+        # Returns the number of regions refreshed.
+        if self._dirty_all:
+            _ = self.refresh()
+            count = 1
+        else:
+            count = len(self._dirty_regions)
+            if count:
+                _ = self.refresh(*self._dirty_regions)
+        self._dirty_regions.clear()
+        self._dirty_all = False
+        return count
+
+    def changed_spans(self, old_matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # The rows in view that differ between two generations, with the first and last
+        # changed column of each in view. Cells are compared by XOR of their bits (float
+        # cells through an integer view of the same width) into a buffer kept between calls.
+        view = self.view
+        old = old_matrix[view.y : view.bottom, view.x : view.right]
+        new = self.matrix[view.y : view.bottom, view.x : view.right]
+        bits = np.dtype(f"u{new.dtype.itemsize}")
+        if self._diff.shape != new.shape or self._diff.dtype != bits:
+            self._diff = np.empty(new.shape, dtype=bits)
+        diff = np.bitwise_xor(old.view(bits), new.view(bits), out=self._diff)
+
+        rows = np.flatnonzero(diff.any(axis=1))
+        changed = diff[rows] != 0
+        first = changed.argmax(axis=1)
+        last = new.shape[1] - 1 - changed[:, ::-1].argmax(axis=1)
+        return rows + view.y, first + view.x, last + view.x
+
+    def refresh_changes(self, old_matrix: np.ndarray) -> None:
+        if self.zoom > 1:
+            # Zoomed out, a changed cell can change its block anywhere in the view, and the
+            # view is at most a screenful of glyphs: repaint it all
+            self.mark_dirty()
+            return
+        rows, first, last = self.changed_spans(old_matrix)
 
         # Only refresh if we have changes
-        if len(changed[0]) > 0:
+        if len(rows) > 0:
             # For larger changes, full refresh is more efficient
-            if len(changed[0]) > (self.canvas_height * self.canvas_width) / 4:
-                _ = self.refresh()
+            view = self.view
+            if (last - first + 1).sum() > view.area / 4:
+                self.mark_dirty()
             else:
-                # Refresh only the changed regions
-                for y, x in zip(changed[0], changed[1]):
-                    _ = self.refresh(self.get_square_region(Offset(x, y)))
+                # One region per changed row, from the glyph of its first to the glyph
+                # of its last changed cell
+                columns, across, down = self.glyph
+                self.mark_dirty(
+                    *(
+                        Region(
+                            (int(left) - view.x) // across * columns,
+                            (int(row) - view.y) // down,
+                            (int(right) // across - int(left) // across + 1) * columns,
+                            1,
+                        ).translate(-self.scroll_offset)
+                        for row, left, right in zip(rows, first, last)
+                    )
+                )
         else:
             # No changes - could indicate a stable pattern
             pass
@@ -187,36 +453,117 @@ class Canvas(Widget):
             # Only enter the animation loop if we're in a real event loop context
             # This prevents the "coroutine was never awaited" warning in tests
             if self.running and asyncio.get_event_loop().is_running():
-                last_update = time.time()
-                while self.running:
-                    now = time.time()
-                    elapsed = now - last_update
-
-                    # Ensure refresh_interval is never below the minimum threshold
-                    if self.refresh_interval < 0.1:
-                        self.refresh_interval = 0.1
-
-                    # For fast speeds, compute multiple generations at once
-                    if self.refresh_interval == 0.1:
-                        # Fixed batch size for maximum speed
-                        batch_size = 3  # Use a reasonable fixed value instead of dynamic calculation
-                        for _ in range(batch_size):
-                            self.matrix = self.get_next_generation()
-                        _ = self.refresh()
-                    else:
-                        self.step()
-
-                    # Calculate time remaining to wait, with a minimum to prevent CPU overload
-                    elapsed = time.time() - now
-                    wait_time = max(0.01, self.refresh_interval - elapsed)
-                    await asyncio.sleep(wait_time)
-                    last_update = now
+                simulation = self.start_simulation()
+                try:
+                    # Generations are computed on the simulation thread; this loop only
+                    # picks up the latest one once per frame, so input is handled between
+                    # frames however long a generation takes. Toggling on again replaces
+                    # the thread, which ends this loop.
+                    while self.running and self.simulation is simulation:
+                        frame_start = time.perf_counter()
+                        _ = self.collect_generation()
+                        _ = self.flush_dirty()
+                        await asyncio.sleep(max(0.0, 1 / self.fps - (time.perf_counter() - frame_start)))
+                finally:
+                    self.stop_simulation(simulation)
         except RuntimeError:
             # No running event loop or other runtime error
             # The running state is already toggled at the start of the method
             pass
 
-    def get_neighbours(self, x: int, y: int) -> np.ndarray[tuple[int, ...], np.dtype[np.int8]]:
+    def start_simulation(self) -> SimulationThread:
+        if self.simulation is not None:
+            self.stop_simulation(self.simulation)
+        cells = self.matrix[: self.canvas_height, : self.canvas_width]
+        # Snapshots come with the matrix's spare row and column, so they are shown as they are
+        self.simulation = SimulationThread(self.engine, cells, self.refresh_interval, spare=1)
+        self.update_simulation_speed()
+        self._shown = (self.matrix, self.board_version)
+        self._shown_generation = 0
+        self.simulation.start()
+        return self.simulation
+
+    def stop_simulation(self, simulation: SimulationThread) -> None:
+        # Waits for the batch in progress, so the engine is free again afterwards
+        simulation.stop()
+        if self.simulation is simulation:
+            self.simulation = None
+            self._shown = None
+            if self.target_rate is not None:
+                # Remove the rate overlay
+                _ = self.refresh()
+
+    def update_simulation_speed(self) -> None:
+        # Ensure refresh_interval is never below the minimum threshold
+        if self.refresh_interval < self.MIN_REFRESH_INTERVAL:
+            self.refresh_interval = self.MIN_REFRESH_INTERVAL
+        if self.target_rate is not None and not math.isinf(self.target_rate):
+            self.target_rate = max(self.target_rate, self.MIN_TARGET_RATE)
+        if self.simulation is not None:
+            self.simulation.target_rate = self.target_rate
+            if self.target_rate is not None:
+                # The thread sizes its batches to the rate and their measured cost
+                self.simulation.interval = self.FRAME_BUDGET
+                return
+            self.simulation.interval = self.refresh_interval
+            # For fast speeds, compute multiple generations at once
+            at_max_speed = self.refresh_interval == self.MIN_REFRESH_INTERVAL
+            self.simulation.batch = self.MAX_SPEED_BATCH if at_max_speed else 1
+
+    @property
+    def achieved_rate(self) -> float:
+        return self.simulation.achieved_rate if self.simulation is not None else 0.0
+
+    def rate_text(self) -> str | None:
+        # Achieved against requested generations per second, shown while running with a target rate
+        if self.target_rate is None or self.simulation is None:
+            return None
+        requested = "max" if math.isinf(self.target_rate) else f"{self.target_rate:g}"
+        return f"{self.achieved_rate:.1f} / {requested} generations/sec"
+
+    def collect_generation(self) -> bool:
+        # Show the newest generation posted by the simulation thread, if any. Returns
+        # whether the canvas changed.
+        simulation = self.simulation
+        if simulation is None or self._shown is None:
+            return False
+        if simulation.engine is not self.engine:
+            # The rule changed: carry on from the current board with the new engine
+            _ = self.start_simulation()
+            return False
+        self.update_simulation_speed()
+
+        snapshot = simulation.mailbox.take()
+        if snapshot is None or snapshot.epoch != simulation.epoch:
+            # Nothing new, or computed from a board that has since been edited
+            return False
+
+        shown_matrix, shown_version = self._shown
+        if shown_matrix is not self.matrix or shown_version != self.board_version:
+            # Cells were drawn, loaded or resized since the last generation was shown:
+            # the simulation continues from the edited board instead
+            _ = simulation.load(self.matrix[: self.canvas_height, : self.canvas_width])
+            self._shown = (self.matrix, self.board_version)
+            return False
+
+        self.show_generation(snapshot.cells, snapshot.changed_rows)
+        self._shown = (self.matrix, self.board_version)
+        self._shown_generation = snapshot.generation
+        if self.target_rate is not None:
+            self.mark_dirty(Region(0, self.rate_line, self.size.width, 1))
+        return True
+
+    def show_generation(self, cells: np.ndarray, changed_rows: np.ndarray | None = None) -> None:
+        # Show a computed generation, with the matrix's spare row and column, by making it
+        # the matrix; the old matrix becomes the back buffer, as after a step. It is
+        # adopted without copying, read-only, see own_matrix.
+        old_matrix = self.matrix
+        self.replace_matrix(cells)
+        self.back_matrix = old_matrix
+        self.board_changed(changed_rows)
+        self.refresh_changes(old_matrix)
+
+    def get_neighbours(self, x: int, y: int) -> np.ndarray[tuple[int, ...], np.dtype[np.uint8 | np.float32]]:
         # Create the wrapped coordinates for the 3x3 neighborhood
         y_indices = (np.array([y - 1, y, y + 1])) % self.canvas_height
         x_indices = (np.array([x - 1, x, x + 1])) % self.canvas_width
@@ -228,37 +575,125 @@ class Canvas(Widget):
 
         return neighborhood_copy.flatten()
 
-    def get_next_generation(self) -> np.ndarray[tuple[int, int], np.dtype[np.int8]]:
-        # Create a padded matrix with wrap-around (toroidal) boundary conditions
-        padded = np.pad(self.matrix[: self.canvas_height, : self.canvas_width], ((1, 1), (1, 1)), mode="wrap")
+    def get_next_generation(self) -> np.ndarray[tuple[int, int], np.dtype[np.uint8 | np.float32]]:
+        new_canvas_matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=self.cell_dtype)
+        new_canvas_matrix[: self.canvas_height, : self.canvas_width] = self.engine.next_generation(
+            self.matrix[: self.canvas_height, : self.canvas_width]
+        )
+        return new_canvas_matrix
 
-        # Count neighbors for all cells at once using sum of shifted arrays
-        # This creates a sliding 3x3 window without explicit loops
-        neighbors = np.zeros((self.canvas_height, self.canvas_width), dtype=np.int8)
+    def set_rule(self, rule: str) -> None:
+        self.rule = parse_rule(rule)
+        self.matrix = self.matrix.astype(self.cell_dtype, copy=False)
+        if not self.continuous:
+            # Cells in states the new rule doesn't have are cleared
+            self.own_matrix()
+            self.matrix[self.matrix >= self.rule.states] = 0
+            self.board_changed()
+        # Keep the selected engine unless it can't run the new kind of rule
+        engine = self.engine.name if isinstance(self.rule, self.engine.RULE_TYPES) else engine_for(self.rule)
+        self.engine = create_engine(engine, self.rule)
 
-        # Sum all 8 neighboring positions using slices
-        for i in range(3):
-            for j in range(3):
-                if i == 1 and j == 1:  # Skip the center
-                    continue
-                neighbors += padded[i : i + self.canvas_height, j : j + self.canvas_width]
+    @property
+    def continuous(self) -> bool:
+        # Lenia cells hold values between 0 and 1 rather than discrete states
+        return isinstance(self.rule, LeniaRule)
 
-        # Create a new matrix based on Game of Life rules
-        current_state = self.matrix[: self.canvas_height, : self.canvas_width]
-        new_canvas_matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=np.int8)
+    @property
+    def cell_dtype(self) -> type[np.uint8 | np.float32]:
+        return np.float32 if self.continuous else np.uint8
+
+    def get_hashlife(self) -> HashlifeEngine:
+        if self.hashlife is None or self.hashlife.rule != self.rule:
+            self.hashlife = HashlifeEngine(self.rule)
+        return self.hashlife
+
+    def compute_jump(self, hashlife: HashlifeEngine, cells: np.ndarray, exponent: int) -> np.ndarray:
+        # Hashlife works on an unbounded plane rather than the torus, so patterns that
+        # would wrap around the edges leave the visible window instead. Touches nothing
+        # but the hashlife engine, so it can run on a worker thread.
+        height, width = cells.shape
+        # The world origin sits at the centre of the canvas
+        left, top = -(width // 2), -(height // 2)
+        hashlife.load_array(cells, left, top)
+        hashlife.jump(exponent)
+        return hashlife.window(left, top, width, height)
+
+    def show_jump(self, window: np.ndarray) -> None:
+        # The canvas may have been resized while a background jump ran
+        if window.shape != (self.canvas_height, self.canvas_width):
+            return
+        self.own_matrix()
+        self.matrix[: self.canvas_height, : self.canvas_width] = window
+        self.reset_engine()
+        self.board_changed()
+        _ = self.refresh()
 
-        # Apply Conway's Game of Life rules vectorized:
-        # 1. Any live cell with 2 or 3 live neighbors survives
-        # 2. Any dead cell with exactly 3 live neighbors becomes alive
-        new_canvas_matrix[: self.canvas_height, : self.canvas_width] = (
-            ((current_state == 1) & ((neighbors == 2) | (neighbors == 3))) | ((current_state == 0) & (neighbors == 3))
-        ).astype(np.int8)
+    def jump_ahead(self, exponent: int | None = None) -> int:
+        exponent = self.jump_exponent if exponent is None else exponent
+        cells = self.matrix[: self.canvas_height, : self.canvas_width]
+        self.show_jump(self.compute_jump(self.get_hashlife(), cells, exponent))
+        return 1 << exponent
+
+    def jump_in_background(self, exponent: int | None = None) -> int:
+        # Jumps on a worker thread so big boards don't freeze the app; drawing is
+        # ignored until the result is shown. Raises ValueError for rules hashlife can't run.
+        exponent = self.jump_exponent if exponent is None else exponent
+        hashlife = self.get_hashlife()
+        cells = self.matrix[: self.canvas_height, : self.canvas_width].copy()
+        self.jumping = True
+
+        def work() -> None:
+            window = self.compute_jump(hashlife, cells, exponent)
+            self.app.call_from_thread(self.finish_jump, window, exponent)
+
+        _ = self.run_worker(work, name="jump", group="jump", thread=True)
+        return 1 << exponent
+
+    def finish_jump(self, window: np.ndarray, exponent: int) -> None:
+        self.jumping = False
+        self.show_jump(window)
+        _ = self.post_message(self.MessageRequest(f"Jumped ahead {1 << exponent} generations", 1.0))
+
+    def load_macrocell(self, text: str) -> None:
+        # The tree doesn't depend on the rule, so any hashlife engine can read it; the
+        # file's rule then replaces the current one, as when loading an RLE pattern.
+        # Raises ValueError for malformed files and rules, before the canvas changes.
+        hashlife = self.hashlife if self.hashlife is not None else HashlifeEngine()
+        rule = hashlife.read_macrocell(text)
+        if rule:
+            self.set_rule(rule)
+        self.reset_engine()
+        self.matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=self.cell_dtype)
+        self.matrix[: self.canvas_height, : self.canvas_width] = hashlife.window(
+            -(self.canvas_width // 2), -(self.canvas_height // 2), self.canvas_width, self.canvas_height
+        )
+        _ = self.refresh()
 
-        return new_canvas_matrix
+    def load_pattern(self, cells: np.ndarray) -> None:
+        # Clear the canvas and place the pattern in the middle of it
+        board = place(cells, self.canvas_width, self.canvas_height)
+        self.reset_engine()
+        self.matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=self.cell_dtype)
+        self.matrix[: self.canvas_height, : self.canvas_width] = board
+        _ = self.refresh()
+
+    def to_macrocell(self) -> str:
+        hashlife = self.get_hashlife()
+        hashlife.load_array(
+            self.matrix[: self.canvas_height, : self.canvas_width],
+            -(self.canvas_width // 2),
+            -(self.canvas_height // 2),
+        )
+        return hashlife.write_macrocell()
 
     def random(self) -> None:
         # Generate a random matrix using NumPy's vectorized random function
-        self.matrix = np.random.randint(0, 2, (self.canvas_height + 1, self.canvas_width + 1), dtype=np.int8)
+        self.reset_engine()
+        if self.continuous:
+            self.matrix = np.random.random((self.canvas_height + 1, self.canvas_width + 1)).astype(np.float32)
+        else:
+            self.matrix = np.random.randint(0, 2, (self.canvas_height + 1, self.canvas_width + 1), dtype=np.uint8)
         _ = self.refresh()
 
     def add_random_glider(self) -> None:
@@ -267,6 +702,7 @@ class Canvas(Widget):
         y = random.randint(0, self.canvas_height - 3)
 
         # Clear the area for the glider
+        self.own_matrix()
         for i in range(3):
             for j in range(3):
                 if y + i < self.canvas_height and x + j < self.canvas_width:
@@ -285,6 +721,7 @@ class Canvas(Widget):
                 if x + j < self.canvas_width:
                     self.matrix[y + 2, x + j] = 1  # Bottom row
 
+        self.cells_edited(x, y, 3, 3)
         _ = self.refresh()
 
     def add_random_pulsar(self) -> None:
@@ -300,6 +737,7 @@ class Canvas(Widget):
         y = random.randint(0, self.canvas_height - pulsar_size)
 
         # Clear the area for the pulsar (including border)
+        self.own_matrix()
         for i in range(pulsar_size):
             for j in range(pulsar_size):
                 if y + i < self.canvas_height and x + j < self.canvas_width:
@@ -368,11 +806,12 @@ class Canvas(Widget):
             if (y + row) < self.canvas_height and (x + col) < self.canvas_width:
                 self.matrix[y + row, x + col] = 1
 
+        self.cells_edited(x, y, pulsar_size, pulsar_size)
         _ = self.refresh()
 
-    def extend_canvas(self) -> np.ndarray[tuple[int, int], np.dtype[np.int8]]:
+    def extend_canvas(self) -> np.ndarray[tuple[int, int], np.dtype[np.uint8 | np.float32]]:
         # Create a new matrix with the new dimensions
-        new_matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=np.int8)
+        new_matrix = np.zeros((self.canvas_height + 1, self.canvas_width + 1), dtype=self.cell_dtype)
 
         # Copy over the existing data, limited by the smaller of the old and new dimensions
         old_height, old_width = self.matrix.shape
@@ -383,49 +822,29 @@ class Canvas(Widget):
         return new_matrix
 
     def update_size_constraints(self) -> None:
-        term_width, term_height = self.size.width, self.size.height
-
-        self.max_width_by_term = term_width // self.ROW_HEIGHT
-        self.max_height_by_term = term_height // int(self.ROW_HEIGHT / 2)
-
-        # Account for margins and UI elements
-        self.max_width_by_term = max(10, self.max_width_by_term - 2)  # Subtract margins
-        self.max_height_by_term = max(10, self.max_height_by_term - 2)  # Subtract margins
-
-        # Maximum canvas size can't exceed terminal size or hard-coded maximums
-        self.effective_max_width = min(self.max_width_by_term, self.MAX_CANVAS_WIDTH)
-        self.effective_max_height = min(self.max_height_by_term, self.MAX_CANVAS_HEIGHT)
+        # The cells the terminal shows at once. They limit the view, not the board.
+        self.max_width_by_term, self.max_height_by_term = self.fit
+        self.effective_max_width = self.MAX_CANVAS_WIDTH
+        self.effective_max_height = self.MAX_CANVAS_HEIGHT
 
     def on_resize(self, _: events.Resize) -> None:
         self.update_size_constraints()
+        # Keep the view inside the board now that more or less of it fits
+        self.pan(0, 0)
 
-        # If current canvas size exceeds new constraints, resize it
-        if self.canvas_width > self.effective_max_width or self.canvas_height > self.effective_max_height:
-            size_limited = False
-
-            if self.canvas_width > self.effective_max_width:
-                self.canvas_width = self.effective_max_width
-                # Determine which limit we hit
-                if self.max_width_by_term < self.MAX_CANVAS_WIDTH:
-                    self.request_message(f"Canvas width adjusted to fit terminal ({self.max_width_by_term} cells)", 2.0)
-                else:
-                    self.request_message(f"Canvas width adjusted to maximum ({self.MAX_CANVAS_WIDTH} cells)", 2.0)
-                size_limited = True
-
-            if self.canvas_height > self.effective_max_height:
-                self.canvas_height = self.effective_max_height
-                # Determine which limit we hit
-                if self.max_height_by_term < self.MAX_CANVAS_HEIGHT:
-                    self.request_message(
-                        f"Canvas height adjusted to fit terminal ({self.max_height_by_term} cells)", 2.0
-                    )
-                else:
-                    self.request_message(f"Canvas height adjusted to maximum ({self.MAX_CANVAS_HEIGHT} cells)", 2.0)
-                size_limited = True
-
-            if size_limited:
-                self.matrix = self.extend_canvas()
-                _ = self.refresh()
+        # If current canvas size exceeds the maximum, resize it
+        size_limited = False
+        if self.canvas_width > self.effective_max_width:
+            self.canvas_width = self.effective_max_width
+            self.request_message(f"Canvas width adjusted to maximum ({self.MAX_CANVAS_WIDTH} cells)", 2.0)
+            size_limited = True
+        if self.canvas_height > self.effective_max_height:
+            self.canvas_height = self.effective_max_height
+            self.request_message(f"Canvas height adjusted to maximum ({self.MAX_CANVAS_HEIGHT} cells)", 2.0)
+            size_limited = True
+        if size_limited:
+            self.matrix = self.extend_canvas()
+            _ = self.refresh()
 
     def alter_canvas_size(
         self, operation: Operation, horizontally: bool = True, vertically: bool = True, *, amount: int = 10
@@ -454,11 +873,7 @@ class Canvas(Widget):
             if operation.value == "increase":
                 # Check if we'd exceed the maximum
                 if self.canvas_width >= self.effective_max_width:
-                    # Determine which limit we hit
-                    if self.max_width_by_term < self.MAX_CANVAS_WIDTH:
-                        limit_reason = f"terminal width ({self.max_width_by_term} cells)"
-                    else:
-                        limit_reason = f"maximum width ({self.MAX_CANVAS_WIDTH} cells)"
+                    limit_reason = f"maximum width ({self.MAX_CANVAS_WIDTH} cells)"
                     size_limited = True
                     # Set to the maximum allowed size
                     self.canvas_width = self.effective_max_width
@@ -477,19 +892,15 @@ class Canvas(Widget):
                     # Still try the standard message mechanism as well
                     self.request_message(f"Minimum canvas width reached (10 cells)", 2.0)
                     return
-                self.canvas_width -= amount
+                self.canvas_width = max(10, self.canvas_width - amount)
             else:
                 raise RuntimeError(f"Invalid operation: {operation}")
 
         if vertically:
             if operation.value == "increase":
                 if self.canvas_height >= self.effective_max_height:
-                    # Determine which limit we hit (if not already set)
                     if not limit_reason:
-                        if self.max_height_by_term < self.MAX_CANVAS_HEIGHT:
-                            limit_reason = f"terminal height ({self.max_height_by_term} cells)"
-                        else:
-                            limit_reason = f"maximum height ({self.MAX_CANVAS_HEIGHT} cells)"
+                        limit_reason = f"maximum height ({self.MAX_CANVAS_HEIGHT} cells)"
                     size_limited = True
                     # Set to the maximum allowed size
                     self.canvas_height = self.effective_max_height
@@ -508,13 +919,14 @@ class Canvas(Widget):
                     # Still try the standard message mechanism as well
                     self.request_message(f"Minimum canvas height reached (10 cells)", 2.0)
                     return
-                self.canvas_height -= amount
+                self.canvas_height = max(10, self.canvas_height - amount)
             else:
                 raise RuntimeError(f"Invalid operation: {operation}")
 
         # Always extend the canvas matrix regardless of whether we hit a limit
         # This ensures the matrix is always the right size for the current dimensions
         self.matrix = self.extend_canvas()
+        self.pan(0, 0)
         _ = self.refresh()
 
         if size_limited:
@@ -540,19 +952,408 @@ class Canvas(Widget):
     def cursor(self) -> Style:
         return self.get_component_rich_style(f"canvas--cursor-square-{self.cursor_colour}")
 
-    def on_mouse_move(self, event: events.MouseMove) -> None:
-        mouse_position = event.offset + self.scroll_offset
-        current_cursor = Offset(
-            mouse_position.x // self.ROW_HEIGHT,
-            mouse_position.y // int(self.ROW_HEIGHT / 2),
+    @override
+    def notify_style_update(self) -> None:
+        # Called by Textual whenever the CSS or the theme changes
+        super().notify_style_update()
+        self.invalidate_styles()
+
+    def invalidate_styles(self) -> None:
+        # Resolve the styles again on next use; rows rendered with the old ones are dropped
+        self._palette_key = None
+        self._cursor_style = None
+        self._row_strips.clear()
+
+    def watch_cursor_colour(self) -> None:
+        self._cursor_style = None
+
+    @property
+    def cursor_style(self) -> Style:
+        # The cursor's style, resolved once per cursor colour
+        if self._cursor_style is None:
+            self._cursor_style = self.cursor
+        return self._cursor_style
+
+    @property
+    def shaded(self) -> bool:
+        # Whether cells are drawn as shades of a gradient rather than by state: the values
+        # of continuous rules, and densities when zoomed out
+        return self.continuous or (self.zoom > 1 and self.zoom_reduce == "density")
+
+    @property
+    def palette(self) -> np.ndarray:
+        # Indexed by cell state, so a whole row's styles are one lookup however many
+        # states the rule has. Dead cells are white and live cells black; the dying states
+        # of Generations rules fade from black towards white. Shaded cells are drawn along
+        # a fixed gradient from white (0) to black (1).
+        shaded = self.shaded
+        levels = self.GRADIENT_LEVELS if shaded else self.rule.states
+        key = (levels, shaded)
+        if key != self._palette_key:
+            white, black = self.white, self.black
+            dark = (black.bgcolor or Color.parse("#000000")).get_truecolor()
+            light = (white.bgcolor or Color.parse("#FFFFFF")).get_truecolor()
+            if shaded:
+                shades = [level / (levels - 1) for level in range(levels)]
+                self._state_styles = [
+                    white + Style(bgcolor=Color.from_triplet(blend_rgb(light, dark, shade))) for shade in shades
+                ]
+            else:
+                self._state_styles = [white, black] + [
+                    black + Style(bgcolor=Color.from_triplet(blend_rgb(dark, light, (state - 1) / (levels - 1))))
+                    for state in range(2, levels)
+                ]
+            self._palette = np.empty(len(self._state_styles), dtype=object)
+            self._palette[:] = self._state_styles
+            self._palette_key = key
+            self._half_block_styles.clear()
+        return self._palette
+
+    @property
+    def state_styles(self) -> list[Style]:
+        # The palette as a list
+        _ = self.palette
+        return self._state_styles
+
+    def reduce_blocks(self, cells: np.ndarray) -> np.ndarray:
+        # Halve a level of the pyramid: each 2x2 block becomes its largest value or its
+        # sum, with cells past the edges counting as dead
+        height, width = cells.shape
+        if height % 2 or width % 2:
+            padded = np.zeros((height + height % 2, width + width % 2), dtype=cells.dtype)
+            padded[:height, :width] = cells
+            cells = padded
+        # The four corners of every block as strided views; combining them element-wise
+        # is several times faster than reducing a (h/2, 2, w/2, 2) reshape over its axes
+        top_left, top_right = cells[0::2, 0::2], cells[0::2, 1::2]
+        bottom_left, bottom_right = cells[1::2, 0::2], cells[1::2, 1::2]
+        if self.zoom_reduce == "density":
+            # Live cell counts reach 64 * 64 at the largest zoom
+            total = np.add(top_left, top_right, dtype=np.float32 if cells.dtype.kind == "f" else np.uint16)
+            total += bottom_left
+            total += bottom_right
+            return total
+        return np.maximum(np.maximum(top_left, top_right), np.maximum(bottom_left, bottom_right))
+
+    def pyramid_level(self, zoom: int) -> np.ndarray:
+        # The board reduced to one value per zoom x zoom block of cells: its largest cell,
+        # or for densities, the sum of its cells (live cells counting one). Each level is
+        # built from the one before it, and the levels are kept until the board changes,
+        # so panning, redrawing and zooming in and out again reuse them.
+        key = (self.board_version, self.zoom_reduce, self.canvas_width, self.canvas_height)
+        if self._pyramid_source is not self.matrix or key != self._pyramid_key:
+            cells = self.matrix[: self.canvas_height, : self.canvas_width]
+            if self.zoom_reduce == "density" and not self.continuous:
+                cells = (cells != 0).view(np.uint8)
+            self._pyramid = [cells]
+            self._pyramid_source, self._pyramid_key = self.matrix, key
+        level = zoom.bit_length() - 1
+        while len(self._pyramid) <= level:
+            self._pyramid.append(self.reduce_blocks(self._pyramid[-1]))
+        return self._pyramid[level]
+
+    @property
+    def shown(self) -> np.ndarray:
+        # The cells drawn: the board, or when zoomed out, one value per block of cells
+        if self.zoom == 1:
+            return self.matrix[: self.canvas_height, : self.canvas_width]
+        return self.pyramid_level(self.zoom)
+
+    def shown_states(self, top: int, bottom: int) -> np.ndarray:
+        # Rows top to bottom of the cells drawn in view, as indices into state_styles,
+        # quantizing continuous values and densities
+        view = self.shown_view
+        cells = self.shown[top:bottom, view.x : view.right]
+        if self.zoom > 1 and self.zoom_reduce == "density":
+            # Only the blocks in view are turned from sums into fractions
+            cells = cells / np.float32(self.zoom * self.zoom)
+        if not self.shaded:
+            return cells
+        return np.rint(np.clip(cells, 0, 1) * (self.GRADIENT_LEVELS - 1)).astype(np.intp)
+
+    def row_states(self, row: int) -> np.ndarray:
+        # One row of shown_states
+        return self.shown_states(row, row + 1)[0]
+
+    def row_strip(self, row: int) -> Strip:
+        # A canvas row rendered without the cursor. Rows are looked up by their cells, so
+        # unchanged rows, and rows equal to any recently rendered row, cost one hash.
+        palette = self.palette
+        states = self.row_states(row)
+        width = self.shown_view.width
+        key = (states.tobytes(), width, self._palette_key)
+        strip = self._row_strips.get(key)
+        if strip is None:
+            # One segment per run of cells in the same state rather than one per cell;
+            # runs start wherever the state differs from the cell before it
+            starts = np.flatnonzero(np.diff(states)) + 1
+            bounds = np.concatenate(([0], starts, [len(states)]))
+            segments = [
+                Segment(" " * (self.ROW_HEIGHT * length), style)
+                for length, style in zip(np.diff(bounds).tolist(), palette[states[bounds[:-1]]])
+                if length
+            ]
+            # Columns past the matrix (while it is being resized) are drawn dead
+            if width > len(states):
+                segments.append(Segment(" " * (self.ROW_HEIGHT * (width - len(states))), self.black))
+            strip = Strip(segments, width * self.ROW_HEIGHT)
+            self._row_strips.set(key, strip)
+        return strip
+
+    def cell_at(self, event: events.MouseEvent) -> Offset:
+        # The cell under the pointer. Terminals reporting the pointer in pixels give a
+        # fractional position, which picks the cell within a glyph showing several.
+        # Zoomed out, it is the top left cell of the block under the pointer.
+        columns, across, down = self.glyph
+        x = event.pointer_x + self.scroll_offset.x
+        y = event.pointer_y + self.scroll_offset.y
+        view = self.shown_view
+        return Offset(
+            (int(x * across // columns) + view.x) * self.zoom,
+            (int(y * down) + view.y) * self.zoom,
         )
 
+    def half_block_style(self, top: int, bottom: int) -> Style:
+        # A ▀ glyph showing the top cell's colour in its foreground and the bottom
+        # cell's in its background; a bottom of -1 is past the last row and left empty
+        style = self._half_block_styles.get((top, bottom))
+        if style is None:
+            palette = self.palette
+            below = palette[bottom] if bottom >= 0 else Style()
+            style = below + Style(color=palette[top].bgcolor)
+            self._half_block_styles[(top, bottom)] = style
+        return style
+
+    def half_block_strip(self, line: int) -> Strip:
+        # A line of two cell rows drawn with half blocks, without the cursor. Each pair of
+        # stacked cells gets one code, so runs of equal glyphs are found in one pass.
+        _ = self.palette
+        top = self.row_states(2 * line).astype(np.intp)
+        if 2 * line + 1 < self.shown_height:
+            bottom = self.row_states(2 * line + 1).astype(np.intp)
+        else:
+            bottom = np.full_like(top, -1)
+        width = self.shown_view.width
+        key = ("half", top.tobytes(), bottom.tobytes(), width, self._palette_key)
+        strip = self._row_strips.get(key)
+        if strip is None:
+            pairs = top * (len(self._state_styles) + 1) + bottom
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(pairs)) + 1))
+            lengths = np.diff(np.append(starts, len(pairs)))
+            segments = [
+                Segment(self.HALF_BLOCK * length, self.half_block_style(top_state, bottom_state))
+                for length, top_state, bottom_state in zip(
+                    lengths.tolist(), top[starts].tolist(), bottom[starts].tolist()
+                )
+            ]
+            if width > len(top):
+                segments.append(Segment(" " * (width - len(top)), self.black))
+            strip = Strip(segments, width)
+            self._row_strips.set(key, strip)
+        return strip
+
+    def braille_codes(self, line: int) -> np.ndarray:
+        # The dots of each braille character of a line: its 2x4 cells, padded with dead
+        # cells past the edges, weighted and summed in one pass over the line
+        states = self.shown_states(line * 4, line * 4 + 4)
+        # Shaded cells count as live from half way
+        lit = states >= self.GRADIENT_LEVELS // 2 if self.shaded else states != 0
+        block = np.zeros((4, -(-lit.shape[1] // 2) * 2), dtype=np.uint8)
+        block[: lit.shape[0], : lit.shape[1]] = lit
+        return np.einsum("rgc,rc->g", block.reshape(4, -1, 2), self.BRAILLE_WEIGHTS)
+
+    @property
+    def braille_style(self) -> Style:
+        # Live cells' colour for the dots, on the dead cells' colour
+        palette = self.palette
+        live = palette[-1] if self.shaded else palette[1]
+        return palette[0] + Style(color=live.bgcolor)
+
+    def braille_strip(self, line: int) -> Strip:
+        # A line of four cell rows drawn as braille, without the cursor, with one segment
+        # per run of equal characters
+        codes = self.braille_codes(line)
+        key = ("braille", codes.tobytes(), self.shown_view.width, self._palette_key)
+        strip = self._row_strips.get(key)
+        if strip is None:
+            style = self.braille_style
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+            lengths = np.diff(np.append(starts, len(codes)))
+            segments = [
+                Segment(chr(self.BRAILLE_BLANK + code) * length, style)
+                for length, code in zip(lengths.tolist(), codes[starts].tolist())
+            ]
+            width = -(-self.shown_view.width // 2)
+            if width > len(codes):
+                segments.append(Segment(" " * (width - len(codes)), self.black))
+            strip = Strip(segments, width)
+            self._row_strips.set(key, strip)
+        return strip
+
+    def line_strip(self, line: int) -> Strip:
+        # A line of the board in the current display mode, without the cursor
+        if self.display_mode == "half":
+            return self.half_block_strip(line)
+        if self.display_mode == "braille":
+            return self.braille_strip(line)
+        return self.row_strip(line)
+
+    def cursor_segment(self) -> Segment:
+        # The glyph under the cursor. With half blocks the cursor fills only its own half;
+        # a braille character is shown in reverse, keeping its dots visible.
+        if self.display_mode == "blocks":
+            return Segment(" " * self.ROW_HEIGHT, self.cursor_style)
+        # The cell drawn under the cursor, in view columns and shown rows
+        x = self.cursor_square.x // self.zoom - self.shown_view.x
+        y = self.cursor_square.y // self.zoom
+        if self.display_mode == "braille":
+            code = self.braille_codes(y // 4)[x // 2]
+            return Segment(chr(self.BRAILLE_BLANK + int(code)), self.braille_style + Style(reverse=True))
+        colour = self.cursor_style.bgcolor
+        other_row = y + 1 if y % 2 == 0 else y - 1
+        if other_row >= self.shown_height:
+            return Segment(self.HALF_BLOCK, Style(color=colour))
+        other = self.palette[self.row_states(other_row)[x]].bgcolor
+        top, bottom = (colour, other) if y % 2 == 0 else (other, colour)
+        return Segment(self.HALF_BLOCK, Style(color=top, bgcolor=bottom))
+
+    @property
+    def glyph(self) -> tuple[int, int, int]:
+        # Terminal columns per glyph, and the cells across and down each glyph shows
+        return self.DISPLAY_MODES[self.display_mode]
+
+    @property
+    def fit(self) -> tuple[int, int]:
+        # Cells across and down the widget has room for, zoomed out blocks counting as one
+        columns, across, down = self.glyph
+        return self.size.width // columns * across, self.size.height * down
+
+    @property
+    def view(self) -> Region:
+        # The cells shown, from view_origin: as many as fit in the widget, or the whole
+        # board before the widget has a size. Rendering only ever reads these cells, or
+        # zoomed out their blocks, so its cost depends on the terminal's size and not on
+        # the board's.
+        if not self.size:
+            return Region(0, 0, self.canvas_width, self.canvas_height)
+        _, across, down = self.glyph
+        fit_width, fit_height = self.fit
+        fit_width, fit_height = fit_width * self.zoom, fit_height * self.zoom
+        # Views start on a whole glyph
+        step_x, step_y = across * self.zoom, down * self.zoom
+        x = max(0, min(self.view_origin.x, self.canvas_width - fit_width)) // step_x * step_x
+        y = max(0, min(self.view_origin.y, self.canvas_height - fit_height)) // step_y * step_y
+        return Region(x, y, min(fit_width, self.canvas_width - x), min(fit_height, self.canvas_height - y))
+
+    @property
+    def shown_view(self) -> Region:
+        # The view in cells drawn: blocks when zoomed out, counting part blocks at the edges
+        view, zoom = self.view, self.zoom
+        x, y = view.x // zoom, view.y // zoom
+        return Region(x, y, -(-view.right // zoom) - x, -(-view.bottom // zoom) - y)
+
+    @property
+    def shown_height(self) -> int:
+        # Rows of cells drawn for the whole board
+        return -(-self.canvas_height // self.zoom)
+
+    def pan(self, dx: int, dy: int) -> None:
+        # Move the view by a number of cells, keeping it on the board
+        view = self.view
+        self.view_origin = Offset(view.x + dx, view.y + dy)
+        if self.view.offset != view.offset:
+            _ = self.refresh()
+        # Stored as the view actually shown, so panning back from an edge is immediate
+        self.view_origin = self.view.offset
+
+    def pan_steps(self, x: int, y: int) -> None:
+        # Move the view by a part of its size in each direction, for the keyboard
+        view = self.view
+        self.pan(
+            x * max(1, int(view.width * self.PAN_FRACTION)),
+            y * max(1, int(view.height * self.PAN_FRACTION)),
+        )
+
+    def set_zoom(self, zoom: int) -> None:
+        # Zoom to 1:zoom, a power of two, keeping the middle of the view where it is
+        zoom = min(max(1, zoom), self.MAX_ZOOM)
+        zoom = 1 << (zoom.bit_length() - 1)
+        view = self.view
+        centre_x, centre_y = view.x + view.width // 2, view.y + view.height // 2
+        self.zoom = zoom
+        fit_width, fit_height = self.fit
+        self.view_origin = Offset(centre_x - fit_width * zoom // 2, centre_y - fit_height * zoom // 2)
+        self.view_origin = self.view.offset
+        _ = self.refresh()
+
+    def zoom_out(self) -> int:
+        self.set_zoom(self.zoom * 2)
+        return self.zoom
+
+    def zoom_in(self) -> int:
+        self.set_zoom(self.zoom // 2)
+        return self.zoom
+
+    def cycle_zoom_reduce(self) -> str:
+        reductions = self.ZOOM_REDUCTIONS
+        self.zoom_reduce = reductions[(reductions.index(self.zoom_reduce) + 1) % len(reductions)]
+        _ = self.refresh()
+        return self.zoom_reduce
+
+    @property
+    def canvas_lines(self) -> int:
+        # Terminal lines the board takes
+        down = self.glyph[2]
+        return -(-self.shown_view.height // down)
+
+    def set_display_mode(self, mode: str) -> None:
+        if mode not in self.DISPLAY_MODES:
+            raise ValueError(f"Unknown display mode {mode!r}, choose from {', '.join(self.DISPLAY_MODES)}")
+        self.display_mode = mode
+        # More or fewer cells now fit in the terminal
+        if hasattr(self, "size") and self.size:
+            self.update_size_constraints()
+        _ = self.refresh()
+
+    def cycle_display_mode(self) -> str:
+        modes = list(self.DISPLAY_MODES)
+        self.set_display_mode(modes[(modes.index(self.display_mode) + 1) % len(modes)])
+        return self.display_mode
+
+    def on_mouse_down(self, event: events.MouseDown) -> None:
+        if event.button == 3:
+            # Dragging with the right button pans the view
+            self._drag_anchor = self.cell_at(event)
+            self.capture_mouse()
+
+    def on_mouse_scroll_down(self, event: events.MouseScrollDown) -> None:
+        # The wheel pans the view down, or right with shift held
+        if event.shift:
+            self.pan(self.WHEEL_CELLS, 0)
+        else:
+            self.pan(0, self.WHEEL_CELLS)
+
+    def on_mouse_scroll_up(self, event: events.MouseScrollUp) -> None:
+        if event.shift:
+            self.pan(-self.WHEEL_CELLS, 0)
+        else:
+            self.pan(0, -self.WHEEL_CELLS)
+
+    def on_mouse_move(self, event: events.MouseMove) -> None:
+        if self._drag_anchor is not None:
+            # Keep the cell the drag started on under the pointer
+            cell = self.cell_at(event)
+            self.pan(self._drag_anchor.x - cell.x, self._drag_anchor.y - cell.y)
+            return
+
+        current_cursor = self.cell_at(event)
+
         # If the cursor position has changed
         if current_cursor != self.cursor_square:
             self.cursor_square = current_cursor
 
             # If mouse is captured (dragging), toggle cells
-            if self.mouse_captured and event.button == 1:  # Left mouse button
+            if self.mouse_captured and event.button == 1 and not self.jumping:  # Left mouse button
                 self.toggle_cell(self.cursor_square.x, self.cursor_square.y)
 
             # only update the square that aren't out of range
@@ -564,16 +1365,17 @@ class Canvas(Widget):
 
     def toggle_cell(self, x: int, y: int) -> None:
         if y < self.matrix.shape[0] and x < self.matrix.shape[1]:
-            # Use XOR operation to toggle between 0 and 1
-            self.matrix[y, x] ^= 1
+            # Dead cells come alive; live and dying (Generations) cells are cleared
+            self.own_matrix()
+            self.matrix[y, x] = self.matrix[y, x] == 0
+            self.cells_edited(x, y)
             _ = self.refresh(self.get_square_region(Offset(x, y)))
 
     def on_click(self, event: events.Click) -> None:
-        mouse_position = event.offset + self.scroll_offset
-        self.cursor_square = Offset(
-            mouse_position.x // self.ROW_HEIGHT,
-            mouse_position.y // int(self.ROW_HEIGHT / 2),
-        )
+        if event.button == 3 or self.jumping:
+            # The right button pans rather than draws, and edits would be lost under a jump
+            return
+        self.cursor_square = self.cell_at(event)
         self.x = self.cursor_square.x
         self.y = self.cursor_square.y
 
@@ -586,12 +1388,10 @@ class Canvas(Widget):
 
     def get_square_region(self, square_offset: Offset) -> Region:
         x, y = square_offset
-        region = Region(
-            int(x * self.ROW_HEIGHT),
-            int(y * int(self.ROW_HEIGHT / 2)),
-            int(self.ROW_HEIGHT),
-            int(self.ROW_HEIGHT / 2),
-        )
+        # The glyph the cell is drawn in
+        columns, across, down = self.glyph
+        view = self.shown_view
+        region = Region((x // self.zoom - view.x) // across * columns, (y // self.zoom - view.y) // down, columns, 1)
         # Move the region in to the widgets frame of reference
         region = region.translate(-self.scroll_offset)
         return region
@@ -603,6 +1403,7 @@ class Canvas(Widget):
     def on_mouse_up(self, _: events.MouseUp) -> None:
         self.release_mouse()
         self.mouse_captured = False
+        self._drag_anchor = None
 
     def increase_brush_size(self) -> None:
         if self.brush_size < self.MAX_BRUSH_SIZE:
@@ -612,8 +1413,17 @@ class Canvas(Widget):
         if self.brush_size > self.MIN_BRUSH_SIZE:
             self.brush_size -= 1
 
+    @property
+    def rate_line(self) -> int:
+        # The rate overlay sits on the last line, below any message
+        return max(0, self.size.height - 1)
+
     @override
     def render_line(self, y: int) -> Strip:
+        rate_text = self.rate_text() if y == self.rate_line else None
+        if rate_text is not None:
+            return Strip([Segment(f"  {rate_text}"[: self.size.width], self.rate_style)])
+
         # Check if this line should display the message (positioned at the bottom for better visibility)
         if self.message_visible and y == max(0, self.size.height - 2):  # Position at the bottom
             padding = " " * 2  # Add some padding at the start
@@ -623,26 +1433,19 @@ class Canvas(Widget):
                 message_text = message_text[: self.size.width - 3] + "..."
             return Strip([Segment(message_text, self.message_style)])
 
-        row_index = y // int(self.ROW_HEIGHT / 2)
-
         # Don't render canvas content for lines beyond the canvas height
-        if row_index >= self.canvas_height:
+        if y >= self.canvas_lines:
             return Strip.blank(self.size.width)
 
-        # Normal canvas rendering
-        def get_square_style(column: int, row: int) -> Style:
-            if self.cursor_square == Offset(column, row):
-                square_style = self.cursor
-            else:
-                square_style = self.black
-                # only update the square that aren't out of range
-                if row < self.matrix.shape[0] and column < self.matrix.shape[1]:
-                    square_style = self.black if self.matrix[row, column] == 1 else self.white
-
-            return square_style
-
-        segments = [
-            Segment(" " * self.ROW_HEIGHT, get_square_style(column, row_index)) for column in range(self.canvas_width)
-        ]
-        strip = Strip(segments)
+        # Normal canvas rendering: the cached line with the cursor drawn over it
+        columns, across, down = self.glyph
+        view = self.shown_view
+        line = view.y // down + y
+        strip = self.line_strip(line)
+        cursor_x, cursor_y = self.cursor_square
+        if self.view.contains(cursor_x, cursor_y) and cursor_y // self.zoom // down == line:
+            left = (cursor_x // self.zoom - view.x) // across * columns
+            strip = Strip.join(
+                [strip.crop(0, left), Strip([self.cursor_segment()], columns), strip.crop(left + columns)]
+            )
         return strip
@@ -0,0 +1,854 @@
+from fractions import Fraction
+import numpy as np
+from .rules import (
+    DEFAULT_RULE,
+    AnyRule,
+    GenerationsRule,
+    IsotropicRule,
+    LargerThanLifeRule,
+    LeniaRule,
+    Rule,
+    parse_rule,
+)
+
+
+class Engine:
+    name: str = ""
+    # The kinds of rule the engine knows how to apply
+    RULE_TYPES: tuple[type, ...] = (Rule,)
+    # Used when no rule is given; must be one of RULE_TYPES
+    DEFAULT_RULE: str = DEFAULT_RULE
+    # Check, whenever a call continues from the last result, that every cell changed in
+    # it since was reported through mark_edited, rather than stepping on from stale state.
+    # Each result is copied to check against, so this is for tests and debugging.
+    CHECK_EDITS: bool = False
+
+    def __init__(self, rule: AnyRule | None = None) -> None:
+        # Narrowed to Rule for the totalistic engines; the check below enforces RULE_TYPES
+        rule = rule if rule is not None else parse_rule(self.DEFAULT_RULE)
+        self.rule: Rule = rule  # pyright: ignore[reportAssignmentType]
+        if not isinstance(self.rule, self.RULE_TYPES):
+            raise ValueError(f"The {self.name} engine can't run {type(self.rule).__name__} rules ({self.rule})")
+        # The array the last generation was written to, and the regions of it the caller
+        # has edited since (x, y, width, height), see continues
+        self._written: np.ndarray | None = None
+        self._edits: list[tuple[int, int, int, int]] = []
+        # A copy of the last result, with CHECK_EDITS
+        self._expected: np.ndarray | None = None
+
+    def reset(self) -> None:
+        # Engines holding state beyond the grid they are given forget it here
+        self._written = None
+        self._edits = []
+        self._expected = None
+
+    def wrote(self, out: np.ndarray) -> None:
+        # Engines keeping state call this with the array each result was written to
+        self._written = out
+        self._expected = out.copy() if self.CHECK_EDITS else None
+
+    def mark_edited(self, x: int, y: int, width: int = 1, height: int = 1) -> None:
+        # The caller changed cells of the array last written. Engines keeping their own
+        # form of the board update just those cells from the next grid, rather than
+        # converting the whole board again; edits they aren't told about are lost.
+        if self._written is not None:
+            self._edits.append((x, y, width, height))
+
+    def continues(self, grid: np.ndarray) -> bool:
+        # Whether grid is the array the last generation was written to, so state kept
+        # from that call (with the edits marked since) still describes it. The array is
+        # kept referenced, so no other array can be given the same memory meanwhile.
+        if self._written is None or not self.same_memory(grid, self._written):
+            return False
+        if self._expected is not None:
+            self.check_edits(grid)
+        return True
+
+    def check_edits(self, grid: np.ndarray) -> None:
+        unreported = grid != self._expected
+        for x, y, width, height in self._edits:
+            unreported[max(0, y) : y + height, max(0, x) : x + width] = False
+        if unreported.any():
+            y, x = np.argwhere(unreported)[0].tolist()
+            raise RuntimeError(f"Cell ({x}, {y}) changed since the last generation without mark_edited")
+
+    @staticmethod
+    def same_memory(first: np.ndarray, second: np.ndarray) -> bool:
+        return (
+            first.shape == second.shape
+            and first.strides == second.strides
+            and first.__array_interface__["data"][0] == second.__array_interface__["data"][0]
+        )
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def step_into(self, grid: np.ndarray, out: np.ndarray) -> None:
+        out[...] = self.next_generation(grid)
+
+    def advance_into(self, grid: np.ndarray, out: np.ndarray, generations: int = 1) -> None:
+        out[...] = self.advance(grid, generations)
+
+    def advance(self, grid: np.ndarray, generations: int = 1) -> np.ndarray:
+        # Engines with an expensive conversion step override this so the
+        # conversion only happens once per batch rather than once per generation
+        for _ in range(generations):
+            grid = self.next_generation(grid)
+        return grid
+
+
+class NumPyEngine(Engine):
+    # Every array used while stepping (the padded board with its toroidal halo, the
+    # neighbour sums and the lookup indices) and every view into them is allocated
+    # once per board size. Each generation is then a fixed sequence of copies and
+    # ufunc calls writing through out=, so stepping allocates nothing.
+    name: str = "numpy"
+
+    def __init__(self, rule: AnyRule | None = None) -> None:
+        super().__init__(rule)
+        self.shape: tuple[int, int] | None = None
+        self.dtype: np.dtype | None = None
+
+        # The rule table widened to look up two adjacent cells at once: each byte of a
+        # uint16 index is mapped through the 18-entry table independently. Halving the
+        # number of gathered elements (and of int -> intp index conversions) makes the
+        # lookup cost about the same as the old hard-coded Conway comparisons.
+        pair = np.arange(1 << 16)
+        table = np.zeros(256, dtype=np.uint16)
+        table[: len(self.rule.table)] = self.rule.table
+        self.pair_table: np.ndarray = table[pair & 0xFF] | (table[pair >> 8] << 8)
+
+    def allocate(self, height: int, width: int, dtype: np.dtype = np.dtype(np.int8)) -> None:
+        # Buffers hold one byte per cell, so the lookup can read indices in pairs
+        self.shape = (height, width)
+        self.dtype = dtype
+        stride = width + 2
+        size = (height + 2) * stride
+        self.padded = np.zeros((height + 2, stride), dtype=dtype)
+
+        # All the arithmetic runs on flat, contiguous runs of the padded board
+        # (including the halo columns between rows), so every ufunc call is a plain
+        # 1D loop with no iterator set-up. Results for halo columns are never copied out.
+        flat = self.padded.ravel()
+
+        # Sums of three horizontally adjacent cells; row_sums[i] is centred on flat[i + 1]
+        self.row_sums = np.zeros(size - 2, dtype=dtype)
+        self.row_parts = (flat[:-2], flat[1:-1], flat[2:])
+
+        # The 3x3 sum for every cell from the first to the last real one is the row sum
+        # above, at and below it
+        start = stride + 1
+        length = height * stride - 2
+        self.column_parts = tuple(
+            self.row_sums[start - 1 + offset : start - 1 + offset + length] for offset in (-stride, 0, stride)
+        )
+        self.cells = flat[start : start + length]
+        self.weighted = np.zeros(length, dtype=dtype)
+
+        # Indices are read, and results written, in pairs of cells, so both buffers are
+        # rounded up to an even length and the result run starts on an even byte
+        pairs = (length + 1) // 2
+        self.index_pairs = np.zeros(pairs, dtype=np.uint16)
+        self.index = self.index_pairs.view(dtype)[:length]
+        # np.take needs platform integer indices
+        self.lookup = np.zeros(pairs, dtype=np.intp)
+
+        result = np.zeros(size + 1, dtype=dtype)
+        offset = start % 2
+        self.next_pairs = result[offset + start : offset + start + 2 * pairs].view(np.uint16)
+        self.result_centre = result[offset : offset + size].reshape(height + 2, stride)[1:-1, 1:-1]
+
+        self.centre = self.padded[1:-1, 1:-1]
+
+        # Halo copies: rows first, then whole columns so the corners wrap too
+        padded = self.padded
+        self.halo = [
+            (padded[0, 1:-1], padded[height, 1:-1]),
+            (padded[height + 1, 1:-1], padded[1, 1:-1]),
+            (padded[:, 0], padded[:, width]),
+            (padded[:, width + 1], padded[:, 1]),
+        ]
+
+    def step_into(self, grid: np.ndarray, out: np.ndarray) -> None:
+        # grid may be the same array as out: it is copied into the padded buffer first.
+        # Byte grids are stepped in their own type, so they are copied without casting;
+        # wider integer and bool grids are cast to bytes on the way in and back on the way out.
+        dtype = grid.dtype if grid.dtype.itemsize == 1 and grid.dtype.kind in "iu" else np.dtype(np.uint8)
+        if self.shape != grid.shape or self.dtype != dtype:
+            self.allocate(*grid.shape, dtype)
+
+        _ = np.copyto(self.centre, grid, casting="unsafe")
+        for target, source in self.halo:
+            _ = np.copyto(target, source)
+
+        left, middle, right = self.row_parts
+        _ = np.add(left, middle, out=self.row_sums)
+        _ = np.add(self.row_sums, right, out=self.row_sums)
+
+        above, level, below = self.column_parts
+        index = self.index
+        _ = np.add(above, level, out=index)
+        _ = np.add(index, below, out=index)
+
+        # The 3x3 sum includes the cell itself, so adding 8 * state turns it into
+        # state * 9 + neighbours: the index into the rule's lookup table
+        _ = np.multiply(self.cells, 8, out=self.weighted)
+        _ = np.add(index, self.weighted, out=index)
+
+        # A single gather applies the rule to two cells per element
+        _ = np.copyto(self.lookup, self.index_pairs)
+        _ = np.take(self.pair_table, self.lookup, out=self.next_pairs, mode="wrap")
+
+        _ = np.copyto(out, self.result_centre, casting="unsafe")
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        out = np.empty(grid.shape, dtype=grid.dtype)
+        self.step_into(grid, out)
+        return out
+
+    def advance_into(self, grid: np.ndarray, out: np.ndarray, generations: int = 1) -> None:
+        self.step_into(grid, out)
+        for _ in range(generations - 1):
+            self.step_into(out, out)
+
+
+class BitPackedEngine(Engine):
+    # Rows are packed into uint64 words (bit j of word k is column 64 * k + j) and the
+    # neighbour count is accumulated as a 4-bit binary number spread across four words,
+    # using full adders so 64 cells are processed per bitwise operation. The packed
+    # board is kept between calls, so stepping one generation at a time only unpacks
+    # the result for display; only rows marked as edited are packed again.
+    name: str = "bitpacked"
+
+    def __init__(self, rule: AnyRule | None = None) -> None:
+        super().__init__(rule)
+        self.words: np.ndarray | None = None
+
+    def reset(self) -> None:
+        super().reset()
+        self.words = None
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        return self.advance(grid, 1)
+
+    def advance(self, grid: np.ndarray, generations: int = 1) -> np.ndarray:
+        out = np.empty(grid.shape, dtype=np.int8)
+        self.advance_into(grid, out, generations)
+        return out
+
+    def advance_into(self, grid: np.ndarray, out: np.ndarray, generations: int = 1) -> None:
+        width = grid.shape[1]
+        words = self.words
+        if words is None or not self.continues(grid):
+            words = self.pack(grid)
+        else:
+            for _, y, _, height in self._edits:
+                rows = slice(max(0, y), y + height)
+                words[rows] = self.pack(grid[rows])
+        self._edits = []
+
+        for _ in range(generations):
+            words = self.step_words(words, width, self.rule)
+        self.words = words
+        _ = np.copyto(out, self.unpack_bits(words, width), casting="unsafe")
+        self.wrote(out)
+
+    @staticmethod
+    def pack(grid: np.ndarray) -> np.ndarray:
+        height, width = grid.shape
+        word_count = (width + 63) // 64
+        packed = np.zeros((height, word_count * 8), dtype=np.uint8)
+        packed[:, : (width + 7) // 8] = np.packbits(grid.astype(bool), axis=1, bitorder="little")
+        return packed.view("<u8").astype(np.uint64)
+
+    @staticmethod
+    def unpack_bits(words: np.ndarray, width: int) -> np.ndarray:
+        # The cells as uint8 0s and 1s, without copying the words on little-endian machines
+        as_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+        return np.unpackbits(as_bytes, axis=1, count=width, bitorder="little")
+
+    @classmethod
+    def unpack(cls, words: np.ndarray, width: int) -> np.ndarray:
+        return cls.unpack_bits(words, width).astype(np.int8)
+
+    @staticmethod
+    def shift_west(words: np.ndarray, width: int) -> np.ndarray:
+        # Each cell receives the value of its west neighbour (column - 1, wrapping)
+        last_bit = np.uint64((width - 1) % 64)
+        shifted = words << np.uint64(1)
+        shifted[:, 1:] |= words[:, :-1] >> np.uint64(63)
+        shifted[:, 0] |= (words[:, -1] >> last_bit) & np.uint64(1)
+        # Drop the bit pushed past the last real column
+        shifted[:, -1] &= np.uint64((1 << ((width - 1) % 64 + 1)) - 1)
+        return shifted
+
+    @staticmethod
+    def shift_east(words: np.ndarray, width: int) -> np.ndarray:
+        # Each cell receives the value of its east neighbour (column + 1, wrapping)
+        last_bit = np.uint64((width - 1) % 64)
+        shifted = words >> np.uint64(1)
+        shifted[:, :-1] |= (words[:, 1:] & np.uint64(1)) << np.uint64(63)
+        shifted[:, -1] |= (words[:, 0] & np.uint64(1)) << last_bit
+        return shifted
+
+    @classmethod
+    def step_words(cls, words: np.ndarray, width: int, rule: Rule) -> np.ndarray:
+        west = cls.shift_west(words, width)
+        east = cls.shift_east(words, width)
+
+        # Neighbours from the rows above and below, wrapping vertically
+        rows = (west, words, east)
+        above = [np.roll(row, 1, axis=0) for row in rows]
+        below = [np.roll(row, -1, axis=0) for row in rows]
+
+        def full_add(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            partial = a ^ b
+            return partial ^ c, (a & b) | (c & partial)
+
+        # First layer: three adders reduce eight inputs to weighted sums
+        sum_a, carry_a = full_add(above[0], above[1], above[2])
+        sum_b, carry_b = full_add(below[0], below[1], below[2])
+        sum_c, carry_c = west ^ east, west & east
+
+        # Bit 0 of the count, plus a fourth carry into the twos column
+        ones, carry_d = full_add(sum_a, sum_b, sum_c)
+
+        # Bit 1 of the count, with carries into the fours column
+        twos_partial, carry_e = full_add(carry_a, carry_b, carry_c)
+        twos = twos_partial ^ carry_d
+        carry_f = twos_partial & carry_d
+
+        # Bits 2 and 3 (only set for a count of 8)
+        fours = carry_e ^ carry_f
+        eights = carry_e & carry_f
+
+        def count_is(count: int) -> np.ndarray:
+            bits = (ones, twos, fours, eights)
+            result = ~np.zeros_like(words)
+            for bit, word in enumerate(bits):
+                result &= word if count >> bit & 1 else ~word
+            return result
+
+        next_words = np.zeros_like(words)
+        for count in rule.birth | rule.survival:
+            if count in rule.birth and count in rule.survival:
+                next_words |= count_is(count)
+            elif count in rule.birth:
+                next_words |= count_is(count) & ~words
+            else:
+                next_words |= count_is(count) & words
+
+        # Clear the unused bits past the last column, which a B0 rule would set
+        next_words[:, -1] &= np.uint64((1 << ((width - 1) % 64 + 1)) - 1)
+        return next_words
+
+
+class TiledEngine(Engine):
+    # Splits the board into square tiles and remembers which tiles changed in the
+    # last generation. Only changed tiles and their neighbours (which are the only
+    # ones that can change next) are gathered, with a one-cell toroidal halo, and
+    # recomputed, so settled regions cost nothing. The board and the changed tiles are
+    # kept between calls given the array last written, with edits marked since copied
+    # in, and only tiles that changed are written to out.
+    name: str = "tiled"
+
+    TILE_SIZE: int = 32
+
+    def __init__(self, rule: AnyRule | None = None, tile_size: int = TILE_SIZE) -> None:
+        super().__init__(rule)
+        self.tile_size: int = tile_size
+        self.state: np.ndarray | None = None
+        self.changed_tiles: np.ndarray | None = None
+        # The grid of the last call when it continued the one before, so it matches
+        # state except in touched_tiles: it's the out of a double-buffered caller's
+        # next call, which then only needs those tiles written
+        self._previous: np.ndarray | None = None
+        self.touched_tiles: np.ndarray | None = None
+
+    def reset(self) -> None:
+        super().reset()
+        self.state = None
+        self.changed_tiles = None
+        self._previous = None
+        self.touched_tiles = None
+
+    def tile_shape(self, height: int, width: int) -> tuple[int, int]:
+        # Tiles down and across a board, partial tiles at the edges included
+        return -(-height // self.tile_size), -(-width // self.tile_size)
+
+    @staticmethod
+    def dilate(tiles: np.ndarray) -> np.ndarray:
+        # A tile can only change if it or one of its eight neighbours changed
+        rows = tiles | np.roll(tiles, 1, axis=0) | np.roll(tiles, -1, axis=0)
+        return rows | np.roll(rows, 1, axis=1) | np.roll(rows, -1, axis=1)
+
+    def copy_tiles(self, source: np.ndarray, target: np.ndarray, tiles: np.ndarray) -> None:
+        # Copy the cells of the flagged tiles, one band of tile rows at a time from its
+        # first to its last flagged tile
+        size = self.tile_size
+        for row in np.flatnonzero(tiles.any(axis=1)).tolist():
+            columns = np.flatnonzero(tiles[row])
+            rows = slice(row * size, (row + 1) * size)
+            cells = slice(int(columns[0]) * size, (int(columns[-1]) + 1) * size)
+            target[rows, cells] = source[rows, cells]
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        return self.advance(grid, 1)
+
+    def advance(self, grid: np.ndarray, generations: int = 1) -> np.ndarray:
+        out = np.empty(grid.shape, dtype=np.int8)
+        self.advance_into(grid, out, generations)
+        return out
+
+    def advance_into(self, grid: np.ndarray, out: np.ndarray, generations: int = 1) -> None:
+        state, changed_tiles, previous = self.state, self.changed_tiles, self._previous
+        continued = state is not None and changed_tiles is not None and self.continues(grid)
+        if state is None or changed_tiles is None or not continued:
+            state = grid.astype(np.int8)
+            changed_tiles = np.ones(self.tile_shape(*grid.shape), dtype=bool)
+        # Tiles where state may end up differing from grid: those edited and those changed
+        touched = np.zeros_like(changed_tiles)
+        if continued:
+            size = self.tile_size
+            for x, y, width, height in self._edits:
+                rows, columns = slice(max(0, y), y + height), slice(max(0, x), x + width)
+                state[rows, columns] = grid[rows, columns]
+                touched[
+                    rows.start // size : -(-rows.stop // size), columns.start // size : -(-columns.stop // size)
+                ] = True
+            changed_tiles = changed_tiles | touched
+        self._edits = []
+
+        for _ in range(generations):
+            changed_tiles = self.step(state, changed_tiles)
+            touched |= changed_tiles
+
+        if continued and self.same_memory(out, grid):
+            self.copy_tiles(state, out, touched)
+        elif continued and previous is not None and self.touched_tiles is not None and self.same_memory(out, previous):
+            # The grid before this one, behind by the tiles touched last time as well
+            self.copy_tiles(state, out, touched | self.touched_tiles)
+        else:
+            out[...] = state
+
+        self.state = state
+        self.changed_tiles = changed_tiles
+        self._previous = grid if continued else None
+        self.touched_tiles = touched
+        self.wrote(out)
+
+    def step(self, state: np.ndarray, changed_tiles: np.ndarray) -> np.ndarray:
+        # Advances state in place and returns the tiles that changed
+        height, width = state.shape
+        size = self.tile_size
+        tile_rows, tile_columns = np.nonzero(self.dilate(changed_tiles))
+        next_changed = np.zeros_like(changed_tiles)
+        if len(tile_rows) == 0:
+            return next_changed
+
+        # Cell coordinates of every active tile plus its halo, wrapping at the torus edges
+        offsets = np.arange(-1, size + 1)
+        ys = (tile_rows[:, None] * size + offsets[None, :]) % height
+        xs = (tile_columns[:, None] * size + offsets[None, :]) % width
+        blocks = state[ys[:, :, None], xs[:, None, :]]
+
+        neighbors = np.zeros((len(tile_rows), size, size), dtype=np.int8)
+        for i in range(3):
+            for j in range(3):
+                if i == 1 and j == 1:  # Skip the center
+                    continue
+                neighbors += blocks[:, i : i + size, j : j + size]
+
+        current = blocks[:, 1:-1, 1:-1]
+        new = self.rule.table[neighbors + 9 * current]
+
+        # Partial tiles at the bottom/right edges contain wrapped cells that must not be written back
+        cell_ys = tile_rows[:, None] * size + offsets[None, 1:-1]
+        cell_xs = tile_columns[:, None] * size + offsets[None, 1:-1]
+        valid = (cell_ys < height)[:, :, None] & (cell_xs < width)[:, None, :]
+
+        next_changed[tile_rows, tile_columns] = ((new != current) & valid).any(axis=(1, 2))
+        # All blocks were gathered above, so writing the results in place is safe
+        state[
+            np.broadcast_to(cell_ys[:, :, None], valid.shape)[valid],
+            np.broadcast_to(cell_xs[:, None, :], valid.shape)[valid],
+        ] = new[valid]
+        return next_changed
+
+
+class SparseEngine(Engine):
+    # Stores only live cells on an unbounded plane, as sorted int64 keys packing
+    # (y, x) as y * 2**32 + x, so the key order is row-major and a neighbour is a
+    # fixed key delta away. The grid handed to advance() is a
+    # viewport whose top-left corner is the world origin; its contents replace the
+    # world inside the viewport, and cells outside keep evolving off-screen.
+    name: str = "sparse"
+
+    HALF_ROW: int = 1 << 31
+    NEIGHBOUR_DELTAS: np.ndarray = np.array(
+        [(dy << 32) + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx], dtype=np.int64
+    )
+
+    def __init__(self, rule: AnyRule | None = None) -> None:
+        super().__init__(rule)
+        if self.rule.has_b0:
+            raise ValueError(f"The {self.name} engine can't run B0 rules ({self.rule}) on an unbounded plane")
+        self.keys: np.ndarray = np.zeros(0, dtype=np.int64)
+
+    @property
+    def population(self) -> int:
+        return len(self.keys)
+
+    def reset(self) -> None:
+        super().reset()
+        self.keys = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def encode(cls, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        return (ys.astype(np.int64) << 32) + xs.astype(np.int64)
+
+    @classmethod
+    def decode(cls, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # x is signed, so round to the nearest row rather than truncating
+        ys = (keys + cls.HALF_ROW) >> 32
+        return ys, keys - (ys << 32)
+
+    def load(self, grid: np.ndarray, x: int = 0, y: int = 0) -> None:
+        # Replace the world inside the grid's footprint (top-left at world (x, y)) with the grid
+        height, width = grid.shape
+        ys, xs = self.decode(self.keys)
+        outside = (ys < y) | (ys >= y + height) | (xs < x) | (xs >= x + width)
+        rows, columns = np.nonzero(grid)
+        self.keys = np.sort(np.concatenate((self.keys[outside], self.encode(rows + y, columns + x))))
+
+    def window(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        grid = np.zeros((height, width), dtype=np.int8)
+        ys, xs = self.decode(self.keys)
+        inside = (ys >= y) & (ys < y + height) & (xs >= x) & (xs < x + width)
+        grid[ys[inside] - y, xs[inside] - x] = 1
+        return grid
+
+    def step(self) -> None:
+        if len(self.keys) == 0:
+            return
+
+        # Every live cell votes for its eight neighbours; the histogram of votes is the neighbour count
+        votes = (self.keys[:, None] + self.NEIGHBOUR_DELTAS[None, :]).ravel()
+        candidates, counts = np.unique(votes, return_counts=True)
+
+        # Sorted membership test of the candidates against the current live cells
+        positions = np.searchsorted(self.keys, candidates)
+        alive = self.keys[np.minimum(positions, len(self.keys) - 1)] == candidates
+
+        next_keys = candidates[self.rule.table[counts + 9 * alive].astype(bool)]
+
+        if 0 in self.rule.survival:
+            # Isolated live cells received no votes, so they aren't among the candidates
+            isolated = self.keys[~np.isin(self.keys, candidates, assume_unique=True)]
+            next_keys = np.union1d(next_keys, isolated)
+
+        # np.unique and np.union1d return sorted keys, so the result stays sorted
+        self.keys = next_keys
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        return self.advance(grid, 1)
+
+    def advance(self, grid: np.ndarray, generations: int = 1) -> np.ndarray:
+        height, width = grid.shape
+        self.load(grid)
+        for _ in range(generations):
+            self.step()
+        return self.window(0, 0, width, height)
+
+
+class IsotropicEngine(Engine):
+    # Applies rules that depend on the arrangement of the neighbours and not just their
+    # count, through the rule's table of all 512 arrangements of a 3x3 neighbourhood.
+    # As in NumPyEngine, cells are looked up in pairs and every buffer is allocated once
+    # per board size, each generation being a fixed sequence of ufunc calls through out=
+    # on flat 1D views of the padded board, so stepping allocates nothing.
+    #
+    # Each column's three cells (above, level, below) are packed into 3 bits, and byte j
+    # of a run holds the columns either side of cell j. Read as uint16, bytes 2k and
+    # 2k + 1 then hold all four columns around cells 2k and 2k + 1, and index a table
+    # of both their next states. Bytes are combined with multiplies, as uint8 shifts
+    # aren't vectorised.
+    name: str = "isotropic"
+    RULE_TYPES: tuple[type, ...] = (Rule, IsotropicRule)
+
+    # Bit of a pair index holding the top cell of each column around the pair, west first
+    COLUMN_BITS: tuple[int, ...] = (0, 8, 3, 11)
+
+    def __init__(self, rule: AnyRule | None = None) -> None:
+        super().__init__(rule)
+        self.table: np.ndarray = self.rule.neighbourhood_table
+        self.shape: tuple[int, int] | None = None
+
+        # The west cell's neighbourhood is columns 0-2 around the pair and the east
+        # cell's columns 1-3, as bit row * 3 + column of the 9-bit table index. The west
+        # result goes in the low byte, the first in memory.
+        pair = np.arange(1 << 14)
+        west = np.zeros_like(pair)
+        east = np.zeros_like(pair)
+        for row in range(3):
+            for column in range(3):
+                west |= ((pair >> (self.COLUMN_BITS[column] + row)) & 1) << (row * 3 + column)
+                east |= ((pair >> (self.COLUMN_BITS[column + 1] + row)) & 1) << (row * 3 + column)
+        table = self.table.astype(np.uint16)
+        self.pair_table: np.ndarray = table[west] | (table[east] << 8)
+
+    def allocate(self, height: int, width: int) -> None:
+        self.shape = (height, width)
+        stride = width + 2
+        size = (height + 2) * stride
+        # Two spare cells past the padded board, so the last columns can be read whole
+        flat = np.zeros(size + 2, dtype=np.uint8)
+        self.padded = flat[:size].reshape(height + 2, stride)
+
+        # columns[i] holds the three cells of the column centred on flat[i + stride],
+        # the one above lowest
+        length = height * stride + 2
+        self.column_parts = (flat[:length], flat[stride : stride + length], flat[2 * stride : 2 * stride + length])
+        self.columns = np.zeros(length, dtype=np.uint8)
+        self.shifted = np.zeros(length, dtype=np.uint8)
+
+        # Pairs run from the first real cell to the last; results for halo columns are
+        # never copied out. Byte q is for cell start + q, whose west column is columns[q].
+        start = stride + 1
+        pairs = (height * stride - 1) // 2
+        self.sides = (self.columns[: 2 * pairs], self.columns[2 : 2 * pairs + 2])
+        self.index_bytes = np.zeros(2 * pairs, dtype=np.uint8)
+        self.index_pairs = self.index_bytes.view(np.uint16)
+        # np.take needs platform integer indices
+        self.lookup = np.zeros(pairs, dtype=np.intp)
+
+        # Results are written in pairs, so the run of them starts on an even byte
+        result = np.zeros(size + 2, dtype=np.uint8)
+        offset = start % 2
+        self.next_pairs = result[offset + start : offset + start + 2 * pairs].view(np.uint16)
+        self.result_centre = result[offset : offset + size].reshape(height + 2, stride)[1:-1, 1:-1]
+
+        self.centre = self.padded[1:-1, 1:-1]
+        # Halo copies: rows first, then whole columns so the corners wrap too
+        padded = self.padded
+        self.halo = [
+            (padded[0, 1:-1], padded[height, 1:-1]),
+            (padded[height + 1, 1:-1], padded[1, 1:-1]),
+            (padded[:, 0], padded[:, width]),
+            (padded[:, width + 1], padded[:, 1]),
+        ]
+
+    def step_into(self, grid: np.ndarray, out: np.ndarray) -> None:
+        # grid may be the same array as out: it is copied into the padded buffer first
+        if self.shape != grid.shape:
+            self.allocate(*grid.shape)
+
+        _ = np.copyto(self.centre, grid, casting="unsafe")
+        for target, source in self.halo:
+            _ = np.copyto(target, source)
+
+        above, level, below = self.column_parts
+        columns, shifted = self.columns, self.shifted
+        _ = np.multiply(level, 2, out=columns)
+        _ = np.bitwise_or(columns, above, out=columns)
+        _ = np.multiply(below, 4, out=shifted)
+        _ = np.bitwise_or(columns, shifted, out=columns)
+
+        west, east = self.sides
+        _ = np.multiply(east, 8, out=self.index_bytes)
+        _ = np.bitwise_or(self.index_bytes, west, out=self.index_bytes)
+
+        # A single gather applies the rule to two cells per element
+        _ = np.copyto(self.lookup, self.index_pairs)
+        _ = np.take(self.pair_table, self.lookup, out=self.next_pairs, mode="clip")
+
+        _ = np.copyto(out, self.result_centre, casting="unsafe")
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        out = np.empty(grid.shape, dtype=grid.dtype)
+        self.step_into(grid, out)
+        return out
+
+    def advance_into(self, grid: np.ndarray, out: np.ndarray, generations: int = 1) -> None:
+        self.step_into(grid, out)
+        for _ in range(generations - 1):
+            self.step_into(out, out)
+
+
+class GenerationsEngine(Engine):
+    # Runs multi-state Generations rules (and plain two-state ones) on uint8 states.
+    # Only live cells (state 1) count as neighbours, so the neighbour count is summed
+    # from a boolean mask of them, and the next state of every cell, whether it is
+    # born, survives, starts dying or keeps decaying, comes from one gather in the
+    # rule's states * 9 table. The cost per cell doesn't depend on the number of states.
+    name: str = "generations"
+    RULE_TYPES: tuple[type, ...] = (Rule, GenerationsRule)
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        height, width = grid.shape
+        alive = np.pad(grid == 1, 1, mode="wrap").view(np.uint8)
+
+        counts = np.zeros((height, width), dtype=np.uint8)
+        for dy in range(3):
+            for dx in range(3):
+                if dy == 1 and dx == 1:  # Skip the center
+                    continue
+                counts += alive[dy : dy + height, dx : dx + width]
+
+        index = grid.astype(np.intp) * 9
+        index += counts
+        return self.rule.table[index].astype(np.uint8)
+
+
+class LargerThanLifeEngine(Engine):
+    # Runs Larger than Life rules, whose neighbourhoods reach up to R cells away. The
+    # live cells of the board, wrapped by R on every side, are turned into a summed-area
+    # table, and every cell's count is four lookups into it, so a step costs the same
+    # for any radius. Diamond neighbourhoods are counted the same way on the board
+    # rotated by 45 degrees, where they become boxes.
+    name: str = "ltl"
+    RULE_TYPES: tuple[type, ...] = (LargerThanLifeRule,)
+    # Conway's Life written as a Larger than Life rule
+    DEFAULT_RULE: str = "R1,C0,M0,S2..3,B3..3,NM"
+
+    def __init__(self, rule: AnyRule | None = None) -> None:
+        super().__init__(rule)
+        self.shape: tuple[int, int] | None = None
+
+    @staticmethod
+    def integral(cells: np.ndarray) -> np.ndarray:
+        # Summed-area table with a leading row and column of zeros, so the sum of
+        # cells[top:bottom, left:right] is
+        # table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+        height, width = cells.shape
+        table = np.zeros((height + 1, width + 1), dtype=np.int32)
+        _ = np.cumsum(cells, axis=0, out=table[1:, 1:])
+        _ = np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+        return table
+
+    def allocate(self, height: int, width: int) -> None:
+        # Positions in the rotated board, which only depend on the board size
+        self.shape = (height, width)
+        radius = self.rule.radius
+        padded_width = width + 2 * radius
+        # Padded cell (py, px) moves to (py + px, py - px + padded_width - 1)
+        padded_ys, padded_xs = np.indices((height + 2 * radius, padded_width))
+        self.rotated_index = (padded_ys + padded_xs, padded_ys - padded_xs + padded_width - 1)
+        self.rotated_size = height + width + 4 * radius - 1
+
+        # A diamond of radius R around a cell is the box of radius R around its rotated position
+        ys, xs = np.indices((height, width))
+        u, v = ys + xs + 2 * radius, ys - xs + padded_width - 1
+        self.rotated_box = (u - radius, u + radius + 1, v - radius, v + radius + 1)
+
+    def box_counts(self, padded: np.ndarray, height: int, width: int) -> np.ndarray:
+        table = self.integral(padded)
+        size = 2 * self.rule.radius + 1
+        return (
+            table[size : size + height, size : size + width]
+            - table[:height, size : size + width]
+            - table[size : size + height, :width]
+            + table[:height, :width]
+        )
+
+    def diamond_counts(self, padded: np.ndarray, height: int, width: int) -> np.ndarray:
+        if self.shape != (height, width):
+            self.allocate(height, width)
+        rotated = np.zeros((self.rotated_size, self.rotated_size), dtype=np.int32)
+        rotated[self.rotated_index] = padded
+        table = self.integral(rotated)
+        top, bottom, left, right = self.rotated_box
+        return table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        rule = self.rule
+        height, width = grid.shape
+        alive = grid == 1
+        padded = np.pad(alive, rule.radius, mode="wrap")
+
+        if rule.neighbourhood == "M":
+            counts = self.box_counts(padded, height, width)
+        else:
+            counts = self.diamond_counts(padded, height, width)
+        if not rule.middle:
+            counts -= alive
+
+        index = grid.astype(np.intp) * (rule.max_count + 1)
+        index += counts
+        return rule.table[index]
+
+
+class LeniaEngine(Engine):
+    # Runs continuous Lenia rules on float32 boards. The kernel is as wide as the rule's
+    # radius, so rather than convolving directly (O(R^2) per cell) both the board and
+    # the kernel are taken to the frequency domain with rfft2, where convolution is a
+    # product, making a step O(N log N) for any radius. The kernel's spectrum only
+    # depends on the board size and the kernel, so it is computed once and cached.
+    name: str = "lenia"
+    RULE_TYPES: tuple[type, ...] = (LeniaRule,)
+    DEFAULT_RULE: str = "orbium"
+
+    def __init__(self, rule: AnyRule | None = None) -> None:
+        super().__init__(rule)
+        self.spectra: dict[tuple[int, int, tuple[int, tuple[Fraction, ...]]], np.ndarray] = {}
+
+    def kernel(self, height: int, width: int) -> np.ndarray:
+        # The kernel laid out on the torus with its centre at (0, 0), normalised to sum to 1
+        rule = self.rule
+        dy = (np.arange(height) + height // 2) % height - height // 2
+        dx = (np.arange(width) + width // 2) % width - width // 2
+        distance = np.hypot(dy[:, None], dx[None, :]) / rule.radius
+
+        # Each ring is a smooth bump exp(4 - 1 / (r (1 - r))), scaled by its height in b
+        rings = distance * len(rule.peaks)
+        ring = np.minimum(rings.astype(np.intp), len(rule.peaks) - 1)
+        position = rings - ring
+        inside = (distance < 1) & (position > 0) & (position < 1)
+        heights = np.array([float(peak) for peak in rule.peaks])
+        kernel = np.zeros((height, width))
+        kernel[inside] = heights[ring[inside]] * np.exp(4 - 1 / (position[inside] * (1 - position[inside])))
+        return (kernel / kernel.sum()).astype(np.float32)
+
+    def spectrum(self, height: int, width: int) -> np.ndarray:
+        key = (height, width, self.rule.kernel_key)
+        if key not in self.spectra:
+            self.spectra[key] = np.fft.rfft2(self.kernel(height, width))
+        return self.spectra[key]
+
+    def next_generation(self, grid: np.ndarray) -> np.ndarray:
+        rule = self.rule
+        cells = grid.astype(np.float32, copy=False)
+        potential = np.fft.irfft2(np.fft.rfft2(cells) * self.spectrum(*grid.shape), s=grid.shape)
+
+        growth = np.exp(-(((potential - rule.mu) / rule.sigma) ** 2) / 2) * 2 - 1
+        growth /= rule.time
+        growth += cells
+        return np.clip(growth, 0, 1, out=growth).astype(np.float32, copy=False)
+
+
+ENGINES: dict[str, type[Engine]] = {
+    NumPyEngine.name: NumPyEngine,
+    BitPackedEngine.name: BitPackedEngine,
+    TiledEngine.name: TiledEngine,
+    SparseEngine.name: SparseEngine,
+    IsotropicEngine.name: IsotropicEngine,
+    GenerationsEngine.name: GenerationsEngine,
+    LargerThanLifeEngine.name: LargerThanLifeEngine,
+    LeniaEngine.name: LeniaEngine,
+}
+
+DEFAULT_ENGINE: str = NumPyEngine.name
+
+
+def engine_for(rule: AnyRule) -> str:
+    # The default engine if it can run the rule, otherwise the first one that can
+    candidates = [DEFAULT_ENGINE, *ENGINES]
+    return next(name for name in candidates if isinstance(rule, ENGINES[name].RULE_TYPES))
+
+
+def create_engine(name: str = DEFAULT_ENGINE, rule: AnyRule | None = None) -> Engine:
+    try:
+        engine_class = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine: {name}") from None
+    return engine_class(rule)
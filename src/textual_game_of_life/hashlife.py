@@ -0,0 +1,384 @@
+from functools import lru_cache
+import numpy as np
+from .rules import DEFAULT_RULE, AnyRule, IsotropicRule, Rule
+
+
+class Node:
+    # Quadtree node covering a 2**level square. Level 0 nodes are single cells.
+    # Nodes are compared by identity; hashing uses a precomputed structural hash
+    # so lookups in the join and successor caches stay cheap.
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "_hash")
+
+    def __init__(
+        self,
+        level: int,
+        nw: "Node | None",
+        ne: "Node | None",
+        sw: "Node | None",
+        se: "Node | None",
+        population: int,
+        node_hash: int,
+    ) -> None:
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+        self._hash = node_hash
+
+    def __hash__(self) -> int:
+        return self._hash
+
+
+class HashlifeEngine:
+    # Memoized quadtree (Hashlife) simulation of an unbounded plane.
+    #
+    # The root node is always centred on the world origin, so a root of level k
+    # covers the cells from -2**(k-1) to 2**(k-1) - 1 on both axes. Both caches are
+    # bounded LRU caches: once full, the least recently used nodes/results are
+    # evicted, which only costs recomputation and never correctness.
+    MIN_LEVEL: int = 3
+    MACROCELL_LEAF_LEVEL: int = 3
+
+    def __init__(self, rule: AnyRule | None = None, max_nodes: int = 1 << 20, max_results: int = 1 << 18) -> None:
+        rule = rule if rule is not None else Rule.parse(DEFAULT_RULE)
+        if not isinstance(rule, (Rule, IsotropicRule)):
+            raise ValueError(f"Hashlife can only run two-state rules, not {rule}")
+        self.rule: Rule | IsotropicRule = rule
+        if self.rule.has_b0:
+            raise ValueError(f"Hashlife can't run B0 rules ({self.rule}) on an unbounded plane")
+        self.table: np.ndarray = self.rule.neighbourhood_table
+
+        self.off = Node(0, None, None, None, None, 0, 0)
+        self.on = Node(0, None, None, None, None, 1, 1)
+
+        self.join = lru_cache(maxsize=max_nodes)(self._join)
+        self.successor = lru_cache(maxsize=max_results)(self._successor)
+
+        self._empty: list[Node] = [self.off]
+        self.root: Node = self.empty(self.MIN_LEVEL)
+        self.generation: int = 0
+
+    @property
+    def population(self) -> int:
+        return self.root.population
+
+    def clear_caches(self) -> None:
+        self.join.cache_clear()
+        self.successor.cache_clear()
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        level = nw.level + 1
+        return Node(
+            level,
+            nw,
+            ne,
+            sw,
+            se,
+            nw.population + ne.population + sw.population + se.population,
+            hash((level, nw._hash, ne._hash, sw._hash, se._hash)),
+        )
+
+    def empty(self, level: int) -> Node:
+        while len(self._empty) <= level:
+            smaller = self._empty[-1]
+            self._empty.append(self.join(smaller, smaller, smaller, smaller))
+        return self._empty[level]
+
+    def centre(self, node: Node) -> Node:
+        # Embed the node in the middle of an empty node twice its size
+        border = self.empty(node.level - 1)
+        return self.join(
+            self.join(border, border, border, node.nw),
+            self.join(border, border, node.ne, border),
+            self.join(border, node.sw, border, border),
+            self.join(node.se, border, border, border),
+        )
+
+    def inner(self, node: Node) -> Node:
+        # The central half of a node (the inverse of centre)
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    @staticmethod
+    def is_padded(node: Node) -> bool:
+        # True when every live cell lies in the central quarter of the node
+        return (
+            node.nw.population == node.nw.se.se.population
+            and node.ne.population == node.ne.sw.sw.population
+            and node.sw.population == node.sw.ne.ne.population
+            and node.se.population == node.se.nw.nw.population
+        )
+
+    def _base(self, node: Node) -> Node:
+        # One generation of the centre 2x2 of a 4x4 node
+        cells = self._to_list(node)
+        result = []
+        for y in (1, 2):
+            for x in (1, 2):
+                # The 3x3 neighbourhood as a 9-bit index into the rule's 512-entry table
+                index = sum(cells[y + dy][x + dx] << ((dy + 1) * 3 + dx + 1) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+                alive = self.table[index]
+                result.append(self.on if alive else self.off)
+        return self.join(*result)
+
+    def _successor(self, node: Node, exponent: int) -> Node:
+        # The central half of the node, advanced 2**exponent generations
+        # (exponent is at most node.level - 2)
+        if node.population == 0:
+            return node.nw
+        if node.level == 2:
+            return self._base(node)
+
+        exponent = min(exponent, node.level - 2)
+        step = min(exponent, node.level - 3)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        join = self.join
+
+        c1 = self.successor(nw, step)
+        c2 = self.successor(join(nw.ne, ne.nw, nw.se, ne.sw), step)
+        c3 = self.successor(ne, step)
+        c4 = self.successor(join(nw.sw, nw.se, sw.nw, sw.ne), step)
+        c5 = self.successor(join(nw.se, ne.sw, sw.ne, se.nw), step)
+        c6 = self.successor(join(ne.sw, ne.se, se.nw, se.ne), step)
+        c7 = self.successor(sw, step)
+        c8 = self.successor(join(sw.ne, se.nw, sw.se, se.sw), step)
+        c9 = self.successor(se, step)
+
+        if exponent < node.level - 2:
+            # The nine sub-results are already advanced far enough; just recombine their centres
+            return join(
+                join(c1.se, c2.sw, c4.ne, c5.nw),
+                join(c2.se, c3.sw, c5.ne, c6.nw),
+                join(c4.se, c5.sw, c7.ne, c8.nw),
+                join(c5.se, c6.sw, c8.ne, c9.nw),
+            )
+
+        return join(
+            self.successor(join(c1, c2, c4, c5), step),
+            self.successor(join(c2, c3, c5, c6), step),
+            self.successor(join(c4, c5, c7, c8), step),
+            self.successor(join(c5, c6, c8, c9), step),
+        )
+
+    def jump(self, exponent: int) -> None:
+        # Advance the whole plane by 2**exponent generations in one call
+        node = self.root
+        while node.level < exponent + 2 or not self.is_padded(node):
+            node = self.centre(node)
+        # One more level so nothing that grows during the jump falls outside the result
+        node = self.centre(node)
+        self.root = self._compact(self.successor(node, exponent))
+        self.generation += 1 << exponent
+
+    def advance(self, generations: int) -> None:
+        exponent = 0
+        while generations:
+            if generations & 1:
+                self.jump(exponent)
+            generations >>= 1
+            exponent += 1
+
+    def _compact(self, node: Node) -> Node:
+        # Strip empty borders so the tree doesn't keep growing after every jump
+        while node.level > self.MIN_LEVEL and self.is_padded(node):
+            node = self.inner(node)
+        return node
+
+    def _build(self, cells: np.ndarray, level: int) -> Node:
+        if level == 0:
+            return self.on if cells[0, 0] else self.off
+        if not cells.any():
+            return self.empty(level)
+        half = 1 << (level - 1)
+        return self.join(
+            self._build(cells[:half, :half], level - 1),
+            self._build(cells[:half, half:], level - 1),
+            self._build(cells[half:, :half], level - 1),
+            self._build(cells[half:, half:], level - 1),
+        )
+
+    def _block(self, pattern: int) -> Node:
+        # The node of a 4x4 block whose live cells are the set bits row * 4 + column
+        quarters = [self.on if pattern >> bit & 1 else self.off for bit in range(16)]
+        return self.join(
+            self.join(quarters[0], quarters[1], quarters[4], quarters[5]),
+            self.join(quarters[2], quarters[3], quarters[6], quarters[7]),
+            self.join(quarters[8], quarters[9], quarters[12], quarters[13]),
+            self.join(quarters[10], quarters[11], quarters[14], quarters[15]),
+        )
+
+    def load_array(self, cells: np.ndarray, x: int = 0, y: int = 0) -> None:
+        # Replace the plane with the given cells, placing cells[0, 0] at world (x, y). The
+        # tree is built bottom up from the 4x4 blocks holding live cells, found a strip
+        # of blocks at a time, so neither time nor memory grows with the root's empty area.
+        height, width = cells.shape
+        extent = max(-x, -y, x + width, y + height, 1 << (self.MIN_LEVEL - 1))
+        level = max(self.MIN_LEVEL, int(extent - 1).bit_length() + 1)
+        half = 1 << (level - 1)
+        self.generation = 0
+
+        # Where cells[0, 0] sits in the root's square, counted in blocks and cells into its block
+        block_y, offset_y = divmod(y + half, 4)
+        block_x, offset_x = divmod(x + half, 4)
+        patterns = np.zeros(-(-(offset_x + width) // 4), dtype=np.uint16)
+        live_rows = cells.any(axis=1)
+        found: list[tuple[int, np.ndarray, np.ndarray]] = []
+        for strip_index, top in enumerate(range(-offset_y, height, 4)):
+            first, last = max(top, 0), min(top + 4, height)
+            if not live_rows[first:last].any():
+                continue
+            rows, columns = np.nonzero(cells[first:last])
+            rows += first - top
+            columns += offset_x
+            patterns[:] = 0
+            np.bitwise_or.at(patterns, columns >> 2, np.left_shift(1, rows * 4 + (columns & 3)).astype(np.uint16))
+            live = np.flatnonzero(patterns)
+            found.append((block_y + strip_index, block_x + live, patterns[live]))
+        if not found:
+            self.root = self.empty(level)
+            return
+
+        ys = np.concatenate([np.full(len(columns), row) for row, columns, _ in found])
+        xs = np.concatenate([columns for _, columns, _ in found])
+        unique, inverse = np.unique(np.concatenate([patterns for _, _, patterns in found]), return_inverse=True)
+        blocks = [self._block(pattern) for pattern in unique.tolist()]
+        nodes = [blocks[index] for index in inverse.tolist()]
+
+        # Each level up, nodes are grouped by parent and joined, absent quarters empty
+        for node_level in range(2, level):
+            quadrants = (ys & 1) * 2 + (xs & 1)
+            ys, xs = ys >> 1, xs >> 1
+            order = np.lexsort((xs, ys))
+            ys, xs, quadrants = ys[order], xs[order], quadrants[order].tolist()
+            ordered = [nodes[index] for index in order.tolist()]
+            starts = np.flatnonzero(np.concatenate(([True], (ys[1:] != ys[:-1]) | (xs[1:] != xs[:-1]))))
+            ends = np.append(starts[1:], len(ordered)).tolist()
+
+            empty = self.empty(node_level)
+            nodes = []
+            for start, end in zip(starts.tolist(), ends):
+                quarters = [empty, empty, empty, empty]
+                for index in range(start, end):
+                    quarters[quadrants[index]] = ordered[index]
+                nodes.append(self.join(*quarters))
+            ys, xs = ys[starts], xs[starts]
+        self.root = nodes[0]
+
+    def _fill(self, node: Node, target: np.ndarray, top: int, left: int) -> None:
+        # Write the node (whose top-left corner is at target[top, left]) into target,
+        # skipping empty nodes and anything outside the target
+        size = 1 << node.level
+        if node.population == 0 or top >= target.shape[0] or left >= target.shape[1]:
+            return
+        if top + size <= 0 or left + size <= 0:
+            return
+        if node.level == 0:
+            target[top, left] = 1
+            return
+        half = size >> 1
+        self._fill(node.nw, target, top, left)
+        self._fill(node.ne, target, top, left + half)
+        self._fill(node.sw, target, top + half, left)
+        self._fill(node.se, target, top + half, left + half)
+
+    def window(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        # The cells of the plane from world (x, y), width x height cells
+        target = np.zeros((height, width), dtype=np.int8)
+        half = 1 << (self.root.level - 1)
+        self._fill(self.root, target, -half - y, -half - x)
+        return target
+
+    @staticmethod
+    def _to_list(node: Node) -> list[list[int]]:
+        size = 1 << node.level
+        cells = [[0] * size for _ in range(size)]
+
+        def fill(current: Node, top: int, left: int) -> None:
+            if current.population == 0:
+                return
+            if current.level == 0:
+                cells[top][left] = 1
+                return
+            half = 1 << (current.level - 1)
+            fill(current.nw, top, left)  # pyright: ignore[reportArgumentType]
+            fill(current.ne, top, left + half)  # pyright: ignore[reportArgumentType]
+            fill(current.sw, top + half, left)  # pyright: ignore[reportArgumentType]
+            fill(current.se, top + half, left + half)  # pyright: ignore[reportArgumentType]
+
+        fill(node, 0, 0)
+        return cells
+
+    def read_macrocell(self, text: str) -> str | None:
+        # Parse a Golly macrocell ([M2]) file; the root is centred on the world origin.
+        # Returns the rule named by the file's #R line, if it has one; the tree doesn't
+        # depend on the rule, so the caller decides which rule to run it under.
+        nodes: list[Node | None] = [None]  # Index 0 means "empty node"
+        rule: str | None = None
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if line.startswith("#R"):
+                rule = line[2:].strip() or None
+                continue
+            if not line or line[0] in "[#":
+                continue
+
+            if line[0] in ".*$":
+                # 8x8 leaf bitmap: rows terminated by '$', trailing dead cells omitted
+                cells = np.zeros((8, 8), dtype=np.uint8)
+                for row, row_text in enumerate(line.split("$")[:8]):
+                    for column, char in enumerate(row_text[:8]):
+                        cells[row, column] = char == "*"
+                nodes.append(self._build(cells, self.MACROCELL_LEAF_LEVEL))
+                continue
+
+            try:
+                level, *children = (int(part) for part in line.split())
+            except ValueError:
+                raise ValueError(f"Invalid macrocell line: {raw_line}") from None
+            if len(children) != 4 or level <= self.MACROCELL_LEAF_LEVEL:
+                raise ValueError(f"Unsupported macrocell node: {raw_line}")
+
+            quadrants = [nodes[child] if child else self.empty(level - 1) for child in children]
+            if any(quadrant is None or quadrant.level != level - 1 for quadrant in quadrants):
+                raise ValueError(f"Invalid macrocell node reference: {raw_line}")
+            nodes.append(self.join(*quadrants))  # pyright: ignore[reportArgumentType]
+
+        root = nodes[-1]
+        self.root = self._compact(root) if root is not None else self.empty(self.MIN_LEVEL)
+        self.generation = 0
+        return rule
+
+    def write_macrocell(self) -> str:
+        lines = ["[M2] (textual-game-of-life)", f"#R {self.rule}"]
+        if self.generation:
+            lines.append(f"#G {self.generation}")
+
+        indices: dict[int, int] = {}
+
+        def emit(node: Node) -> int:
+            if node.population == 0:
+                return 0
+            key = id(node)
+            if key in indices:
+                return indices[key]
+
+            if node.level == self.MACROCELL_LEAF_LEVEL:
+                rows = ["".join("*" if cell else "." for cell in row).rstrip(".") for row in self._to_list(node)]
+                while rows and not rows[-1]:
+                    _ = rows.pop()
+                lines.append("".join(f"{row}$" for row in rows))
+            else:
+                children = [
+                    emit(child) for child in (node.nw, node.ne, node.sw, node.se)
+                ]  # pyright: ignore[reportArgumentType]
+                lines.append(f"{node.level} {' '.join(str(child) for child in children)}")
+
+            indices[key] = len(indices) + 1
+            return indices[key]
+
+        root = self.root
+        while root.level <= self.MACROCELL_LEAF_LEVEL:
+            root = self.centre(root)
+        _ = emit(root)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,139 @@
+# Runs the simulation without the terminal UI, for batch jobs and performance checks.
+# Nothing here may import textual, directly or through the canvas.
+import json
+import sys
+import time
+import numpy as np
+from .engines import create_engine, engine_for
+from .hashlife import HashlifeEngine
+from .patterns import place, read_rle
+from .rules import DEFAULT_RULE, AnyRule, LeniaRule, parse_rule
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def cell_dtype(rule: AnyRule) -> type[np.uint8 | np.float32]:
+    return np.float32 if isinstance(rule, LeniaRule) else np.uint8
+
+
+def random_board(width: int, height: int, rule: AnyRule, seed: int | None = None) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if isinstance(rule, LeniaRule):
+        return rng.random((height, width), dtype=np.float32)
+    return rng.integers(0, 2, (height, width), dtype=np.uint8)
+
+
+def load_board(filepath: str, width: int, height: int, rule: AnyRule) -> tuple[np.ndarray, AnyRule]:
+    # Saved games (.textual JSON), macrocell files (.mc) and RLE patterns (.rle). Saved
+    # games keep their own size, patterns are placed in the middle of a width x height board.
+    # A rule stored in the file replaces the given one, as when loading in the UI.
+    if filepath.endswith(".mc"):
+        hashlife = HashlifeEngine()
+        with open(filepath) as load_file:
+            rule_text = hashlife.read_macrocell(load_file.read())
+        if rule_text:
+            rule = parse_rule(rule_text)
+        board = hashlife.window(-(width // 2), -(height // 2), width, height)
+        return board.astype(cell_dtype(rule)), rule
+
+    if filepath.endswith(".rle"):
+        with open(filepath) as load_file:
+            cells, rule_text = read_rle(load_file.read())
+        if rule_text:
+            rule = parse_rule(rule_text)
+        return place(cells.astype(cell_dtype(rule)), width, height), rule
+
+    with open(filepath) as load_file:
+        data = json.load(load_file)  # pyright: ignore[reportAny]
+    if "rule" in data:
+        rule = parse_rule(data["rule"])  # pyright: ignore[reportAny]
+    width = data.get("canvas_width", width)  # pyright: ignore[reportAny]
+    height = data.get("canvas_height", height)  # pyright: ignore[reportAny]
+    matrix = np.array(data.get("matrix", []), dtype=cell_dtype(rule))  # pyright: ignore[reportAny]
+    board = np.zeros((height, width), dtype=cell_dtype(rule))
+    if matrix.size:
+        # Saved matrices carry a spare row and column past the canvas
+        copy_height, copy_width = min(height, matrix.shape[0]), min(width, matrix.shape[1])
+        board[:copy_height, :copy_width] = matrix[:copy_height, :copy_width]
+    return board, rule
+
+
+def save_board(filepath: str, board: np.ndarray, rule: AnyRule) -> None:
+    height, width = board.shape
+    if filepath.endswith(".mc"):
+        hashlife = HashlifeEngine(rule)
+        hashlife.load_array(board, -(width // 2), -(height // 2))
+        with open(filepath, "w") as save_file:
+            _ = save_file.write(hashlife.write_macrocell())
+        return
+
+    # The same layout the UI saves, so the result can be opened with --load
+    matrix = np.zeros((height + 1, width + 1), dtype=board.dtype)
+    matrix[:height, :width] = board
+    data = {"matrix": matrix.tolist(), "canvas_width": width, "canvas_height": height, "rule": str(rule)}
+    with open(filepath, "w") as save_file:
+        json.dump(data, save_file)
+
+
+def peak_memory() -> int | None:
+    # Peak resident set size of the process in bytes
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run(
+    generations: int,
+    width: int = 20,
+    height: int = 20,
+    rule: str = DEFAULT_RULE,
+    engine: str | None = None,
+    load_file: str | None = None,
+    output: str | None = None,
+    seed: int | None = None,
+) -> dict[str, float | int | str | None]:
+    parsed_rule = parse_rule(rule)
+    if load_file:
+        board, parsed_rule = load_board(load_file, width, height, parsed_rule)
+    else:
+        board = random_board(width, height, parsed_rule, seed)
+    simulation = create_engine(engine or engine_for(parsed_rule), parsed_rule)
+
+    start = time.perf_counter()
+    simulation.advance_into(board, board, generations)
+    elapsed = time.perf_counter() - start
+
+    if output:
+        save_board(output, board, parsed_rule)
+
+    height, width = board.shape
+    # Guard against a zero duration on tiny runs
+    elapsed = max(elapsed, 1e-9)
+    return {
+        "engine": simulation.name,
+        "rule": str(parsed_rule),
+        "width": width,
+        "height": height,
+        "generations": generations,
+        "seconds": elapsed,
+        "generations_per_second": generations / elapsed,
+        "cells_per_second": generations * width * height / elapsed,
+        "peak_memory_bytes": peak_memory(),
+    }
+
+
+def format_report(report: dict[str, float | int | str | None]) -> str:
+    peak = report["peak_memory_bytes"]
+    lines = [
+        f"{report['generations']} generations of {report['rule']} on a {report['width']}x{report['height']} board"
+        f" with the {report['engine']} engine in {report['seconds']:.3f}s",
+        f"generations/sec: {report['generations_per_second']:.1f}",
+        f"cells/sec: {report['cells_per_second']:.4g}",
+        f"peak memory: {peak / (1 << 20):.1f} MiB" if isinstance(peak, int) else "peak memory: unavailable",
+    ]
+    return "\n".join(lines)
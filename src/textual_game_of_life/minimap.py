@@ -0,0 +1,202 @@
+import numpy as np
+from rich.color import Color, blend_rgb
+from rich.segment import Segment
+from rich.style import Style
+from textual import events
+from textual.geometry import Region
+from textual.strip import Strip
+from textual.widget import Widget
+from typing_extensions import override
+from .canvas import Canvas
+
+
+class Minimap(Widget):
+    # The whole board at low resolution beside the canvas, with the canvas's view outlined.
+    # Each pixel is a block of cells shaded by the fraction of them alive, drawn two pixels
+    # to a line with half block glyphs.
+    COMPONENT_CLASSES: set[str] = {  # pyright: ignore[reportIncompatibleVariableOverride]
+        "minimap--dead",
+        "minimap--live",
+        "minimap--view",
+    }
+
+    DEFAULT_CSS: str = """
+    Minimap {
+        dock: right;
+        width: 34;
+        height: 18;
+        border: round $accent;
+    }
+    Minimap > .minimap--dead {
+        background: #FFFFFF;
+    }
+    Minimap > .minimap--live {
+        background: #000000;
+    }
+    Minimap > .minimap--view {
+        background: #FF0000;
+    }
+    """
+    HALF_BLOCK: str = "\u2580"
+    # Shades between dead and live blocks
+    LEVELS: int = 8
+    # Redrawn at most this many times per second, well below the canvas's frame rate
+    fps: float = 4.0
+    # Rows of cells per tile when looking for changed cells; only tiles of rows with a
+    # changed cell are summed again
+    TILE_ROWS: int = 16
+    # Pixels across and down when the widget has no size yet
+    DEFAULT_PIXELS: tuple[int, int] = (32, 32)
+
+    def __init__(self, canvas: Canvas) -> None:
+        super().__init__()
+        self.canvas = canvas
+        # Cells per side of the block each pixel shows
+        self.block: int = 1
+        # The sum of the cells in each block
+        self._sums: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        # Shade of each pixel with the view outlined, two rows to a line
+        self._image: np.ndarray = np.zeros((0, 0), dtype=np.intp)
+        # What the sums and the image were made from, to skip work when nothing changed
+        self._summed_key: tuple[object, ...] | None = None
+        self._shades: np.ndarray = np.zeros((0, 0), dtype=np.intp)
+        self._drawn_view: Region | None = None
+        # Shades from dead to live followed by the outline's style, resolved from the CSS once
+        self._styles: list[Style] = []
+        self._half_block_styles: dict[tuple[int, int], Style] = {}
+
+    def on_mount(self) -> None:
+        _ = self.set_interval(1 / self.fps, self.update_map)
+
+    def on_resize(self, _: events.Resize) -> None:
+        # Blocks are sized to fit the widget
+        self.update_map()
+
+    @override
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._styles = []
+        self._half_block_styles.clear()
+
+    @property
+    def styles_by_shade(self) -> list[Style]:
+        if not self._styles:
+            dead = self.get_component_rich_style("minimap--dead")
+            live = self.get_component_rich_style("minimap--live")
+            light = (dead.bgcolor or Color.parse("#FFFFFF")).get_truecolor()
+            dark = (live.bgcolor or Color.parse("#000000")).get_truecolor()
+            self._styles = [
+                Style(bgcolor=Color.from_triplet(blend_rgb(light, dark, level / (self.LEVELS - 1))))
+                for level in range(self.LEVELS)
+            ] + [self.get_component_rich_style("minimap--view")]
+        return self._styles
+
+    @property
+    def pixels(self) -> tuple[int, int]:
+        # Pixels across and down the widget has room for
+        if not self.size:
+            return self.DEFAULT_PIXELS
+        return self.size.width, self.size.height * 2
+
+    def block_sums(self, cells: np.ndarray) -> np.ndarray:
+        # The sum of each block of cells, live cells counting one and continuous cells
+        # their value; blocks at the right and bottom edges may be partial
+        if self.canvas.continuous:
+            values, dtype = cells, np.float32
+        else:
+            values, dtype = cells != 0, np.uint32
+        height, width = cells.shape
+        rows = np.add.reduceat(values, np.arange(0, height, self.block), axis=0, dtype=dtype)
+        return np.add.reduceat(rows, np.arange(0, width, self.block), axis=1, dtype=dtype)
+
+    def update_sums(self) -> None:
+        # Bring the block sums up to date with the board. Only the tiles holding rows the
+        # canvas reports as changed are summed again, so sparse or settled boards cost
+        # next to nothing.
+        canvas = self.canvas
+        cells = canvas.matrix[: canvas.canvas_height, : canvas.canvas_width]
+        across, down = self.pixels
+        block = max(1, -(-canvas.canvas_width // across), -(-canvas.canvas_height // down))
+        changed = canvas.take_changed_rows()
+        if changed is None or block != self.block or len(changed) != len(cells):
+            self.block = block
+            self._sums = self.block_sums(cells)
+            return
+
+        # Tiles are whole blocks tall, so each is summed again without touching the others
+        tile = max(1, self.TILE_ROWS // block) * block
+        for index in np.flatnonzero(np.logical_or.reduceat(changed, np.arange(0, len(cells), tile))).tolist():
+            top, bottom = index * tile, min((index + 1) * tile, len(cells))
+            self._sums[top // block : -(-bottom // block)] = self.block_sums(cells[top:bottom])
+
+    def shades(self) -> np.ndarray:
+        # Each block's live fraction as a shade. Any life in a block shows at least the
+        # lightest shade, however large the block, so lone patterns aren't lost.
+        canvas = self.canvas
+        heights = np.diff(np.append(np.arange(0, canvas.canvas_height, self.block), canvas.canvas_height))
+        widths = np.diff(np.append(np.arange(0, canvas.canvas_width, self.block), canvas.canvas_width))
+        density = self._sums / np.outer(heights, widths).astype(np.float32)
+        return np.ceil(np.clip(density, 0, 1) * (self.LEVELS - 1)).astype(np.intp)
+
+    def view_outline(self) -> Region:
+        # The canvas's view in pixels
+        view, block = self.canvas.view, self.block
+        left, top = view.x // block, view.y // block
+        return Region(left, top, (view.right - 1) // block - left + 1, (view.bottom - 1) // block - top + 1)
+
+    def update_map(self) -> None:
+        # Redraw the map if the board or the view changed since it was last drawn
+        if not self.display:
+            return
+        canvas = self.canvas
+        key = (canvas.board_version, canvas.continuous, self.pixels)
+        # A matrix replaced as a whole stops the canvas tracking changed rows
+        if key != self._summed_key or not canvas.tracking_rows:
+            self._summed_key = key
+            self.update_sums()
+            self._shades = self.shades()
+        elif canvas.view == self._drawn_view:
+            return
+        self._drawn_view = canvas.view
+
+        # Panning only moves the outline over the same shades
+        image = self._shades.copy()
+        outline = self.view_outline()
+        left, top, right, bottom = outline.x, outline.y, outline.right - 1, outline.bottom - 1
+        view_style = self.LEVELS
+        image[top, left : right + 1] = view_style
+        image[bottom, left : right + 1] = view_style
+        image[top : bottom + 1, left] = view_style
+        image[top : bottom + 1, right] = view_style
+        # Half blocks pair rows; an odd last row is paired with nothing
+        if len(image) % 2:
+            image = np.vstack([image, np.full((1, image.shape[1]), -1, dtype=np.intp)])
+        self._image = image
+        _ = self.refresh()
+
+    def half_block_style(self, top: int, bottom: int) -> Style:
+        style = self._half_block_styles.get((top, bottom))
+        if style is None:
+            styles = self.styles_by_shade
+            below = styles[bottom] if bottom >= 0 else Style()
+            style = below + Style(color=styles[top].bgcolor)
+            self._half_block_styles[(top, bottom)] = style
+        return style
+
+    @override
+    def render_line(self, y: int) -> Strip:
+        if 2 * y >= len(self._image):
+            return Strip.blank(self.size.width)
+        top, bottom = self._image[2 * y], self._image[2 * y + 1]
+        # One code per pair of pixels; bottoms run from -1 (none) to the outline's style
+        pairs = top * (self.LEVELS + 2) + bottom + 1
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(pairs)) + 1))
+        lengths = np.diff(np.append(starts, len(pairs)))
+        return Strip(
+            [
+                Segment(self.HALF_BLOCK * length, self.half_block_style(top_shade, bottom_shade))
+                for length, top_shade, bottom_shade in zip(
+                    lengths.tolist(), top[starts].tolist(), bottom[starts].tolist()
+                )
+            ]
+        )
@@ -100,18 +100,25 @@ class Help(ModalScreen[None]):
     [b]-[/b] - Decrease the size of the canvas
     [b]F[/b] - Faster simulation
     [b]L[/b] - Slower simulation
+    [b]J[/b] - Jump ahead 1024 generations in the background
     [b]A[/b] - Save game state
+    [b]X[/b] - Export pattern as macrocell (save.mc)
     [b]O[/b] - Load game state
     [b]R[/b] - Random canvas
     [b]G[/b] - Add random glider
     [b]P[/b] - Add random pulsar
     [b]C[/b] - Clear canvas
-    [b]M[/b] - Show example message
+    [b]M[/b] - Run as fast as possible (again for the normal speed)
+    [b]V[/b] - Switch between block, half block and braille display
     [b]Q[/b] - Quit
     [b]LEFT[/b] - Decrease canvas horizontally
     [b]RIGHT[/b] - Increase canvas horizontally
     [b]DOWN[/b] - Increase canvas vertically
     [b]UP[/b] - Decrease canvas vertically
+    [b]SHIFT+ARROWS[/b] - Move the view around a canvas bigger than the terminal
+    [b]\\[ and ][/b] - Zoom out and in by powers of two
+    [b]D[/b] - Show zoomed out blocks as live if any cell is, or shaded by density
+    [b]N[/b] - Show or hide the minimap of the whole board
     [b]H[/b] - Help
     """
 
@@ -0,0 +1,75 @@
+import re
+import numpy as np
+
+# Run Length Encoded pattern files, as used by Golly and the LifeWiki
+RLE_HEADER: re.Pattern[str] = re.compile(
+    r"^x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(.+?))?\s*$", re.IGNORECASE
+)
+RLE_TOKEN: re.Pattern[str] = re.compile(r"(\d*)([bo.A-X$!])")
+
+# Well-known patterns, used by the benchmarks
+PATTERNS: dict[str, str] = {
+    "glider": "x = 3, y = 3, rule = B3/S23\nbo$2bo$3o!",
+    "r-pentomino": "x = 3, y = 3, rule = B3/S23\nb2o$2o$bo!",
+    "acorn": "x = 7, y = 3, rule = B3/S23\nbo$3bo$2o2b3o!",
+    "gosper-glider-gun": (
+        "x = 36, y = 9, rule = B3/S23\n"
+        "24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4bobo$10bo5bo7bo$11bo3bo$12b2o!"
+    ),
+}
+
+
+def read_rle(text: str) -> tuple[np.ndarray, str | None]:
+    # Returns the pattern's cells and its rule, if the header names one. Two-state
+    # patterns use b (dead) and o (live); multi-state ones use . for 0 and A-X for 1-24.
+    header: re.Match[str] | None = None
+    body: list[str] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if header is None:
+            header = RLE_HEADER.match(line)
+            if header is None:
+                raise ValueError(f"Invalid RLE header: {line}")
+            continue
+        body.append(line)
+    if header is None:
+        raise ValueError("Missing RLE header")
+
+    width, height = int(header.group(1)), int(header.group(2))
+    cells = np.zeros((height, width), dtype=np.uint8)
+    y = x = 0
+    encoded = "".join(body)
+    position = 0
+    while position < len(encoded):
+        token = RLE_TOKEN.match(encoded, position)
+        if token is None:
+            raise ValueError(f"Invalid RLE data at: {encoded[position:position + 10]}")
+        position = token.end()
+        count = int(token.group(1) or 1)
+        tag = token.group(2)
+        if tag == "!":
+            break
+        if tag == "$":
+            y, x = y + count, 0
+            continue
+        if y >= height or x + count > width:
+            raise ValueError("RLE data doesn't fit the size in its header")
+        if tag in "ABCDEFGHIJKLMNOPQRSTUVWX":
+            cells[y, x : x + count] = ord(tag) - ord("A") + 1
+        elif tag == "o":
+            cells[y, x : x + count] = 1
+        x += count
+    return cells, header.group(3)
+
+
+def place(cells: np.ndarray, width: int, height: int) -> np.ndarray:
+    # A width x height board with the cells in the middle
+    pattern_height, pattern_width = cells.shape
+    if pattern_width > width or pattern_height > height:
+        raise ValueError(f"A {pattern_width}x{pattern_height} pattern doesn't fit a {width}x{height} board")
+    board = np.zeros((height, width), dtype=cells.dtype)
+    top, left = (height - pattern_height) // 2, (width - pattern_width) // 2
+    board[top : top + pattern_height, left : left + pattern_width] = cells
+    return board
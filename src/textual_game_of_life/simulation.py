@@ -0,0 +1,218 @@
+# Runs an engine on a background thread so generations are computed off the UI's event
+# loop. NumPy releases the GIL for the heavy lifting, so input stays responsive however
+# long a generation takes. Like headless.py, nothing here may import textual.
+import math
+import threading
+import time
+from collections import deque
+import numpy as np
+from .engines import Engine
+
+
+class Snapshot:
+    # A finished generation, with any spare rows and columns of the thread's boards. The
+    # cells are read-only and never written again by the worker, so the UI can keep a
+    # reference without copying or locking.
+    def __init__(self, cells: np.ndarray, generation: int, epoch: int, changed_rows: np.ndarray) -> None:
+        cells.flags.writeable = False
+        self.cells: np.ndarray = cells
+        self.generation: int = generation
+        # Which board the generation descends from; see SimulationThread.load
+        self.epoch: int = epoch
+        # Which rows differ from the previous snapshot of the same epoch, or from the
+        # loaded board for the first one
+        self.changed_rows: np.ndarray = changed_rows
+
+
+class Mailbox:
+    # A single slot: posting replaces anything unread, so the reader only ever gets the
+    # latest snapshot and a slow reader never makes the writer wait or queue up work.
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._snapshot: Snapshot | None = None
+
+    def post(self, snapshot: Snapshot) -> None:
+        with self._lock:
+            unread = self._snapshot
+            if unread is not None and unread.epoch == snapshot.epoch:
+                # The reader skips the unread generation, so gets its changes with this one
+                snapshot.changed_rows |= unread.changed_rows
+            self._snapshot = snapshot
+
+    def take(self) -> Snapshot | None:
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+        return snapshot
+
+
+class SimulationThread:
+    # Advances its own copy of the board and posts each result to the mailbox, either
+    # `batch` generations every `interval` seconds or, with a target_rate, as many
+    # generations per interval as the rate asks for (math.inf: as many as fit). The
+    # engine belongs to the thread while it runs: nothing else may step it until stop()
+    # returns. Boards can be kept with `spare` dead rows and columns past their bottom
+    # right, as the canvas keeps its matrix, so snapshots can be adopted as they are.
+
+    # The achieved rate is measured over this many seconds
+    RATE_WINDOW: float = 1.0
+    # Longest sleep between checks for a changed target rate or a stop
+    MAX_WAIT: float = 0.25
+    # Rows compared at a time when finding the rows a batch changed
+    COMPARE_ROWS: int = 256
+
+    def __init__(
+        self,
+        engine: Engine,
+        cells: np.ndarray,
+        interval: float,
+        batch: int = 1,
+        target_rate: float | None = None,
+        spare: int = 0,
+    ) -> None:
+        self.engine: Engine = engine
+        self.interval: float = interval
+        self.batch: int = batch
+        self.target_rate: float | None = target_rate
+        self.mailbox: Mailbox = Mailbox()
+        self.generation: int = 0
+        self.epoch: int = 0
+        # Smoothed seconds per generation, measured on every batch
+        self.cost: float | None = None
+
+        # The time and generation the target rate is counted from, and that rate
+        self._anchor: tuple[float, int, float] | None = None
+        # When each recent batch was posted and the generation it reached; written by the
+        # worker and read by the UI, always under _lock
+        self._posted: deque[tuple[float, int]] = deque()
+
+        self.spare: int = spare
+        self._cells: np.ndarray = self.with_spare(cells)
+        self._lock: threading.Lock = threading.Lock()
+        # A board loaded by the UI, picked up before the next batch
+        self._loaded: np.ndarray | None = None
+        self._stopping: threading.Event = threading.Event()
+        # A band of XORed rows, see changed_rows
+        self._diff: np.ndarray = np.zeros((0, 0), dtype=np.uint8)
+        self._thread: threading.Thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def with_spare(self, cells: np.ndarray) -> np.ndarray:
+        # A copy of the board with the spare rows and columns
+        height, width = cells.shape
+        padded = np.zeros((height + self.spare, width + self.spare), dtype=cells.dtype)
+        padded[:height, :width] = cells
+        return padded
+
+    def load(self, cells: np.ndarray) -> int:
+        # Continue from an edited board. Snapshots already computed from the previous
+        # board keep the old epoch, so the reader can tell they are stale and drop them.
+        loaded = self.with_spare(cells)
+        with self._lock:
+            self._loaded = loaded
+            self.epoch += 1
+            return self.epoch
+
+    @property
+    def achieved_rate(self) -> float:
+        # Generations per second over the last RATE_WINDOW seconds
+        with self._lock:
+            if len(self._posted) < 2:
+                return 0.0
+            (first_time, first_generation), (last_time, last_generation) = self._posted[0], self._posted[-1]
+        if last_time <= first_time:
+            return 0.0
+        return (last_generation - first_generation) / (last_time - first_time)
+
+    def changed_rows(self, old: np.ndarray, new: np.ndarray) -> np.ndarray:
+        # The rows that differ between two boards, compared by XOR of their bits (float
+        # cells through an integer view of the same width) a band at a time, so finding
+        # them needs no board-sized temporary
+        bits = np.dtype(f"u{new.dtype.itemsize}")
+        old, new = old.view(bits), new.view(bits)
+        height, width = new.shape
+        if self._diff.shape != (self.COMPARE_ROWS, width) or self._diff.dtype != bits:
+            self._diff = np.empty((self.COMPARE_ROWS, width), dtype=bits)
+        changed = np.zeros(height, dtype=bool)
+        for top in range(0, height, self.COMPARE_ROWS):
+            bottom = min(top + self.COMPARE_ROWS, height)
+            diff = np.bitwise_xor(old[top:bottom], new[top:bottom], out=self._diff[: bottom - top])
+            changed[top:bottom] = diff.max(axis=1) != 0
+        return changed
+
+    def plan_batch(self, now: float) -> int:
+        # Generations to compute now. With a target rate this is however many the rate
+        # says should have been computed by now and haven't been, counted from a fixed
+        # anchor so rounding and sleep overshoot don't accumulate, but never more than
+        # the measured cost per generation fits into one interval.
+        rate = self.target_rate
+        if rate is None:
+            return self.batch
+        if self._anchor is None or self._anchor[2] != rate:
+            self._anchor = (now, self.generation, rate)
+
+        fits = max(1, int(self.interval / self.cost)) if self.cost else 1
+        if math.isinf(rate):
+            return fits
+        anchor_time, anchor_generation, _ = self._anchor
+        behind = int((now - anchor_time) * rate) + anchor_generation - self.generation
+        if behind > fits:
+            # Too slow to keep up: don't build a backlog to burst through later
+            self._anchor = (now, self.generation + fits, rate)
+            return fits
+        return max(0, behind)
+
+    def wait_time(self, start: float, now: float) -> float:
+        # Seconds to sleep before the next batch
+        next_batch = start + self.interval
+        rate = self.target_rate
+        if rate is not None and math.isinf(rate):
+            return 0.0
+        if rate is not None and self._anchor is not None:
+            # At slow rates the next generation may not be due for several intervals
+            anchor_time, anchor_generation, _ = self._anchor
+            next_batch = max(next_batch, anchor_time + (self.generation + 1 - anchor_generation) / rate)
+        return min(max(0.0, next_batch - now), self.MAX_WAIT if rate is not None else math.inf)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            start = time.perf_counter()
+            with self._lock:
+                if self._loaded is not None:
+                    self._cells, self._loaded = self._loaded, None
+                    self.engine.reset()
+                epoch = self.epoch
+
+            batch = self.plan_batch(start)
+            if batch:
+                # Each batch goes into a new array, which becomes the snapshot, so a
+                # posted snapshot is never written again
+                cells = np.empty_like(self._cells)
+                height, width = cells.shape[0] - self.spare, cells.shape[1] - self.spare
+                cells[height:, :] = 0
+                cells[:, width:] = 0
+                self.engine.advance_into(self._cells[:height, :width], cells[:height, :width], batch)
+                changed_rows = self.changed_rows(self._cells[:height], cells[:height])
+                self._cells = cells
+                self.generation += batch
+                self.mailbox.post(Snapshot(cells, self.generation, epoch, changed_rows))
+
+                now = time.perf_counter()
+                cost = (now - start) / batch
+                self.cost = cost if self.cost is None else 0.7 * self.cost + 0.3 * cost
+                with self._lock:
+                    self._posted.append((now, self.generation))
+                    while self._posted[0][0] < now - self.RATE_WINDOW:
+                        _ = self._posted.popleft()
+
+            _ = self._stopping.wait(self.wait_time(start, time.perf_counter()))
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import math
 import os
 import time
 import numpy as np
@@ -9,7 +10,10 @@ from textual.widgets import Footer
 from typing_extensions import final, override
 from . import Operation
 from .canvas import Canvas
+from .minimap import Minimap
 from .modals import About, Help
+from .patterns import read_rle
+from .rules import DEFAULT_RULE
 
 
 @final
@@ -24,7 +28,15 @@ class CellularAutomatonTui(App[None]):
         Binding("-", "decrease_canvas", "Smaller"),
         Binding("f", "increase_speed", "Faster"),
         Binding("l", "decrease_speed", "Slower"),
+        Binding("m", "max_speed", "Max"),
+        Binding("v", "cycle_display", "View"),
+        Binding("left_square_bracket", "zoom_out", "Zoom out", show=False),
+        Binding("right_square_bracket", "zoom_in", "Zoom in", show=False),
+        Binding("d", "cycle_zoom_reduce", "Density", show=False),
+        Binding("n", "toggle_minimap", "Map"),
+        Binding("j", "jump", "Jump"),
         Binding("a", "save", "Save"),
+        Binding("x", "export_macrocell", "Export"),
         Binding("o", "load", "Load"),
         Binding("r", "random", "Random"),
         Binding("g", "add_glider", "Glider"),
@@ -35,11 +47,20 @@ class CellularAutomatonTui(App[None]):
         Binding("right", "increase_canvas_horizontally", " "),
         Binding("down", "increase_canvas_vertically", " "),
         Binding("up", "decrease_canvas_vertically", " "),
+        Binding("shift+left", "pan(-1, 0)", " ", show=False),
+        Binding("shift+right", "pan(1, 0)", " ", show=False),
+        Binding("shift+up", "pan(0, -1)", " ", show=False),
+        Binding("shift+down", "pan(0, 1)", " ", show=False),
         Binding("h", "help", "Help"),
         Binding("i", "about", "About"),
     ]
+    # Actions that leave the board alone, so are allowed while a jump runs
+    JUMPING_ACTIONS: frozenset[str] = frozenset(
+        {"quit", "pan", "zoom_in", "zoom_out", "cycle_zoom_reduce", "cycle_display", "toggle_minimap"}
+    )
 
     canvas: Canvas  # pyright: ignore[reportUninitializedInstanceVariable]
+    minimap: Minimap  # pyright: ignore[reportUninitializedInstanceVariable]
 
     def __init__(
         self,
@@ -49,6 +70,12 @@ class CellularAutomatonTui(App[None]):
         brush_size: int = 1,
         load_file: str | None = None,
         random_start: bool = False,
+        engine: str | None = None,
+        rule: str = DEFAULT_RULE,
+        rate: float | None = None,
+        fps: float = 30.0,
+        display_mode: str = "blocks",
+        minimap: bool = False,
     ) -> None:
         super().__init__()
         self.initial_width = width
@@ -57,6 +84,12 @@ class CellularAutomatonTui(App[None]):
         self.initial_brush_size = brush_size
         self.load_file = load_file
         self.random_start = random_start
+        self.engine = engine
+        self.rule = rule
+        self.rate = rate
+        self.fps = fps
+        self.display_mode = display_mode
+        self.show_minimap = minimap
 
     @override
     def compose(self) -> ComposeResult:
@@ -65,8 +98,16 @@ class CellularAutomatonTui(App[None]):
             height=self.initial_height,
             speed=self.initial_speed,
             brush_size=self.initial_brush_size,
+            engine=self.engine,
+            rule=self.rule,
+            rate=self.rate,
+            fps=self.fps,
+            display_mode=self.display_mode,
         )
         yield self.canvas
+        self.minimap = Minimap(self.canvas)
+        self.minimap.display = self.show_minimap
+        yield self.minimap
         yield Footer()
 
     def on_mount(self) -> None:
@@ -77,6 +118,13 @@ class CellularAutomatonTui(App[None]):
         if self.load_file:
             self._load_from_file(self.load_file)
 
+    @override
+    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
+        # Only looking around is allowed while a jump runs, as it replaces the board when done
+        if self.canvas.jumping:
+            return action in self.JUMPING_ACTIONS
+        return True
+
     def on_canvas_message_request(self, event: Canvas.MessageRequest) -> None:
         self.display_message(event.message, event.timeout)
 
@@ -124,6 +172,15 @@ class CellularAutomatonTui(App[None]):
         self.display_message(status, 1.0)
 
     def action_increase_speed(self) -> None:
+        rate = self.canvas.target_rate
+        if rate is not None:
+            if math.isinf(rate):
+                self.display_message("Already running as fast as possible", 1.0)
+                return
+            self.canvas.target_rate = rate * 2
+            self.display_message(f"Speed increased - {rate * 2:g} generations/sec", 1.0)
+            return
+
         if self.canvas.refresh_interval <= 0.2:
             self.canvas.refresh_interval = 0.1  # Set to exact minimum
             self.display_message("Speed is at maximum (0.1s per step)", 1.0)
@@ -133,17 +190,75 @@ class CellularAutomatonTui(App[None]):
         self.display_message(f"Speed increased - {self.canvas.refresh_interval:.1f}s per step", 1.0)
 
     def action_decrease_speed(self) -> None:
+        rate = self.canvas.target_rate
+        if rate is not None:
+            if math.isinf(rate):
+                # Continue from half of what the machine managed
+                rate = max(2 * self.canvas.MIN_TARGET_RATE, float(round(self.canvas.achieved_rate)))
+            if rate / 2 < self.canvas.MIN_TARGET_RATE:
+                self.display_message(f"Speed is at minimum ({self.canvas.MIN_TARGET_RATE:g} generations/sec)", 1.0)
+                return
+            self.canvas.target_rate = rate / 2
+            self.display_message(f"Speed decreased - {rate / 2:g} generations/sec", 1.0)
+            return
+
         self.canvas.refresh_interval += 0.1
         self.display_message(f"Speed decreased - {self.canvas.refresh_interval:.1f}s per step", 1.0)
 
+    def action_max_speed(self) -> None:
+        if self.canvas.target_rate is not None and math.isinf(self.canvas.target_rate):
+            self.canvas.target_rate = None
+            self.display_message(f"Maximum speed off - {self.canvas.refresh_interval:.1f}s per step", 1.0)
+            return
+        self.canvas.target_rate = math.inf
+        self.display_message("Running as fast as possible", 1.0)
+
+    def action_pan(self, x: int, y: int) -> None:
+        self.canvas.pan_steps(x, y)
+
+    def action_cycle_display(self) -> None:
+        mode = self.canvas.cycle_display_mode()
+        self.display_message(f"Display mode: {mode}", 1.0)
+
+    def action_toggle_minimap(self) -> None:
+        self.minimap.display = not self.minimap.display
+        self.minimap.update_map()
+        self.display_message(f"Minimap {'on' if self.minimap.display else 'off'}", 1.0)
+
+    def action_zoom_out(self) -> None:
+        zoom = self.canvas.zoom_out()
+        self.display_message(f"Zoom 1:{zoom}", 1.0)
+
+    def action_zoom_in(self) -> None:
+        zoom = self.canvas.zoom_in()
+        self.display_message(f"Zoom 1:{zoom}", 1.0)
+
+    def action_cycle_zoom_reduce(self) -> None:
+        reduce = self.canvas.cycle_zoom_reduce()
+        shown = "shaded by density" if reduce == "density" else "live if any cell is"
+        self.display_message(f"Zoomed out blocks {shown}", 1.0)
+
     def action_clear(self) -> None:
         self.canvas.clear()
         self.display_message("Canvas cleared", 1.0)
 
     def action_step(self) -> None:
+        if self.canvas.simulation is not None:
+            self.display_message("Pause the simulation to step", 1.0)
+            return
         self.canvas.step()
         self.display_message("Advanced one generation", 1.0)
 
+    def action_jump(self) -> None:
+        try:
+            generations = self.canvas.jump_in_background()
+        except ValueError as error:
+            # Hashlife only runs two-state rules without B0
+            self.display_message(str(error), 2.0)
+            return
+        # The canvas reports when the jump is done
+        self.display_message(f"Jumping ahead {generations} generations...", 60.0)
+
     def action_random(self) -> None:
         self.canvas.random()
         self.display_message("Random pattern generated", 1.0)
@@ -222,11 +337,22 @@ class CellularAutomatonTui(App[None]):
             "matrix": self.canvas.matrix.tolist(),  # Convert NumPy array to list for JSON serialization
             "canvas_width": self.canvas.canvas_width,
             "canvas_height": self.canvas.canvas_height,
+            "rule": str(self.canvas.rule),
         }
         with open("./save.textual", "w") as save_file:
             json.dump(data, save_file)
         self.display_message("Game state saved to save.textual", 1.0)
 
+    def action_export_macrocell(self) -> None:
+        try:
+            macrocell = self.canvas.to_macrocell()
+        except ValueError as error:
+            self.display_message(str(error), 2.0)
+            return
+        with open("./save.mc", "w") as save_file:
+            _ = save_file.write(macrocell)
+        self.display_message("Pattern exported to save.mc", 1.0)
+
     def action_load(self) -> None:
         self._load_from_file("./save.textual")
 
@@ -235,15 +361,46 @@ class CellularAutomatonTui(App[None]):
             self.display_message(f"Save file not found: {filepath}", 1.0)
             return
 
+        if filepath.endswith(".mc"):
+            with open(filepath) as load_file:
+                text = load_file.read()
+            try:
+                self.canvas.load_macrocell(text)
+            except ValueError as error:
+                self.display_message(str(error), 2.0)
+                return
+            self.display_message(f"Pattern loaded from {filepath}", 1.0)
+            return
+
+        if filepath.endswith(".rle"):
+            with open(filepath) as load_file:
+                cells, rule = read_rle(load_file.read())
+            try:
+                if rule:
+                    self.canvas.set_rule(rule)
+                self.canvas.load_pattern(cells)
+            except ValueError as error:
+                self.display_message(str(error), 2.0)
+                return
+            self.display_message(f"Pattern loaded from {filepath}", 1.0)
+            return
+
         with open(filepath) as load_file:
             data = json.load(load_file)  # pyright: ignore[reportAny]
             # Convert the loaded matrix (which is a list of lists) to a NumPy array
             matrix_data = data.get("matrix", [])  # pyright: ignore[reportAny]
+            if "rule" in data:
+                try:
+                    self.canvas.set_rule(data["rule"])  # pyright: ignore[reportAny]
+                except ValueError as error:
+                    self.display_message(str(error), 2.0)
+                    return
+            self.canvas.reset_engine()
             if matrix_data:
-                self.canvas.matrix = np.array(matrix_data, dtype=np.int8)
+                self.canvas.matrix = np.array(matrix_data, dtype=self.canvas.cell_dtype)
             else:
                 self.canvas.matrix = np.zeros(
-                    (self.canvas.canvas_height + 1, self.canvas.canvas_width + 1), dtype=np.int8
+                    (self.canvas.canvas_height + 1, self.canvas.canvas_width + 1), dtype=self.canvas.cell_dtype
                 )
 
             self.canvas.canvas_width = data.get("canvas_width", self.canvas.canvas_width)  # pyright: ignore[reportAny]
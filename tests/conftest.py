@@ -1,9 +1,16 @@
 """Test configuration and fixtures for pytest."""
 import pytest
 from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.engines import Engine
 from src.textual_game_of_life.tui import CellularAutomatonTui
 
 
+@pytest.fixture(autouse=True)
+def check_edits(monkeypatch):
+    """Have engines check that every edit to their last result was reported."""
+    monkeypatch.setattr(Engine, "CHECK_EDITS", True)
+
+
 @pytest.fixture
 def canvas():
     """Return a Canvas widget instance for testing."""
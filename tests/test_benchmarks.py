@@ -0,0 +1,114 @@
+"""Tests for the engine and TUI benchmark suites."""
+import asyncio
+import json
+import numpy as np
+import pytest
+from benchmarks import engines as benchmark
+from benchmarks import tui as tui_benchmark
+
+
+@pytest.fixture(autouse=True)
+def short_runs(monkeypatch):
+    """Keep timed runs short; only the bookkeeping is under test."""
+    monkeypatch.setattr(benchmark, "MIN_TIME", 0.001)
+
+
+def test_make_board():
+    """Test that density boards are random, pattern boards skip sizes they don't fit and the settled board barely changes."""
+    board = benchmark.make_board("density-0.35", 100)
+    assert board is not None
+    assert board.shape == (100, 100)
+    assert 0.3 < board.mean() < 0.4
+
+    glider = benchmark.make_board("pattern-glider", 20)
+    assert glider is not None
+    assert glider.sum() == 5
+    assert benchmark.make_board("pattern-gosper-glider-gun", 20) is None
+
+    settled = benchmark.make_board("settled-blocks", 100)
+    assert settled is not None
+    stepped = benchmark.ENGINES["numpy"]().next_generation(settled.astype(np.int8))
+    # Only the blinker in the middle changes
+    assert (stepped != settled).sum() == 4
+
+
+def test_run_records_every_case():
+    """Test that every engine, size and board that fits gets a timing."""
+    results = benchmark.run(["numpy", "bitpacked"], (20, 40), ["density-0.35", "pattern-gosper-glider-gun"])
+    assert sorted(results) == [
+        "bitpacked/20x20/density-0.35",
+        "bitpacked/40x40/density-0.35",
+        "bitpacked/40x40/pattern-gosper-glider-gun",
+        "numpy/20x20/density-0.35",
+        "numpy/40x40/density-0.35",
+        "numpy/40x40/pattern-gosper-glider-gun",
+    ]
+    result = results["numpy/40x40/density-0.35"]
+    assert result["seconds_per_generation"] > 0
+    assert result["cells_per_second"] == 1600 / result["seconds_per_generation"]
+
+
+def test_compare_flags_slowdowns():
+    """Test that only cases slower than the baseline by more than the threshold are regressions."""
+    baseline = {
+        "numpy/20x20/density-0.35": {"seconds_per_generation": 1.0},
+        "sparse/20x20/density-0.35": {"seconds_per_generation": 1.0},
+    }
+    results = {
+        "numpy/20x20/density-0.35": {"seconds_per_generation": 1.2},
+        "sparse/20x20/density-0.35": {"seconds_per_generation": 1.5},
+        "tiled/20x20/density-0.35": {"seconds_per_generation": 9.0},
+    }
+    assert benchmark.compare(results, baseline, threshold=0.25) == ["sparse/20x20/density-0.35"]
+
+
+def test_baseline_update_and_compare(tmp_path):
+    """Test that a stored baseline is used for comparison and merged on update."""
+    baseline = tmp_path / "baseline.json"
+    arguments = ["--engines", "numpy", "--sizes", "20", "--baseline", str(baseline)]
+
+    assert benchmark.main([*arguments, "--update-baseline"]) == 0
+    stored = json.loads(baseline.read_text())
+    assert "numpy/20x20/density-0.05" in stored["results"]
+    assert "numpy" in stored["environment"]
+
+    # Pretend the baseline was much slower, so this run can't regress against it
+    for result in stored["results"].values():
+        result["seconds_per_generation"] *= 100
+    _ = baseline.write_text(json.dumps(stored))
+    assert benchmark.main(arguments) == 0
+
+    for result in stored["results"].values():
+        result["seconds_per_generation"] /= 10000
+    _ = baseline.write_text(json.dumps(stored))
+    assert benchmark.main(arguments) == 1
+
+
+def test_checked_in_baseline_covers_every_engine():
+    """Test that the checked-in baseline has results for every engine."""
+    stored = json.loads(benchmark.BASELINE.read_text())
+    recorded = {result["engine"] for result in stored["results"].values()}
+    assert recorded == set(benchmark.ENGINES)
+
+
+def test_tui_benchmark_records_frames():
+    """Test that running the TUI headless records canvas frames while the simulation runs."""
+    run = asyncio.run(tui_benchmark.measure(0, 0.5, width=20, height=20))
+    assert run["generations"] > 0
+    assert run["frames"]
+    for frame in run["frames"]:
+        assert set(frame) == set(tui_benchmark.METRICS)
+        assert frame["render_lines"] > 0
+        assert frame["bytes"] > 0
+
+    summary = tui_benchmark.summarise([run])
+    assert summary["frames"] == len(run["frames"])
+    assert summary["refresh_interval"] == 0.1
+    assert set(summary["latency"]) == {"p50", "p95", "p99"}
+    assert "frames/sec" in tui_benchmark.format_summary(summary)
+
+
+def test_percentiles():
+    """Test that frame metrics are summarised as p50/p95/p99."""
+    assert tui_benchmark.percentiles(list(range(101))) == {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+    assert tui_benchmark.percentiles([]) == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
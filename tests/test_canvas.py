@@ -85,13 +85,18 @@ def test_alter_canvas_size_constraints(canvas):
     assert canvas.canvas_width == 10
     assert canvas.canvas_height == 10
 
+    # The board may be much bigger than the terminal
+    canvas.alter_canvas_size(Operation.INCREASE, amount=1000)
+    assert canvas.canvas_width == 1010
+    assert canvas.canvas_height == 1010
+
     # Test maximum size constraint
+    canvas.MAX_CANVAS_WIDTH = canvas.MAX_CANVAS_HEIGHT = 1000
     canvas.alter_canvas_size(Operation.INCREASE, amount=1000)
 
     # Size should be limited to maximum
-    # Canvas MAX_CANVAS_WIDTH is 100
-    assert canvas.canvas_width == 100
-    assert canvas.canvas_height == 100
+    assert canvas.canvas_width == 1000
+    assert canvas.canvas_height == 1000
 
 
 def test_brush_size_constraints(canvas):
@@ -2,6 +2,7 @@
 from unittest.mock import MagicMock, PropertyMock, patch
 import numpy as np
 import pytest
+from textual.geometry import Offset, Region
 from src.textual_game_of_life import Operation
 from src.textual_game_of_life.canvas import Canvas
 
@@ -67,16 +68,12 @@ def test_update_size_constraints():
 
     # Check that constraints were calculated properly
     # Each canvas cell takes ROW_HEIGHT (2) characters horizontally and ROW_HEIGHT/2 (1) vertically
-    # With margins of 2 in each dimension
-    expected_width = (100 // 2) - 2  # Terminal width / cell width - margins
-    expected_height = (50 // 1) - 2  # Terminal height / cell height - margins
+    assert canvas.max_width_by_term == 100 // 2  # Terminal width / cell width
+    assert canvas.max_height_by_term == 50 // 1  # Terminal height / cell height
 
-    # Values should be capped at MAX values
-    expected_width = min(expected_width, canvas.MAX_CANVAS_WIDTH)
-    expected_height = min(expected_height, canvas.MAX_CANVAS_HEIGHT)
-
-    assert canvas.effective_max_width == expected_width
-    assert canvas.effective_max_height == expected_height
+    # The terminal only limits the view; the board is limited by the MAX values
+    assert canvas.effective_max_width == canvas.MAX_CANVAS_WIDTH
+    assert canvas.effective_max_height == canvas.MAX_CANVAS_HEIGHT
 
 
 def test_toggle_with_runtime_error():
@@ -108,6 +105,8 @@ def test_toggle_with_runtime_error():
 def test_on_resize_handler():
     """Test resize event handler."""
     canvas = Canvas(width=90, height=90)
+    canvas.request_message = MagicMock()
+    canvas.view_origin = Offset(80, 80)
 
     # Mock size property to return a small terminal size
     size_mock = MagicMock()
@@ -116,18 +115,32 @@ def test_on_resize_handler():
 
     # Use patch.object to mock the property
     with patch.object(Canvas, "size", PropertyMock(return_value=size_mock)):
-        # Mock the request_message method
-        canvas.request_message = MagicMock()
+        # Call the resize handler with a mock resize event
+        canvas.on_resize(MagicMock())
 
-    # Create a mock resize event
-    event_mock = MagicMock()
+        # The board keeps its size, and the view shows the part of it that fits
+        assert canvas.canvas_width == 90
+        assert canvas.canvas_height == 90
+        assert canvas.view == Region(70, 60, 20, 30)
+    assert not canvas.request_message.called
 
-    # Call the resize handler
-    canvas.on_resize(event_mock)
-
-    # Canvas should be resized to fit the terminal
-    assert canvas.canvas_width < 90
-    assert canvas.canvas_height < 90
+    # Boards above the maximum are shrunk to it
+    canvas.canvas_width = canvas.MAX_CANVAS_WIDTH + 10
+    canvas.on_resize(MagicMock())
+    assert canvas.canvas_width == canvas.MAX_CANVAS_WIDTH
 
     # Message should have been displayed
     assert canvas.request_message.called
+
+
+def test_decrease_stops_at_minimum():
+    """Test that shrinking the board by more than its size stops at the minimum."""
+    canvas = Canvas(width=90, height=90)
+    canvas.request_message = MagicMock()
+
+    # Try to reduce below minimum (10)
+    canvas.alter_canvas_size(Operation.DECREASE, amount=100)
+
+    # Size should be limited to minimum
+    assert canvas.canvas_width == 10
+    assert canvas.canvas_height == 10
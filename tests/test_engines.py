@@ -0,0 +1,284 @@
+"""Tests for the interchangeable simulation engines."""
+import tracemalloc
+from unittest.mock import patch
+import numpy as np
+import pytest
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.engines import (
+    ENGINES,
+    BitPackedEngine,
+    NumPyEngine,
+    SparseEngine,
+    TiledEngine,
+    create_engine,
+)
+
+
+@pytest.mark.parametrize("width", [10, 63, 64, 65, 130])
+def test_bitpacked_matches_numpy(width):
+    """Test that the bit-packed engine produces the same generations as the NumPy engine."""
+    rng = np.random.default_rng(width)
+    grid = rng.integers(0, 2, (37, width), dtype=np.int8)
+
+    expected = grid
+    for _ in range(10):
+        expected = NumPyEngine().next_generation(expected)
+
+    assert np.array_equal(BitPackedEngine().advance(grid, 10), expected)
+
+
+def test_bitpacked_wraps_at_edges():
+    """Test that a glider crossing the corner of the torus is handled by the bit-packed engine."""
+    grid = np.zeros((20, 70), dtype=np.int8)
+    # Glider heading south-east, sitting on the bottom-right corner
+    for y, x in [(18, 69), (19, 0), (0, 68), (0, 69), (0, 0)]:
+        grid[y, x] = 1
+
+    expected = NumPyEngine().advance(grid, 8)
+    assert np.array_equal(BitPackedEngine().advance(grid, 8), expected)
+    assert expected.sum() == 5
+
+
+def test_pack_round_trip():
+    """Test that packing and unpacking a board is lossless."""
+    grid = np.random.default_rng(1).integers(0, 2, (5, 100), dtype=np.int8)
+    words = BitPackedEngine.pack(grid)
+    assert words.dtype == np.uint64
+    assert words.shape == (5, 2)
+    assert np.array_equal(BitPackedEngine.unpack(words, 100), grid)
+
+
+def test_bitpacked_keeps_words_between_steps():
+    """Test that the bit-packed engine steps on from its packed words, repacking only marked edits."""
+    engine = BitPackedEngine()
+    grid = np.random.default_rng(3).integers(0, 2, (40, 100), dtype=np.int8)
+    expected = NumPyEngine().advance(grid, 3)
+
+    result = engine.advance(grid, 1)
+    with patch.object(BitPackedEngine, "pack", wraps=BitPackedEngine.pack) as pack:
+        result = engine.advance(result, 1)
+        result = engine.advance(result, 1)
+    pack.assert_not_called()
+    assert np.array_equal(result, expected)
+
+    result[10, 20:23] = 1
+    engine.mark_edited(20, 10, 3, 1)
+    expected = expected.copy()
+    expected[10, 20:23] = 1
+    assert np.array_equal(engine.advance(result, 1), NumPyEngine().next_generation(expected))
+
+
+@pytest.mark.parametrize("engine_class", [BitPackedEngine, TiledEngine])
+def test_unreported_edits_are_caught(engine_class):
+    """Test that with CHECK_EDITS an edit to the last result that wasn't marked is an error, not stale state."""
+    engine = engine_class()
+    result = engine.advance(np.zeros((20, 70), dtype=np.int8), 1)
+    result[3, 4:7] = 1
+    engine.mark_edited(4, 3, 3, 1)
+    result = engine.advance(result, 1)
+
+    result[12, 40] = 1
+    with pytest.raises(RuntimeError, match=r"\(40, 12\)"):
+        _ = engine.advance(result, 1)
+
+
+def test_create_engine():
+    """Test that engines are created by name and unknown names are rejected."""
+    for name, engine_class in ENGINES.items():
+        assert isinstance(create_engine(name), engine_class)
+
+    with pytest.raises(ValueError):
+        create_engine("missing")
+
+
+def test_canvas_uses_selected_engine():
+    """Test that the canvas delegates generation computing to the selected engine."""
+    canvas = Canvas(width=10, height=10, engine="bitpacked")
+    assert isinstance(canvas.engine, BitPackedEngine)
+
+    # Horizontal blinker becomes vertical
+    canvas.toggle_cell(4, 5)
+    canvas.toggle_cell(5, 5)
+    canvas.toggle_cell(6, 5)
+    new_matrix = canvas.get_next_generation()
+
+    assert new_matrix.shape == (11, 11)
+    assert new_matrix[4][5] == 1
+    assert new_matrix[5][5] == 1
+    assert new_matrix[6][5] == 1
+    assert new_matrix.sum() == 3
+
+
+def test_sparse_matches_numpy_away_from_edges():
+    """Test that the sparse engine agrees with the NumPy engine while nothing reaches the edges."""
+    grid = np.zeros((60, 60), dtype=np.int8)
+    grid[22:38, 22:38] = np.random.default_rng(2).integers(0, 2, (16, 16), dtype=np.int8)
+
+    expected = NumPyEngine().advance(grid, 12)
+    assert np.array_equal(SparseEngine().advance(grid, 12), expected)
+
+
+def test_sparse_plane_has_no_edges():
+    """Test that cells leaving the viewport keep evolving instead of wrapping."""
+    engine = SparseEngine()
+    grid = np.zeros((10, 10), dtype=np.int8)
+    # Glider heading south-east
+    for y, x in [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]:
+        grid[y, x] = 1
+
+    # After 40 generations the glider has moved 10 cells, off the bottom-right of the viewport
+    result = engine.advance(grid, 40)
+    assert result.sum() == 0
+    assert engine.population == 5
+    assert engine.window(10, 10, 3, 3).tolist() == [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+    engine.reset()
+    assert engine.population == 0
+
+
+def test_sparse_key_round_trip():
+    """Test that packed keys keep negative and large coordinates."""
+    ys = np.array([-5, 0, 1_000_000])
+    xs = np.array([7, -1_000_000, 3])
+    decoded_ys, decoded_xs = SparseEngine.decode(SparseEngine.encode(ys, xs))
+    assert decoded_ys.tolist() == ys.tolist()
+    assert decoded_xs.tolist() == xs.tolist()
+
+
+def test_canvas_clear_resets_sparse_world():
+    """Test that clearing the canvas also removes cells outside the viewport."""
+    canvas = Canvas(width=10, height=10, engine="sparse")
+    canvas.engine.load(np.ones((2, 2), dtype=np.int8), x=50, y=50)
+    assert canvas.engine.population == 4
+
+    canvas.clear()
+    assert canvas.engine.population == 0
+
+
+@pytest.mark.parametrize("shape", [(40, 40), (37, 53), (5, 70)])
+def test_tiled_matches_numpy(shape):
+    """Test that the tiled engine matches the NumPy engine, including partial edge tiles."""
+    grid = np.random.default_rng(shape[0]).integers(0, 2, shape, dtype=np.int8)
+    engine = TiledEngine(tile_size=8)
+
+    expected = grid
+    result = grid
+    for _ in range(15):
+        expected = NumPyEngine().next_generation(expected)
+        result = engine.next_generation(result)
+        assert np.array_equal(result, expected)
+
+
+def test_tiled_skips_settled_tiles():
+    """Test that once a board settles no tiles are marked as changed."""
+    grid = np.zeros((64, 64), dtype=np.int8)
+    grid[10:12, 10:12] = 1  # Block still life
+    engine = TiledEngine(tile_size=16)
+
+    _ = engine.advance(grid, 2)
+    assert engine.changed_tiles is not None
+    assert not engine.changed_tiles.any()
+
+
+@pytest.mark.parametrize("shape, tiles", [((64, 64), (8, 8)), ((37, 53), (5, 7)), ((5, 70), (1, 9))])
+def test_tiled_tile_shape(shape, tiles):
+    """Test that the tile grid counts partial tiles at the edges."""
+    assert TiledEngine(tile_size=8).tile_shape(*shape) == tiles
+
+
+def test_tiled_picks_up_edits():
+    """Test that cells edited between calls are recomputed."""
+    engine = TiledEngine(tile_size=8)
+    grid = engine.advance(np.zeros((32, 32), dtype=np.int8), 1)
+
+    # Blinker drawn into a settled (empty) board
+    grid[20, 19:22] = 1
+    engine.mark_edited(19, 20, 3, 1)
+    result = engine.next_generation(grid)
+    assert result[19:22, 20].tolist() == [1, 1, 1]
+    assert result.sum() == 3
+
+
+def test_tiled_double_buffered_writes_changed_tiles():
+    """Test that stepping between two buffers gives the NumPy engine's generations, edits included."""
+    rng = np.random.default_rng(7)
+    grid = np.zeros((64, 64), dtype=np.int8)
+    grid[4:20, 4:20] = rng.integers(0, 2, (16, 16), dtype=np.int8)
+    front, back = grid.copy(), np.zeros_like(grid)
+    engine = TiledEngine(tile_size=8)
+
+    expected = grid
+    for generation in range(12):
+        if generation == 6:
+            front[40:43, 50] = 1
+            engine.mark_edited(50, 40, 1, 3)
+            expected = front.copy()
+        engine.advance_into(front, back, 1)
+        front, back = back, front
+        expected = NumPyEngine().next_generation(expected)
+        assert np.array_equal(front, expected)
+
+    # Settled tiles aren't written at all
+    with patch.object(engine, "copy_tiles", wraps=engine.copy_tiles) as copy_tiles:
+        engine.advance_into(front, front, 1)
+    assert copy_tiles.call_args.args[2].sum() < copy_tiles.call_args.args[2].size / 4
+
+
+def test_numpy_engine_steps_without_allocating():
+    """Test that steady-state stepping of the NumPy engine allocates no arrays."""
+    engine = NumPyEngine()
+    grid = np.random.default_rng(4).integers(0, 2, (256, 256), dtype=np.int8)
+    out = np.zeros_like(grid)
+    # Warm up: the first calls allocate the buffers for this board size
+    engine.advance_into(grid, out, 5)
+
+    tracemalloc.start()
+    try:
+        engine.advance_into(out, out, 1)
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        engine.advance_into(out, out, 50)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A single temporary the size of the board would be 64KiB
+    assert after - before < 1024
+    assert peak - before < 1024
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.uint8, np.int32, np.int64, bool])
+def test_numpy_engine_accepts_any_integer_grid(dtype):
+    """Test that the NumPy engine steps integer and bool grids of any width, returning the grid's type."""
+    grid = np.random.default_rng(8).integers(0, 2, (21, 34), dtype=np.int8)
+    expected = NumPyEngine().advance(grid, 3)
+
+    result = NumPyEngine().advance(grid.astype(dtype), 3)
+    assert result.dtype == np.dtype(dtype)
+    assert np.array_equal(result.astype(np.int8), expected)
+
+
+def test_numpy_engine_in_place_matches_copying():
+    """Test that stepping a grid into itself gives the same result as into a new array."""
+    grid = np.random.default_rng(6).integers(0, 2, (30, 45), dtype=np.int8)
+    expected = NumPyEngine().advance(grid, 5)
+
+    in_place = grid.copy()
+    NumPyEngine().advance_into(in_place, in_place, 5)
+    assert np.array_equal(in_place, expected)
+
+
+def test_canvas_step_swaps_buffers(canvas):
+    """Test that stepping swaps the front and back buffers instead of copying."""
+    canvas.toggle_cell(4, 5)
+    canvas.toggle_cell(5, 5)
+    canvas.toggle_cell(6, 5)
+    front, back = canvas.matrix, canvas.back_matrix
+
+    canvas.step()
+
+    assert canvas.matrix is back
+    assert canvas.back_matrix is front
+    assert canvas.matrix[4][5] == 1
+    assert canvas.matrix[6][5] == 1
+    assert canvas.matrix.sum() == 3
@@ -0,0 +1,138 @@
+"""Tests for multi-state Generations rules."""
+from unittest.mock import PropertyMock, patch
+import numpy as np
+import pytest
+from rich.style import Style
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.engines import GenerationsEngine, NumPyEngine, create_engine, engine_for
+from src.textual_game_of_life.hashlife import HashlifeEngine
+from src.textual_game_of_life.rules import GenerationsRule, Rule, parse_rule
+
+
+def reference_generation(grid: np.ndarray, rule: GenerationsRule) -> np.ndarray:
+    # Cell-by-cell Generations step on a torus
+    height, width = grid.shape
+    result = np.zeros_like(grid)
+    for y in range(height):
+        for x in range(width):
+            count = sum(
+                grid[(y + dy) % height, (x + dx) % width] == 1 for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx
+            )
+            state = grid[y, x]
+            if state == 0:
+                result[y, x] = 1 if count in rule.birth else 0
+            elif state == 1:
+                result[y, x] = 1 if count in rule.survival else 2 % rule.states
+            else:
+                result[y, x] = (state + 1) % rule.states
+    return result
+
+
+def test_parse_generations_notations():
+    """Test that B/S/C, S/B/C and named Generations rules parse to the same rule."""
+    brians_brain = GenerationsRule({2}, set(), 3)
+    assert GenerationsRule.parse("B2/S/C3") == brians_brain
+    assert GenerationsRule.parse("b2/s/g3") == brians_brain
+    assert GenerationsRule.parse("/2/3") == brians_brain
+    assert GenerationsRule.parse("BriansBrain") == brians_brain
+    assert str(GenerationsRule.parse("345/2/4")) == "B2/S345/C4"
+
+
+@pytest.mark.parametrize("text", ["B2/S", "B2/S/C", "B2/S/C1", "B2/S/C300", "B2/S/C3/C4", "B2/C3/C4"])
+def test_invalid_generations_rules(text):
+    """Test that malformed Generations rules are rejected."""
+    with pytest.raises(ValueError):
+        GenerationsRule.parse(text)
+
+
+def test_parse_rule_picks_generations():
+    """Test that three-part rules parse to GenerationsRule, or to Rule with two states."""
+    assert parse_rule("starwars") == GenerationsRule({2}, {3, 4, 5}, 4)
+    assert parse_rule("B3/S23/C2") == Rule({3}, {2, 3})
+
+
+def test_generations_table():
+    """Test that the table covers every state and makes dying cells decay back to 0."""
+    table = GenerationsRule.parse("B2/S345/C4").table.reshape(4, 9)
+    assert table[0].tolist() == [0, 0, 1, 0, 0, 0, 0, 0, 0]
+    assert table[1].tolist() == [2, 2, 2, 1, 1, 1, 2, 2, 2]
+    assert table[2].tolist() == [3] * 9
+    assert table[3].tolist() == [0] * 9
+
+
+@pytest.mark.parametrize("rule_text", ["briansbrain", "starwars", "B3/S23/C8"])
+def test_generations_engine_matches_reference(rule_text):
+    """Test that the vectorized Generations engine matches a cell-by-cell reference."""
+    rule = GenerationsRule.parse(rule_text)
+    grid = np.random.default_rng(rule.states).integers(0, rule.states, (19, 27), dtype=np.uint8)
+
+    expected = grid
+    for _ in range(6):
+        expected = reference_generation(expected, rule)
+
+    result = GenerationsEngine(rule).advance(grid, 6)
+    assert result.dtype == np.uint8
+    assert np.array_equal(result, expected)
+
+
+def test_generations_engine_runs_two_state_rules():
+    """Test that the Generations engine agrees with the NumPy engine on life-like rules."""
+    rule = Rule.parse("highlife")
+    grid = np.random.default_rng(3).integers(0, 2, (25, 32), dtype=np.uint8)
+    assert np.array_equal(GenerationsEngine(rule).advance(grid, 7), NumPyEngine(rule).advance(grid, 7))
+
+
+def test_only_generations_engine_runs_generations_rules():
+    """Test that two-state engines and Hashlife refuse Generations rules."""
+    rule = parse_rule("briansbrain")
+    assert engine_for(rule) == "generations"
+    with pytest.raises(ValueError):
+        create_engine("numpy", rule)
+    with pytest.raises(ValueError):
+        HashlifeEngine(rule)
+
+
+def test_canvas_runs_generations_rule():
+    """Test that Brian's Brain on the canvas turns firing cells into dying ones."""
+    canvas = Canvas(width=10, height=10, rule="briansbrain")
+    assert canvas.matrix.dtype == np.uint8
+    canvas.toggle_cell(4, 4)
+    canvas.toggle_cell(5, 4)
+
+    canvas.step()
+    assert canvas.matrix[4, 4] == 2
+    assert canvas.matrix[4, 5] == 2
+    assert (canvas.matrix == 1).sum() == 4
+
+    # Clicking a dying cell clears it
+    canvas.toggle_cell(4, 4)
+    assert canvas.matrix[4, 4] == 0
+
+
+def test_set_rule_clears_missing_states(canvas):
+    """Test that switching to a rule with fewer states clears cells in the removed states."""
+    canvas.set_rule("starwars")
+    canvas.matrix[1, 1] = 3
+    canvas.matrix[2, 2] = 1
+    canvas.set_rule("briansbrain")
+    assert canvas.matrix[1, 1] == 0
+    assert canvas.matrix[2, 2] == 1
+
+
+def test_state_palette():
+    """Test that each state renders with its own precomputed style, fading dying cells towards white."""
+    white, black = Style(bgcolor="#ffffff"), Style(bgcolor="#000000")
+    with (
+        patch.object(Canvas, "white", new_callable=PropertyMock, return_value=white),
+        patch.object(Canvas, "black", new_callable=PropertyMock, return_value=black),
+        patch.object(Canvas, "cursor", new_callable=PropertyMock, return_value=Style(bgcolor="red")),
+    ):
+        canvas = Canvas(width=5, height=5, rule="starwars")
+        styles = canvas.state_styles
+        assert styles[:2] == [white, black]
+        assert [str(style.bgcolor.name) for style in styles[2:]] == ["#555555", "#aaaaaa"]
+        assert canvas.state_styles is styles
+
+        canvas.matrix[2, :4] = [0, 1, 2, 3]
+        segments = list(canvas.render_line(2))
+        assert [segment.style for segment in segments[:4]] == styles
@@ -0,0 +1,215 @@
+"""Tests for the Hashlife engine and macrocell import/export."""
+import asyncio
+import tracemalloc
+import numpy as np
+import pytest
+from src.textual_game_of_life.engines import NumPyEngine
+from src.textual_game_of_life.hashlife import HashlifeEngine
+from src.textual_game_of_life.rules import parse_rule
+from src.textual_game_of_life.tui import CellularAutomatonTui
+
+GLIDER_MACROCELL = """[M2] (golly 2.0)
+#R B3/S23
+.*$..*$***$
+4 0 0 0 1
+"""
+
+
+def make_soup(size: int = 16, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 2, (size, size), dtype=np.int8)
+
+
+def run_numpy(cells: np.ndarray, generations: int, margin: int) -> np.ndarray:
+    # Embed the cells far enough from the torus edges that wrapping can't happen
+    height, width = cells.shape
+    board = np.zeros((height + 2 * margin, width + 2 * margin), dtype=np.int8)
+    board[margin : margin + height, margin : margin + width] = cells
+    return NumPyEngine().advance(board, generations)
+
+
+@pytest.mark.parametrize("exponent", [0, 1, 3, 5])
+def test_jump_matches_numpy(exponent):
+    """Test that jumping 2**k generations matches stepping one generation at a time."""
+    soup = make_soup()
+    margin = 2 * (1 << exponent) + 8
+    expected = run_numpy(soup, 1 << exponent, margin)
+
+    hashlife = HashlifeEngine()
+    hashlife.load_array(soup, 0, 0)
+    hashlife.jump(exponent)
+
+    result = hashlife.window(-margin, -margin, 16 + 2 * margin, 16 + 2 * margin)
+    assert np.array_equal(result, expected)
+    assert hashlife.generation == 1 << exponent
+    assert hashlife.population == expected.sum()
+
+
+def test_advance_arbitrary_generations():
+    """Test that advance combines jumps to reach any generation count."""
+    soup = make_soup(seed=3)
+    expected = run_numpy(soup, 13, 40)
+
+    hashlife = HashlifeEngine()
+    hashlife.load_array(soup, 0, 0)
+    hashlife.advance(13)
+
+    assert hashlife.generation == 13
+    assert np.array_equal(hashlife.window(-40, -40, 96, 96), expected)
+
+
+def test_glider_travels_far():
+    """Test that a glider jumped 2**20 generations ends up 2**18 cells away."""
+    hashlife = HashlifeEngine()
+    _ = hashlife.read_macrocell(GLIDER_MACROCELL)
+    original = hashlife.window(0, 0, 3, 3)
+
+    hashlife.jump(20)
+
+    offset = 1 << 18
+    assert hashlife.population == 5
+    assert np.array_equal(hashlife.window(offset, offset, 3, 3), original)
+
+
+def test_read_macrocell():
+    """Test that a macrocell file is placed relative to the world origin and its rule returned."""
+    hashlife = HashlifeEngine()
+    assert hashlife.read_macrocell(GLIDER_MACROCELL) == "B3/S23"
+
+    assert hashlife.population == 5
+    assert hashlife.window(0, 0, 3, 3).tolist() == [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+
+def test_macrocell_round_trip():
+    """Test that writing and re-reading a macrocell file preserves the pattern."""
+    soup = make_soup(size=40, seed=7)
+    hashlife = HashlifeEngine()
+    hashlife.load_array(soup, -20, -20)
+    text = hashlife.write_macrocell()
+
+    assert text.startswith("[M2]")
+
+    reloaded = HashlifeEngine()
+    _ = reloaded.read_macrocell(text)
+    assert np.array_equal(reloaded.window(-20, -20, 40, 40), soup)
+
+
+def test_invalid_macrocell():
+    """Test that malformed macrocell lines are rejected."""
+    with pytest.raises(ValueError):
+        _ = HashlifeEngine().read_macrocell("[M2]\n4 1 2\n")
+
+
+def test_bounded_cache_stays_correct():
+    """Test that a tiny node cache evicts entries without changing results."""
+    soup = make_soup(seed=5)
+    expected = run_numpy(soup, 32, 72)
+
+    hashlife = HashlifeEngine(max_nodes=64, max_results=16)
+    hashlife.load_array(soup, 0, 0)
+    hashlife.jump(5)
+
+    assert np.array_equal(hashlife.window(-72, -72, 160, 160), expected)
+    assert hashlife.join.cache_info().currsize <= 64
+    assert hashlife.successor.cache_info().currsize <= 16
+
+
+def test_load_array_builds_from_live_cells():
+    """Test that loading a sparse board far from the origin costs memory for its live cells, not its extent."""
+    board = np.zeros((3000, 3000), dtype=np.uint8)
+    board[:3, :3] = make_soup(3, seed=1)
+    board[-16:, -16:] = make_soup(seed=2)
+    hashlife = HashlifeEngine()
+
+    tracemalloc.start()
+    try:
+        hashlife.load_array(board, 10**6, -(10**6))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A padded square covering the board would take at least 16MiB
+    assert peak < 1024 * 1024
+    assert hashlife.root.population == board.sum()
+    assert np.array_equal(hashlife.window(10**6, -(10**6), 3000, 3000), board)
+
+
+def test_canvas_jump_ahead(canvas):
+    """Test that the canvas writes the jumped window back into its matrix."""
+    canvas.clear()
+    # Block still life is unchanged by any jump
+    canvas.toggle_cell(4, 4)
+    canvas.toggle_cell(4, 5)
+    canvas.toggle_cell(5, 4)
+    canvas.toggle_cell(5, 5)
+
+    assert canvas.jump_ahead(6) == 64
+    assert canvas.matrix.shape == (11, 11)
+    assert canvas.matrix.sum() == 4
+    assert canvas.matrix[4][4] == 1
+    assert canvas.matrix[5][5] == 1
+
+
+def test_canvas_macrocell_round_trip(canvas):
+    """Test that the canvas can export and re-import its pattern as a macrocell."""
+    canvas.random()
+    original = canvas.matrix[: canvas.canvas_height, : canvas.canvas_width].copy()
+
+    text = canvas.to_macrocell()
+    canvas.clear()
+    canvas.load_macrocell(text)
+
+    assert np.array_equal(canvas.matrix[: canvas.canvas_height, : canvas.canvas_width], original)
+
+
+def test_canvas_macrocell_keeps_rule(canvas):
+    """Test that loading a macrocell file applies the rule it was saved under."""
+    canvas.set_rule("highlife")
+    canvas.random()
+    text = canvas.to_macrocell()
+
+    # Generations rules can't be run by hashlife, but a file with its own rule still loads
+    canvas.set_rule("345/2/4")
+    canvas.load_macrocell(text)
+    assert canvas.rule == parse_rule("highlife")
+    assert canvas.matrix.sum() > 0
+
+
+def test_jump_action():
+    """Test that the jump action runs in the background and reports the generation count when done."""
+
+    async def run():
+        app = CellularAutomatonTui(width=20, height=20)
+        async with app.run_test(size=(80, 30)) as pilot:
+            # Block still life is unchanged by any jump
+            app.canvas.matrix[4:6, 4:6] = 1
+            await pilot.press("j")
+            assert app.canvas.message in ("Jumping ahead 1024 generations...", "Jumped ahead 1024 generations")
+            while app.canvas.jumping:
+                await pilot.pause(0.01)
+            await pilot.pause()
+            assert app.canvas.message == "Jumped ahead 1024 generations"
+            assert app.canvas.matrix.sum() == 4
+
+    asyncio.run(run())
+
+
+def test_jumping_ignores_edits():
+    """Test that while a jump runs, board-changing keys and clicks are ignored but the view can still move."""
+
+    async def run():
+        app = CellularAutomatonTui(width=20, height=20)
+        async with app.run_test(size=(80, 30)) as pilot:
+            app.canvas.matrix[4:6, 4:6] = 1
+            app.canvas.jumping = True
+            await pilot.press("c")
+            await pilot.click(app.canvas, offset=(1, 0))
+            await pilot.pause()
+            assert app.canvas.matrix.sum() == 4
+            assert app.check_action("zoom_out", ()) is True
+
+            app.canvas.jumping = False
+            await pilot.press("c")
+            await pilot.pause()
+            assert app.canvas.matrix.sum() == 0
+
+    asyncio.run(run())
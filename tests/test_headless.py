@@ -0,0 +1,190 @@
+"""Tests for the headless simulation mode and pattern files."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from src.textual_game_of_life.engines import create_engine
+from src.textual_game_of_life.headless import format_report, load_board, run
+from src.textual_game_of_life.patterns import place, read_rle
+from src.textual_game_of_life.rules import Rule, parse_rule
+
+GLIDER_RLE = """#N Glider
+#C A comment line
+x = 3, y = 3, rule = B3/S23
+bo$2bo$3o!
+"""
+
+
+def test_read_rle():
+    """Test that RLE patterns decode run counts, row ends and the header rule."""
+    cells, rule = read_rle(GLIDER_RLE)
+    assert cells.tolist() == [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    assert rule == "B3/S23"
+
+    cells, rule = read_rle("x = 4, y = 3\n2o$$.2BA!")
+    assert cells.tolist() == [[1, 1, 0, 0], [0, 0, 0, 0], [0, 2, 2, 1]]
+    assert rule is None
+
+
+@pytest.mark.parametrize("text", ["bo$2bo$3o!", "x = 2, y = 1\n3o!", "x = 2, y = 1\n2z!"])
+def test_invalid_rle(text):
+    """Test that RLE without a header, overflowing its size or with unknown tags is rejected."""
+    with pytest.raises(ValueError):
+        _ = read_rle(text)
+
+
+def test_place_centres_pattern():
+    """Test that patterns are placed in the middle of the board and must fit it."""
+    board = place(np.ones((2, 2), dtype=np.uint8), 6, 4)
+    assert board.shape == (4, 6)
+    assert np.argwhere(board).tolist() == [[1, 2], [1, 3], [2, 2], [2, 3]]
+    with pytest.raises(ValueError):
+        _ = place(np.ones((5, 5), dtype=np.uint8), 4, 4)
+
+
+def test_run_matches_engine(tmp_path):
+    """Test that a headless run writes the same final state as stepping the engine directly."""
+    output = tmp_path / "final.textual"
+    report = run(50, width=32, height=24, seed=3, output=str(output))
+
+    start = np.random.default_rng(3).integers(0, 2, (24, 32), dtype=np.uint8)
+    expected = create_engine("numpy").advance(start, 50)
+
+    data = json.loads(output.read_text())
+    assert data["rule"] == "B3/S23"
+    assert (data["canvas_width"], data["canvas_height"]) == (32, 24)
+    assert np.array_equal(np.array(data["matrix"])[:24, :32], expected)
+
+    assert report["generations"] == 50
+    assert report["engine"] == "numpy"
+    assert report["cells_per_second"] == pytest.approx(report["generations_per_second"] * 32 * 24)
+
+
+def test_saved_state_round_trip(tmp_path):
+    """Test that a headless output can be loaded again, keeping its size and rule."""
+    output = tmp_path / "final.textual"
+    _ = run(3, width=15, height=12, rule="highlife", seed=1, output=str(output))
+
+    board, rule = load_board(str(output), 40, 40, parse_rule("life"))
+    assert board.shape == (12, 15)
+    assert rule == Rule.parse("B36/S23")
+
+
+def test_load_rle_with_rule(tmp_path):
+    """Test that an RLE pattern is centred on the board and brings its own rule."""
+    pattern = tmp_path / "glider.rle"
+    _ = pattern.write_text(GLIDER_RLE.replace("B3/S23", "B36/S23"))
+
+    board, rule = load_board(str(pattern), 10, 10, parse_rule("life"))
+    assert rule == Rule.parse("highlife")
+    assert board.sum() == 5
+    assert board[3:6, 3:6].tolist() == [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+
+def test_macrocell_output(tmp_path):
+    """Test that the final state can be written as a macrocell file and read back."""
+    output = tmp_path / "final.mc"
+    _ = run(4, width=16, height=16, seed=2, output=str(output))
+    assert output.read_text().startswith("[M2]")
+
+    reloaded, _ = load_board(str(output), 16, 16, parse_rule("life"))
+    start = np.random.default_rng(2).integers(0, 2, (16, 16), dtype=np.uint8)
+    assert np.array_equal(reloaded, create_engine("numpy").advance(start, 4))
+
+
+def test_format_report():
+    """Test that the report shows throughput and peak memory."""
+    report = run(5, width=10, height=10, seed=0)
+    text = format_report(report)
+    assert "5 generations of B3/S23 on a 10x10 board with the numpy engine" in text
+    assert "generations/sec:" in text
+    assert "cells/sec:" in text
+    assert "peak memory:" in text
+
+
+def test_headless_cli_does_not_import_textual(tmp_path):
+    """Test that the headless command line runs and never imports textual."""
+    output = tmp_path / "out.textual"
+    script = (
+        "import sys\n"
+        "from src.textual_game_of_life.__main__ import main\n"
+        f"sys.argv = ['game', '--headless', '--generations', '20', '--random', '--output', {str(output)!r}]\n"
+        "main()\n"
+        "assert 'textual' not in sys.modules and 'rich' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert "generations/sec:" in result.stdout
+    assert output.exists()
+
+
+def test_headless_cli_writes_nothing_without_output(tmp_path):
+    """Test that a headless run without --output leaves the UI's save file alone."""
+    script = (
+        "import sys\n"
+        "from src.textual_game_of_life.__main__ import main\n"
+        "sys.argv = ['game', '--headless', '--generations', '5', '--random']\n"
+        "main()\n"
+    )
+    root = str(Path(__file__).resolve().parent.parent)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": root},
+    )
+    assert "generations/sec:" in result.stdout
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_headless_needs_generations():
+    """Test that headless mode without a generation count is refused."""
+    script = (
+        "import sys\n"
+        "from src.textual_game_of_life.__main__ import main\n"
+        "sys.argv = ['game', '--headless']\n"
+        "main()\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--generations" in result.stderr
+
+
+def test_tui_loads_rle(app, tmp_path):
+    """Test that the UI also loads RLE pattern files."""
+    pattern = tmp_path / "glider.rle"
+    _ = pattern.write_text(GLIDER_RLE)
+    app._load_from_file(str(pattern))
+    assert app.canvas.matrix.sum() == 5
+    assert app.canvas.message == f"Pattern loaded from {pattern}"
+
+
+def test_tui_reports_bad_loads(app, tmp_path):
+    """Test that files the current or stored rule can't load are reported rather than crashing the UI."""
+    app.canvas.set_rule("345/2/4")
+    app.canvas.toggle_cell(1, 1)
+
+    macrocell = tmp_path / "bad.mc"
+    _ = macrocell.write_text("[M2]\n#R not-a-rule\n.*$..*$***$\n4 0 0 0 1\n")
+    app._load_from_file(str(macrocell))
+    assert "not-a-rule" in app.canvas.message
+
+    saved = tmp_path / "bad.textual"
+    _ = saved.write_text(json.dumps({"matrix": [], "rule": "not-a-rule"}))
+    app._load_from_file(str(saved))
+    assert "not-a-rule" in app.canvas.message
+    assert app.canvas.matrix.sum() == 1
+
+
+def test_load_macrocell_with_rule(tmp_path):
+    """Test that a macrocell file brings the rule it was saved under."""
+    output = tmp_path / "final.mc"
+    _ = run(2, width=16, height=16, rule="highlife", seed=3, output=str(output))
+
+    board, rule = load_board(str(output), 16, 16, parse_rule("life"))
+    assert rule == Rule.parse("highlife")
+    assert board.sum() > 0
@@ -0,0 +1,155 @@
+"""Tests for isotropic non-totalistic rules in Hensel notation."""
+import tracemalloc
+from collections import Counter
+import numpy as np
+import pytest
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.engines import IsotropicEngine, NumPyEngine, create_engine, engine_for
+from src.textual_game_of_life.hashlife import HashlifeEngine
+from src.textual_game_of_life.rules import HENSEL_NEIGHBOURHOODS, IsotropicRule, Rule, hensel_classes, parse_rule
+
+# Offsets of the eight neighbours, clockwise from north
+RING = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+def reference_generation(grid: np.ndarray, rule: IsotropicRule) -> np.ndarray:
+    # Classify every cell's neighbourhood one at a time, wrapping at the edges
+    classes = hensel_classes()
+    height, width = grid.shape
+    result = np.zeros_like(grid)
+    for y in range(height):
+        for x in range(width):
+            ring = tuple(int(grid[(y + dy) % height, (x + dx) % width]) for dy, dx in RING)
+            count, letter = classes[ring]
+            transitions = rule.survival if grid[y, x] else rule.birth
+            result[y, x] = count in transitions and (not letter or letter in transitions[count])
+    return result
+
+
+def test_hensel_classes_partition_neighbourhoods():
+    """Test that every arrangement of neighbours belongs to exactly one lettered class."""
+    classes = hensel_classes()
+    assert len(classes) == 256
+    assert all(sum(ring) == count for ring, (count, _) in classes.items())
+
+    sizes = Counter(classes.values())
+    for count, letters in HENSEL_NEIGHBOURHOODS.items():
+        assert {letter for (c, letter) in sizes if c == count} == (set(letters) or {""})
+    assert sizes[(2, "a")] == 8
+    assert sizes[(4, "z")] == 4
+    assert sizes[(4, "c")] == 1
+
+
+def test_parse_hensel_notation():
+    """Test that letters, negated letters and bare counts parse to the right arrangements."""
+    rule = IsotropicRule.parse("B2-a3/S1c23ek")
+    assert rule.birth[2] == frozenset("ceikn")
+    assert rule.birth[3] == frozenset(HENSEL_NEIGHBOURHOODS[3])
+    assert rule.survival == {1: frozenset("c"), 2: frozenset(HENSEL_NEIGHBOURHOODS[2]), 3: frozenset("ek")}
+    assert str(rule) == "B2-a3/S1c23ek"
+    assert IsotropicRule.parse(str(IsotropicRule.parse("tlife"))) == IsotropicRule.parse("B3/S2-i34q")
+
+
+@pytest.mark.parametrize("text", ["B2x/S23", "B1z/S23", "B3/S2-", "B9/S23", "B3/S23/C3", "B3"])
+def test_invalid_hensel_notation(text):
+    """Test that letters outside a count's arrangements and malformed rules are rejected."""
+    with pytest.raises(ValueError):
+        IsotropicRule.parse(text)
+
+
+def test_parse_rule_picks_rule_type():
+    """Test that totalistic rules parse to Rule and the rest to IsotropicRule."""
+    assert parse_rule("B36/S23") == Rule({3, 6}, {2, 3})
+    assert parse_rule("B3/S2cekain3") == Rule({3}, {2, 3})
+    assert isinstance(parse_rule("tlife"), IsotropicRule)
+    with pytest.raises(ValueError):
+        parse_rule("B3/S2q")
+
+
+def test_totalistic_neighbourhood_table():
+    """Test that a totalistic rule expands to the same 512-entry table in either notation."""
+    table = Rule.parse("B36/S23").neighbourhood_table
+    assert np.array_equal(IsotropicRule.parse("B36/S23").neighbourhood_table, table)
+    # Bit 4 is the cell itself; three live neighbours in the top row give birth
+    assert table[0b000000111] == 1
+    assert table[0b000010111] == 1
+    assert table[0b000010000] == 0
+
+
+@pytest.mark.parametrize("rule_text", ["tlife", "snowflakes", "B2-a/S12", "B2e3-k/S1e2i4"])
+def test_isotropic_engine_matches_reference(rule_text):
+    """Test that the vectorized isotropic engine matches classifying each cell by hand."""
+    rule = IsotropicRule.parse(rule_text)
+    grid = np.random.default_rng(len(rule_text)).integers(0, 2, (17, 23), dtype=np.int8)
+
+    expected = grid
+    for _ in range(4):
+        expected = reference_generation(expected, rule)
+
+    assert np.array_equal(IsotropicEngine(rule).advance(grid, 4), expected)
+
+
+def test_isotropic_engine_runs_totalistic_rules():
+    """Test that the isotropic engine agrees with the NumPy engine on totalistic rules."""
+    rule = Rule.parse("highlife")
+    grid = np.random.default_rng(8).integers(0, 2, (30, 41), dtype=np.int8)
+    assert np.array_equal(IsotropicEngine(rule).advance(grid, 8), NumPyEngine(rule).advance(grid, 8))
+
+
+def test_isotropic_engine_steps_without_allocating():
+    """Test that steady-state stepping of the isotropic engine allocates no arrays, in place or not."""
+    engine = IsotropicEngine(IsotropicRule.parse("tlife"))
+    grid = np.random.default_rng(9).integers(0, 2, (256, 256), dtype=np.uint8)
+    out = np.zeros_like(grid)
+    expected = IsotropicEngine(IsotropicRule.parse("tlife")).advance(grid, 6)
+    # Warm up: the first call allocates the buffers for this board size
+    engine.advance_into(grid, out, 5)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        engine.advance_into(out, out, 1)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A single temporary the size of the board would be 64KiB
+    assert after - before < 1024
+    assert peak - before < 1024
+    assert np.array_equal(out, expected)
+
+
+def test_engines_reject_unsupported_rules():
+    """Test that totalistic-only engines refuse isotropic rules and a capable engine is chosen instead."""
+    rule = parse_rule("tlife")
+    with pytest.raises(ValueError):
+        create_engine("numpy", rule)
+    assert engine_for(rule) == "isotropic"
+    assert engine_for(Rule.parse("life")) == "numpy"
+
+
+def test_hashlife_runs_isotropic_rules():
+    """Test that Hashlife applies isotropic rules through the 512-entry table."""
+    rule = parse_rule("B2-a/S12")
+    soup = np.random.default_rng(12).integers(0, 2, (8, 8), dtype=np.int8)
+    board = np.zeros((72, 72), dtype=np.int8)
+    board[32:40, 32:40] = soup
+
+    hashlife = HashlifeEngine(rule)
+    hashlife.load_array(soup, 0, 0)
+    hashlife.jump(4)
+
+    expected = IsotropicEngine(rule).advance(board, 16)
+    assert np.array_equal(hashlife.window(-32, -32, 72, 72), expected)
+
+
+def test_canvas_switches_engine_for_isotropic_rule():
+    """Test that setting an isotropic rule moves the canvas to an engine that can run it."""
+    canvas = Canvas(width=10, height=10, engine="bitpacked")
+    canvas.set_rule("tlife")
+    assert isinstance(canvas.engine, IsotropicEngine)
+
+    canvas.set_rule("life")
+    assert isinstance(canvas.engine, IsotropicEngine)
+    assert Canvas(width=10, height=10, rule="tlife").engine.name == "isotropic"
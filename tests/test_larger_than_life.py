@@ -0,0 +1,99 @@
+"""Tests for Larger than Life rules and the summed-area table engine."""
+import numpy as np
+import pytest
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.engines import LargerThanLifeEngine, create_engine, engine_for
+from src.textual_game_of_life.hashlife import HashlifeEngine
+from src.textual_game_of_life.rules import LargerThanLifeRule, parse_rule
+
+
+def reference_generation(grid: np.ndarray, rule: LargerThanLifeRule) -> np.ndarray:
+    # Sum a shifted copy of the live cells for every offset in the neighbourhood
+    alive = (grid == 1).astype(np.int32)
+    counts = np.zeros(grid.shape, dtype=np.int32)
+    radius = rule.radius
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if rule.neighbourhood == "N" and abs(dy) + abs(dx) > radius:
+                continue
+            if (dy, dx) == (0, 0) and not rule.middle:
+                continue
+            counts += np.roll(np.roll(alive, dy, axis=0), dx, axis=1)
+
+    born = (counts >= rule.birth[0]) & (counts <= rule.birth[1])
+    survives = (counts >= rule.survival[0]) & (counts <= rule.survival[1])
+    result = np.where(grid == 0, born, np.where(survives, 1, 2 % rule.states))
+    return np.where(grid >= 2, (grid.astype(np.int32) + 1) % rule.states, result).astype(np.uint8)
+
+
+def test_parse_larger_than_life():
+    """Test that Golly's Larger than Life notation parses, with defaults for optional parts."""
+    bosco = parse_rule("bosco")
+    assert isinstance(bosco, LargerThanLifeRule)
+    assert (bosco.radius, bosco.states, bosco.middle, bosco.neighbourhood) == (5, 2, True, "M")
+    assert (bosco.birth, bosco.survival) == ((34, 45), (34, 58))
+    assert bosco.max_count == 121
+    assert str(bosco) == "R5,C0,M1,S34..58,B34..45,NM"
+
+    rule = LargerThanLifeRule.parse("r3,b5..9,s4")
+    assert str(rule) == "R3,C0,M0,S4..4,B5..9,NM"
+    assert LargerThanLifeRule.parse("R2,C4,M0,S3..5,B4..6,NN").max_count == 12
+
+
+@pytest.mark.parametrize(
+    "text", ["R5,C0,M1,S34..58,NM", "R0,C0,M0,S1..2,B3..3,NM", "R2,M2,S1..2,B3..3", "R2,S1..2,B3..3,NC", "R2,S1,B3,B4"]
+)
+def test_invalid_larger_than_life(text):
+    """Test that malformed or unsupported Larger than Life rules are rejected."""
+    with pytest.raises(ValueError):
+        LargerThanLifeRule.parse(text)
+
+
+@pytest.mark.parametrize(
+    "rule_text",
+    [
+        "R5,C0,M1,S34..58,B34..45,NM",
+        "R3,C0,M0,S8..16,B9..12,NN",
+        "R2,C4,M1,S6..10,B5..8,NM",
+        "R4,C3,M0,S10..20,B8..14,NN",
+        "R10,C0,M1,S100..200,B120..180,NM",
+    ],
+)
+def test_larger_than_life_engine_matches_reference(rule_text):
+    """Test that summed-area counting matches summing every offset for box and diamond neighbourhoods."""
+    rule = LargerThanLifeRule.parse(rule_text)
+    grid = np.random.default_rng(rule.radius).integers(0, rule.states, (29, 41), dtype=np.uint8)
+
+    expected = grid
+    for _ in range(4):
+        expected = reference_generation(expected, rule)
+
+    assert np.array_equal(LargerThanLifeEngine(rule).advance(grid, 4), expected)
+
+
+def test_radius_larger_than_board():
+    """Test that neighbourhoods wider than the board wrap around it more than once."""
+    rule = LargerThanLifeRule.parse("R6,C0,M1,S10..40,B12..30,NN")
+    grid = np.random.default_rng(1).integers(0, 2, (7, 9), dtype=np.uint8)
+    assert np.array_equal(LargerThanLifeEngine(rule).next_generation(grid), reference_generation(grid, rule))
+
+
+def test_only_larger_than_life_engine_runs_larger_than_life_rules(canvas):
+    """Test that the canvas picks the Larger than Life engine and other engines refuse the rule."""
+    rule = parse_rule("bosco")
+    assert engine_for(rule) == "ltl"
+    with pytest.raises(ValueError):
+        create_engine("numpy", rule)
+    with pytest.raises(ValueError):
+        HashlifeEngine(rule)
+
+    canvas.set_rule("bosco")
+    assert isinstance(canvas.engine, LargerThanLifeEngine)
+    assert isinstance(Canvas(width=10, height=10, rule="majority").engine, LargerThanLifeEngine)
+
+
+def test_default_rule_is_life():
+    """Test that without a rule the engine runs Conway's Life written as a radius-1 rule."""
+    grid = np.random.default_rng(2).integers(0, 2, (20, 30), dtype=np.uint8)
+    expected = create_engine("numpy").advance(grid, 5)
+    assert np.array_equal(LargerThanLifeEngine().advance(grid, 5), expected)
@@ -0,0 +1,126 @@
+"""Tests for continuous Lenia rules and the FFT convolution engine."""
+from fractions import Fraction
+from unittest.mock import PropertyMock, patch
+import numpy as np
+import pytest
+from rich.style import Style
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.engines import LeniaEngine, create_engine, engine_for
+from src.textual_game_of_life.hashlife import HashlifeEngine
+from src.textual_game_of_life.rules import LeniaRule, parse_rule
+
+
+def direct_generation(cells: np.ndarray, kernel: np.ndarray, rule: LeniaRule) -> np.ndarray:
+    # Convolve by summing a shifted copy of the board for every non-zero kernel entry
+    potential = np.zeros(cells.shape)
+    for dy, dx in zip(*np.nonzero(kernel)):
+        potential += kernel[dy, dx] * np.roll(np.roll(cells, dy, axis=0), dx, axis=1)
+    growth = 2 * np.exp(-(((potential - rule.mu) / rule.sigma) ** 2) / 2) - 1
+    return np.clip(cells + growth / rule.time, 0, 1)
+
+
+def test_parse_lenia():
+    """Test that Lenia's key=value notation parses, including fractional ring heights."""
+    orbium = parse_rule("orbium")
+    assert isinstance(orbium, LeniaRule)
+    assert (orbium.radius, orbium.time, orbium.mu, orbium.sigma) == (13, 10, 0.15, 0.015)
+    assert orbium.peaks == (Fraction(1),)
+    assert LeniaRule.parse("geminium").peaks == (Fraction(1, 2), Fraction(1), Fraction(2, 3))
+    assert LeniaRule.parse(str(orbium)) == orbium
+
+
+@pytest.mark.parametrize(
+    "text", ["R=13;T=10;m=0.15;s=0.015", "R=13;T=10;m=0.15;s=0.015;b=1;x=2", "R=0;T=10;m=0.1;s=0.01;b=1", "R=a;T=1"]
+)
+def test_invalid_lenia(text):
+    """Test that incomplete or malformed Lenia rules are rejected."""
+    with pytest.raises(ValueError):
+        LeniaRule.parse(text)
+
+
+def test_kernel_is_normalised_rings():
+    """Test that the kernel sums to 1, is zero at the centre and has a ring per peak."""
+    engine = LeniaEngine(LeniaRule.parse("R=8;T=10;m=0.2;s=0.02;b=1/2,1"))
+    kernel = engine.kernel(32, 32)
+    assert kernel.dtype == np.float32
+    assert kernel.sum() == pytest.approx(1)
+    assert kernel[0, 0] == 0
+    # Outside the radius (wrapping round the torus) the kernel is empty
+    assert kernel[8, 0] == 0
+    assert kernel[0, -8] == 0
+    # The outer ring is twice as high as the inner one
+    assert kernel[6, 0] == pytest.approx(2 * kernel[2, 0])
+
+
+@pytest.mark.parametrize("rule_text", ["R=5;T=10;m=0.15;s=0.015;b=1", "R=6;T=5;m=0.26;s=0.036;b=1/2,1,2/3"])
+def test_fft_matches_direct_convolution(rule_text):
+    """Test that the FFT convolution gives the same generation as direct convolution."""
+    rule = LeniaRule.parse(rule_text)
+    engine = LeniaEngine(rule)
+    cells = np.random.default_rng(rule.radius).random((24, 30)).astype(np.float32)
+
+    result = engine.next_generation(cells)
+    expected = direct_generation(cells.astype(np.float64), engine.kernel(24, 30).astype(np.float64), rule)
+    assert result.dtype == np.float32
+    assert np.allclose(result, expected, atol=1e-4)
+
+
+def test_kernel_spectrum_is_cached():
+    """Test that the kernel spectrum is computed once per board size."""
+    engine = LeniaEngine()
+    cells = np.random.default_rng(0).random((40, 40)).astype(np.float32)
+    _ = engine.advance(cells, 3)
+    spectrum = engine.spectrum(40, 40)
+    assert len(engine.spectra) == 1
+
+    _ = engine.next_generation(cells)
+    assert engine.spectrum(40, 40) is spectrum
+    _ = engine.next_generation(cells[:20])
+    assert len(engine.spectra) == 2
+
+
+def test_only_lenia_engine_runs_lenia_rules():
+    """Test that the Lenia engine is chosen for Lenia rules and other engines refuse them."""
+    rule = parse_rule("orbium")
+    assert engine_for(rule) == "lenia"
+    with pytest.raises(ValueError):
+        create_engine("generations", rule)
+    with pytest.raises(ValueError):
+        HashlifeEngine(rule)
+
+
+def test_canvas_switches_to_float_cells(canvas):
+    """Test that a Lenia rule turns the canvas into float32 cells and back."""
+    canvas.toggle_cell(2, 3)
+    canvas.set_rule("orbium")
+    assert canvas.matrix.dtype == np.float32
+    assert canvas.matrix[3, 2] == 1.0
+
+    canvas.random()
+    assert canvas.matrix.dtype == np.float32
+    canvas.step()
+    assert canvas.matrix.dtype == np.float32
+    assert 0 <= canvas.matrix.min() and canvas.matrix.max() <= 1
+
+    canvas.set_rule("life")
+    assert canvas.matrix.dtype == np.uint8
+
+
+def test_gradient_rendering():
+    """Test that continuous values are quantized into a fixed gradient of precomputed styles."""
+    with (
+        patch.object(Canvas, "white", new_callable=PropertyMock, return_value=Style(bgcolor="#ffffff")),
+        patch.object(Canvas, "black", new_callable=PropertyMock, return_value=Style(bgcolor="#000000")),
+        patch.object(Canvas, "cursor", new_callable=PropertyMock, return_value=Style(bgcolor="red")),
+    ):
+        canvas = Canvas(width=5, height=5, rule="orbium")
+        styles = canvas.state_styles
+        assert len(styles) == canvas.GRADIENT_LEVELS
+        assert str(styles[0].bgcolor.name) == "#ffffff"
+        assert str(styles[-1].bgcolor.name) == "#000000"
+
+        canvas.matrix[2, :4] = [0.0, 0.02, 0.5, 1.0]
+        assert canvas.row_states(2)[:4].tolist() == [0, 0, 8, 15]
+        segments = list(canvas.render_line(2))
+        # The first two cells quantize to the same shade and share a segment
+        assert segments[2].style is styles[-1]
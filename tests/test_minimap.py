@@ -0,0 +1,138 @@
+"""Tests for the minimap of the whole board."""
+import asyncio
+from unittest.mock import MagicMock, PropertyMock, patch
+import numpy as np
+import pytest
+from rich.style import Style
+from textual.geometry import Region
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.minimap import Minimap
+from src.textual_game_of_life.tui import CellularAutomatonTui
+
+
+@pytest.fixture
+def minimap():
+    """Return a minimap of a 40x30 board, 10x10 pixels in size, with fixed styles."""
+    styles = [Style(bgcolor=f"#0000{level:02x}") for level in range(Minimap.LEVELS)] + [Style(bgcolor="red")]
+    with patch.object(Minimap, "styles_by_shade", new_callable=PropertyMock, return_value=styles):
+        minimap = Minimap(Canvas(width=40, height=30))
+        minimap.DEFAULT_PIXELS = (10, 10)
+        minimap.refresh = MagicMock()
+        yield minimap
+
+
+def test_blocks_shaded_by_density(minimap):
+    """Test that each pixel shows the live fraction of its block, any life showing at least faintly."""
+    canvas = minimap.canvas
+    canvas.matrix[0:4, 0:2] = 1
+    canvas.matrix[29, 39] = 1
+    minimap.update_map()
+    assert minimap.block == 4
+    assert minimap._sums.shape == (8, 10)
+    assert minimap._sums[0, 0] == 8
+    # The bottom blocks are two cells tall
+    assert minimap._sums[7, 9] == 1
+    shades = minimap.shades()
+    assert shades[0, 0] == np.ceil((minimap.LEVELS - 1) / 2)
+    assert shades[7, 9] == np.ceil((minimap.LEVELS - 1) / 8)
+    assert shades[3, 3] == 0
+
+
+def test_only_changed_tiles_summed(minimap):
+    """Test that after a change only the tile holding it is summed again."""
+    canvas = minimap.canvas
+    canvas.random()
+    minimap.update_map()
+    canvas.toggle_cell(5, 3)
+    with patch.object(minimap, "block_sums", wraps=minimap.block_sums) as block_sums:
+        minimap.update_map()
+    assert [call.args[0].shape for call in block_sums.call_args_list] == [(minimap.TILE_ROWS, 40)]
+    assert np.array_equal(minimap._sums, minimap.block_sums(canvas.matrix[:30, :40]))
+
+
+def test_shown_generations_sum_reported_rows(minimap):
+    """Test that shown generations and edits to them are summed again only in changed rows, with no copy of the board."""
+    canvas = minimap.canvas
+    canvas.random()
+    minimap.update_map()
+
+    cells = canvas.matrix.copy()
+    cells[20, 5] = 1 - cells[20, 5]
+    cells.flags.writeable = False
+    changed = np.zeros(30, dtype=bool)
+    changed[20] = True
+    with patch.object(minimap, "block_sums", wraps=minimap.block_sums) as block_sums:
+        canvas.show_generation(cells, changed)
+        minimap.update_map()
+        # Drawing on an adopted generation copies it first, keeping the rows changed
+        canvas.toggle_cell(5, 2)
+        minimap.update_map()
+        # A board replaced as a whole is summed again in full
+        canvas.random()
+        minimap.update_map()
+    assert [call.args[0].shape for call in block_sums.call_args_list] == [(14, 40), (16, 40), (30, 40)]
+    assert np.array_equal(minimap._sums, minimap.block_sums(canvas.matrix[:30, :40]))
+    assert not any(isinstance(value, np.ndarray) and value.size >= 30 * 40 for value in vars(minimap).values())
+
+
+def test_redrawn_only_on_changes(minimap):
+    """Test that the map is redrawn when the board or the view changes, outlining the view."""
+    canvas = minimap.canvas
+    with patch.object(Canvas, "size", new_callable=PropertyMock, return_value=MagicMock(width=20, height=10)):
+        canvas.pan(12, 8)
+        minimap.update_map()
+        assert minimap.view_outline() == Region(3, 2, 3, 3)
+        assert minimap._image[2, 3:6].tolist() == [minimap.LEVELS] * 3
+        assert minimap._image[3].tolist() == [0, 0, 0, minimap.LEVELS, 0, minimap.LEVELS, 0, 0, 0, 0]
+        minimap.update_map()
+        assert minimap.refresh.call_count == 1
+
+        # Panning moves the outline without summing the board again
+        with patch.object(minimap, "update_sums") as update_sums:
+            canvas.pan(8, 0)
+            minimap.update_map()
+        update_sums.assert_not_called()
+        assert minimap.refresh.call_count == 2
+
+        canvas.step()
+        minimap.update_map()
+        assert minimap.refresh.call_count == 3
+
+
+def test_render_half_blocks(minimap):
+    """Test that lines pair rows of pixels in half blocks, merging equal neighbours."""
+    canvas = minimap.canvas
+    canvas.matrix[4:8, 4:8] = 1
+    minimap.update_map()
+    # Before the canvas has a size its view is the whole board, outlined around the edges
+    colours = [style.bgcolor for style in minimap.styles_by_shade]
+    outline, dead, live = colours[-1], colours[0], colours[minimap.LEVELS - 1]
+    strip = minimap.render_line(0)
+    assert strip.text == minimap.HALF_BLOCK * 10
+    assert [(len(segment.text), segment.style.color, segment.style.bgcolor) for segment in strip] == [
+        (1, outline, outline),
+        (1, outline, live),
+        (7, outline, dead),
+        (1, outline, outline),
+    ]
+    segments = list(minimap.render_line(1))
+    assert [(len(segment.text), segment.style.color) for segment in segments] == [(1, outline), (8, dead), (1, outline)]
+    assert minimap.render_line(4).text.strip() == ""
+
+
+def test_minimap_in_app():
+    """Test that the minimap is shown beside the canvas with --minimap and toggled with n."""
+
+    async def run():
+        app = CellularAutomatonTui(width=100, height=100, minimap=True)
+        async with app.run_test(size=(80, 30)) as pilot:
+            await pilot.pause()
+            assert app.minimap.display
+            assert app.minimap.block > 1
+            width = app.canvas.size.width
+            await pilot.press("n")
+            await pilot.pause()
+            assert not app.minimap.display
+            assert app.canvas.size.width > width
+
+    asyncio.run(run())
@@ -0,0 +1,248 @@
+"""Tests for rendering the canvas rows."""
+import asyncio
+from unittest.mock import MagicMock, PropertyMock, patch
+import numpy as np
+import pytest
+from rich.style import Style
+from textual.geometry import Offset, Region
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.tui import CellularAutomatonTui
+
+WHITE = Style(bgcolor="#ffffff")
+BLACK = Style(bgcolor="#000000")
+CURSOR = Style(bgcolor="red")
+
+
+@pytest.fixture
+def styled_canvas():
+    """Return a Canvas whose CSS styles are fixed, so it renders without an app."""
+    with (
+        patch.object(Canvas, "white", new_callable=PropertyMock, return_value=WHITE),
+        patch.object(Canvas, "black", new_callable=PropertyMock, return_value=BLACK),
+        patch.object(Canvas, "cursor", new_callable=PropertyMock, return_value=CURSOR),
+    ):
+        canvas = Canvas(width=6, height=6)
+        canvas.cursor_square = Offset(-1, -1)
+        yield canvas
+
+
+def cell_styles(strip, width=2):
+    """Return the style of each cell of a rendered strip."""
+    styles = []
+    for segment in strip:
+        styles += [segment.style] * (len(segment.text) // width)
+    return styles
+
+
+def test_rows_are_cached(styled_canvas):
+    """Test that rows with the same cells share one rendered strip."""
+    canvas = styled_canvas
+    assert canvas.row_strip(1) is canvas.row_strip(1)
+    assert canvas.row_strip(1) is canvas.row_strip(4)
+
+    canvas.matrix[4, 2] = 1
+    strip = canvas.row_strip(4)
+    assert strip is not canvas.row_strip(1)
+    assert cell_styles(strip) == [WHITE, WHITE, BLACK, WHITE, WHITE, WHITE]
+    assert strip.cell_length == 12
+
+
+def test_cache_keyed_on_width_and_styles(styled_canvas):
+    """Test that resizing the canvas or changing the rule's styles renders rows again."""
+    canvas = styled_canvas
+    strip = canvas.row_strip(0)
+    canvas.canvas_width = 5
+    assert canvas.row_strip(0) is not strip
+    assert canvas.row_strip(0).cell_length == 10
+
+    canvas.canvas_width = 6
+    assert canvas.row_strip(0) is strip
+    canvas.set_rule("starwars")
+    assert canvas.row_strip(0) is not strip
+
+
+def test_cursor_drawn_over_cached_row(styled_canvas):
+    """Test that the cursor is drawn over the cached row without changing it."""
+    canvas = styled_canvas
+    canvas.matrix[3, 0] = 1
+    canvas.cursor_square = Offset(2, 3)
+    line = canvas.render_line(3)
+    assert cell_styles(line) == [BLACK, WHITE, CURSOR, WHITE, WHITE, WHITE]
+    assert line.cell_length == 12
+    assert cell_styles(canvas.row_strip(3)) == [BLACK, WHITE, WHITE, WHITE, WHITE, WHITE]
+    assert CURSOR not in cell_styles(canvas.render_line(2))
+
+
+def test_runs_merged_into_segments(styled_canvas):
+    """Test that neighbouring cells in the same state are rendered as one segment."""
+    canvas = styled_canvas
+    canvas.matrix[2, 2:5] = 1
+    segments = list(canvas.row_strip(2))
+    assert [(len(segment.text), segment.style) for segment in segments] == [(4, WHITE), (6, BLACK), (2, WHITE)]
+    assert len(list(canvas.row_strip(0))) == 1
+
+    # The cursor splits a run where it sits
+    canvas.cursor_square = Offset(3, 2)
+    assert cell_styles(canvas.render_line(2)) == [WHITE, WHITE, BLACK, CURSOR, BLACK, WHITE]
+
+
+def test_styles_resolved_once():
+    """Test that the CSS is only consulted again when the styles or the cursor colour change."""
+    white = PropertyMock(return_value=WHITE)
+    cursor = PropertyMock(return_value=CURSOR)
+    with (
+        patch.object(Canvas, "white", new=white),
+        patch.object(Canvas, "black", new_callable=PropertyMock, return_value=BLACK),
+        patch.object(Canvas, "cursor", new=cursor),
+    ):
+        canvas = Canvas(width=6, height=6)
+        canvas.matrix[:, ::2] = 1
+        canvas.cursor_square = Offset(1, 1)
+        for _ in range(3):
+            for y in range(6):
+                _ = canvas.render_line(y)
+        assert (white.call_count, cursor.call_count) == (1, 1)
+        assert canvas.palette.tolist() == [WHITE, BLACK]
+
+        canvas.cursor_colour = "white"
+        _ = canvas.render_line(1)
+        assert (white.call_count, cursor.call_count) == (1, 2)
+
+        strip = canvas.row_strip(0)
+        canvas.notify_style_update()
+        assert canvas.row_strip(0) is not strip
+        assert (white.call_count, cursor.call_count) == (2, 2)
+
+
+def test_theme_change_resolves_styles():
+    """Test that changing the theme of a running app resolves the canvas styles again."""
+
+    async def run():
+        app = CellularAutomatonTui(width=10, height=10)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            palette = app.canvas.palette
+            assert app.canvas.palette is palette
+            app.theme = "textual-light" if app.theme != "textual-light" else "textual-dark"
+            await pilot.pause()
+            assert app.canvas.palette is not palette
+
+    asyncio.run(run())
+
+
+def test_half_block_rendering(styled_canvas):
+    """Test that half block lines draw the top cell in the foreground and the bottom one in the background."""
+    canvas = styled_canvas
+    canvas.set_display_mode("half")
+    canvas.matrix[0, 1] = 1
+    canvas.matrix[1, 2:4] = 1
+    strip = canvas.render_line(0)
+    assert strip.text == canvas.HALF_BLOCK * 6
+    assert strip.cell_length == 6
+    glyphs = [(segment.style.color, segment.style.bgcolor) for segment in strip for _ in segment.text]
+    white, black = WHITE.bgcolor, BLACK.bgcolor
+    assert glyphs == [(white, white), (black, white), (white, black), (white, black), (white, white), (white, white)]
+    # Equal glyphs share a segment
+    assert len(list(strip)) == 4
+
+    # Three lines show the six rows; the lines below are blank
+    assert canvas.canvas_lines == 3
+    assert canvas.render_line(3).text.strip() == ""
+
+
+def test_half_block_odd_height():
+    """Test that the bottom half of the last line is left empty when the board has an odd number of rows."""
+    with (
+        patch.object(Canvas, "white", new_callable=PropertyMock, return_value=WHITE),
+        patch.object(Canvas, "black", new_callable=PropertyMock, return_value=BLACK),
+    ):
+        canvas = Canvas(width=4, height=5, display_mode="half")
+        canvas.cursor_square = Offset(-1, -1)
+        canvas.matrix[4, 0] = 1
+        segments = list(canvas.render_line(2))
+    assert [(segment.style.color, segment.style.bgcolor) for segment in segments] == [
+        (BLACK.bgcolor, None),
+        (WHITE.bgcolor, None),
+    ]
+
+
+def test_half_block_cursor(styled_canvas):
+    """Test that the cursor fills only its own half of a glyph."""
+    canvas = styled_canvas
+    canvas.set_display_mode("half")
+    canvas.matrix[2, 1] = 1
+    canvas.cursor_square = Offset(1, 3)
+    segments = list(canvas.render_line(1))
+    cursor = segments[1]
+    assert cursor.text == canvas.HALF_BLOCK
+    assert (cursor.style.color, cursor.style.bgcolor) == (BLACK.bgcolor, CURSOR.bgcolor)
+    assert CURSOR.bgcolor not in [segment.style.bgcolor for segment in canvas.render_line(0)]
+
+
+def test_half_block_geometry(canvas):
+    """Test that regions, the pointer and the terminal size follow the half block glyphs."""
+    canvas.set_display_mode("half")
+    assert canvas.get_square_region(Offset(3, 5)) == Region(3, 2, 1, 1)
+
+    # Half way down a line is the bottom cell, with pixel precise pointers
+    assert canvas.cell_at(MagicMock(pointer_x=3.0, pointer_y=2.0)) == Offset(3, 4)
+    assert canvas.cell_at(MagicMock(pointer_x=3.4, pointer_y=2.6)) == Offset(3, 5)
+
+    with patch.object(Canvas, "size", PropertyMock(return_value=MagicMock(width=60, height=30))):
+        canvas.update_size_constraints()
+    assert (canvas.max_width_by_term, canvas.max_height_by_term) == (60, 60)
+
+    old = canvas.matrix.copy()
+    canvas.matrix[4, 2:5] = 1
+    canvas.matrix[5, 3] = 1
+    canvas.mark_dirty = MagicMock()
+    canvas.refresh_changes(old)
+    assert set(canvas.mark_dirty.call_args.args) == {Region(2, 2, 3, 1), Region(3, 2, 1, 1)}
+
+    with pytest.raises(ValueError):
+        canvas.set_display_mode("sideways")
+    canvas.set_display_mode("blocks")
+    assert canvas.get_square_region(Offset(3, 5)) == Region(6, 5, 2, 1)
+
+
+def test_braille_codes(canvas):
+    """Test that each character's dots are the live cells of its 2x4 block."""
+    canvas.set_display_mode("braille")
+    # Left column top to bottom, then the right column
+    for row in range(4):
+        canvas.matrix[row, 0] = 1
+    canvas.matrix[0, 3] = 1
+    canvas.matrix[3, 3] = 1
+    assert canvas.braille_codes(0).tolist() == [1 | 2 | 4 | 64, 8 | 128, 0, 0, 0]
+
+    # The last line only has the board's last two rows, and odd widths get a half filled character
+    canvas.matrix[9, 0] = 1
+    assert canvas.braille_codes(2).tolist() == [2, 0, 0, 0, 0]
+    canvas.canvas_width = 9
+    assert len(canvas.braille_codes(0)) == 5
+    assert canvas.canvas_lines == 3
+
+
+def test_braille_rendering(styled_canvas):
+    """Test that braille lines draw live cells as dots with one segment per run of equal characters."""
+    canvas = styled_canvas
+    canvas.canvas_width = canvas.canvas_height = 12
+    canvas.matrix = np.zeros((13, 13), dtype=np.uint8)
+    canvas.set_display_mode("braille")
+    canvas.matrix[4:8, 4:8] = 1
+    strip = canvas.render_line(1)
+    assert strip.cell_length == 6
+    assert [(segment.text, segment.style) for segment in strip] == [
+        ("\u2800\u2800", canvas.braille_style),
+        ("\u28ff\u28ff", canvas.braille_style),
+        ("\u2800\u2800", canvas.braille_style),
+    ]
+    assert canvas.braille_style.color == BLACK.bgcolor
+    assert canvas.braille_style.bgcolor == WHITE.bgcolor
+
+    # The cursor shows its character in reverse
+    canvas.cursor_square = Offset(5, 6)
+    segments = list(canvas.render_line(1))
+    assert segments[1].text == "\u28ff"
+    assert segments[1].style.reverse
+    assert canvas.get_square_region(Offset(5, 6)) == Region(2, 1, 1, 1)
@@ -0,0 +1,132 @@
+"""Tests for life-like B/S rules and their lookup tables."""
+import json
+from unittest.mock import mock_open, patch
+import numpy as np
+import pytest
+from src.textual_game_of_life.engines import ENGINES, create_engine
+from src.textual_game_of_life.hashlife import HashlifeEngine
+from src.textual_game_of_life.rules import Rule
+
+RULES = ["B3/S23", "B36/S23", "B3678/S34678", "B2/S", "B0123478/S34678"]
+
+
+def reference_generation(grid: np.ndarray, rule: Rule) -> np.ndarray:
+    # Straightforward toroidal implementation to compare the engines against
+    counts = sum(np.roll(np.roll(grid, dy, axis=0), dx, axis=1) for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - grid
+    born = np.isin(counts, list(rule.birth)) & (grid == 0)
+    survives = np.isin(counts, list(rule.survival)) & (grid == 1)
+    return (born | survives).astype(np.int8)
+
+
+def test_parse_notations():
+    """Test that B/S, S/B and named rules all parse to the same rule."""
+    assert Rule.parse("B36/S23") == Rule({3, 6}, {2, 3})
+    assert Rule.parse("b36/s23") == Rule({3, 6}, {2, 3})
+    assert Rule.parse("S23/B36") == Rule({3, 6}, {2, 3})
+    assert Rule.parse("23/36") == Rule({3, 6}, {2, 3})
+    assert Rule.parse("HighLife") == Rule({3, 6}, {2, 3})
+    assert Rule.parse("seeds") == Rule({2}, set())
+
+
+def test_rule_string_round_trip():
+    """Test that a rule prints in canonical B/S notation."""
+    assert str(Rule.parse("S8372/B0")) == "B0/S2378"
+    assert Rule.parse(str(Rule.parse("daynight"))) == Rule.parse("B3678/S34678")
+
+
+@pytest.mark.parametrize("text", ["", "B3", "B3/S23/C3", "B9/S23", "X3/S23", "B3/B4", "B3a/S23"])
+def test_invalid_rules(text):
+    """Test that malformed rulestrings are rejected."""
+    with pytest.raises(ValueError):
+        Rule.parse(text)
+
+
+def test_lookup_table():
+    """Test that the 18-entry table is indexed by state * 9 + neighbour count."""
+    table = Rule.parse("B3/S23").table
+    assert len(table) == 18
+    assert np.nonzero(table)[0].tolist() == [3, 11, 12]
+
+
+@pytest.mark.parametrize("rule_text", RULES)
+@pytest.mark.parametrize("engine_name", ["numpy", "bitpacked", "tiled"])
+def test_torus_engines_follow_rule(engine_name, rule_text):
+    """Test that every toroidal engine applies arbitrary rules like the reference implementation."""
+    rule = Rule.parse(rule_text)
+    grid = np.random.default_rng(len(rule_text)).integers(0, 2, (23, 70), dtype=np.int8)
+    engine = create_engine(engine_name, rule)
+
+    expected = grid
+    for _ in range(6):
+        expected = reference_generation(expected, rule)
+
+    assert np.array_equal(engine.advance(grid, 6), expected)
+
+
+@pytest.mark.parametrize("rule_text", ["B36/S23", "B2/S", "B3/S023"])
+def test_sparse_engine_follows_rule(rule_text):
+    """Test that the sparse engine applies rules, including survival with no neighbours."""
+    rule = Rule.parse(rule_text)
+    grid = np.zeros((80, 80), dtype=np.int8)
+    grid[36:44, 36:44] = np.random.default_rng(9).integers(0, 2, (8, 8), dtype=np.int8)
+
+    expected = grid
+    for _ in range(5):
+        expected = reference_generation(expected, rule)
+
+    assert np.array_equal(create_engine("sparse", rule).advance(grid, 5), expected)
+
+
+def test_unbounded_engines_reject_b0():
+    """Test that engines working on an unbounded plane refuse B0 rules."""
+    with pytest.raises(ValueError):
+        create_engine("sparse", Rule.parse("B0/S8"))
+    with pytest.raises(ValueError):
+        HashlifeEngine(Rule.parse("B0/S8"))
+
+
+def test_hashlife_follows_rule():
+    """Test that Hashlife applies the rule it was created with."""
+    rule = Rule.parse("highlife")
+    soup = np.random.default_rng(11).integers(0, 2, (8, 8), dtype=np.int8)
+    board = np.zeros((72, 72), dtype=np.int8)
+    board[32:40, 32:40] = soup
+
+    hashlife = HashlifeEngine(rule)
+    hashlife.load_array(soup, 0, 0)
+    hashlife.jump(4)
+
+    expected = create_engine("numpy", rule).advance(board, 16)
+    assert np.array_equal(hashlife.window(-32, -32, 72, 72), expected)
+    assert "#R B36/S23" in hashlife.write_macrocell()
+
+
+def test_canvas_rule(canvas):
+    """Test that the canvas rule can be changed and keeps the selected engine."""
+    canvas.set_rule("seeds")
+    assert canvas.rule == Rule.parse("B2/S")
+    assert canvas.engine.rule == canvas.rule
+    assert canvas.engine.name in ENGINES
+
+    # Seeds: two neighbouring cells die and give birth to four others
+    canvas.toggle_cell(4, 4)
+    canvas.toggle_cell(5, 4)
+    new_matrix = canvas.get_next_generation()
+    assert new_matrix[4][4] == 0
+    assert new_matrix.sum() == 4
+
+
+def test_save_records_rule(app):
+    """Test that saving and loading a game keeps its rule."""
+    app.canvas.set_rule("highlife")
+
+    with patch("builtins.open", mock_open()) as mock_file:
+        app.action_save()
+        written = "".join(call.args[0] for call in mock_file().write.call_args_list)
+    assert json.loads(written)["rule"] == "B36/S23"
+
+    app.canvas.set_rule("life")
+    with patch("os.path.exists", return_value=True):
+        with patch("builtins.open", mock_open(read_data=written)):
+            app.action_load()
+    assert app.canvas.rule == Rule.parse("B36/S23")
@@ -0,0 +1,370 @@
+"""Tests for running the simulation on a background thread."""
+import math
+import random
+import time
+import numpy as np
+import pytest
+from textual.geometry import Region
+from src.textual_game_of_life.canvas import Canvas
+from src.textual_game_of_life.engines import NumPyEngine, create_engine
+from src.textual_game_of_life.simulation import Mailbox, SimulationThread, Snapshot
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until the condition holds, failing after the timeout."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_mailbox_keeps_latest():
+    """Test that the mailbox holds only the newest snapshot and empties when read."""
+    mailbox = Mailbox()
+    assert mailbox.take() is None
+    for generation in range(3):
+        mailbox.post(Snapshot(np.zeros((2, 2), dtype=np.uint8), generation, 0, np.zeros(2, dtype=bool)))
+    snapshot = mailbox.take()
+    assert snapshot is not None
+    assert snapshot.generation == 2
+    assert mailbox.take() is None
+
+
+def test_mailbox_merges_changed_rows():
+    """Test that a snapshot replacing an unread one of the same epoch also reports its changed rows."""
+    mailbox = Mailbox()
+    cells = np.zeros((3, 3), dtype=np.uint8)
+    mailbox.post(Snapshot(cells.copy(), 1, 0, np.array([True, False, False])))
+    mailbox.post(Snapshot(cells.copy(), 2, 0, np.array([False, False, True])))
+    snapshot = mailbox.take()
+    assert snapshot is not None
+    assert snapshot.changed_rows.tolist() == [True, False, True]
+
+    # Snapshots of an older epoch are dropped by the reader, so their rows are too
+    mailbox.post(Snapshot(cells.copy(), 3, 0, np.array([True, False, False])))
+    mailbox.post(Snapshot(cells.copy(), 1, 1, np.array([False, True, False])))
+    snapshot = mailbox.take()
+    assert snapshot is not None
+    assert snapshot.changed_rows.tolist() == [False, True, False]
+
+
+def test_thread_reports_changed_rows():
+    """Test that the thread reports the rows each batch changed."""
+    blinker = np.zeros((10, 10), dtype=np.uint8)
+    blinker[5, 4:7] = 1
+    simulation = SimulationThread(create_engine("numpy"), blinker, interval=0.0, spare=1)
+    changed = simulation.changed_rows(blinker, create_engine("numpy").advance(blinker, 1))
+    assert np.flatnonzero(changed).tolist() == [4, 5, 6]
+    simulation.start()
+    try:
+        wait_for(lambda: simulation.mailbox._snapshot is not None)
+        snapshot = simulation.mailbox.take()
+    finally:
+        simulation.stop()
+    assert snapshot is not None
+    assert np.flatnonzero(snapshot.changed_rows).tolist() == [4, 5, 6]
+
+
+def test_snapshot_is_read_only():
+    """Test that snapshot cells can't be written."""
+    snapshot = Snapshot(np.zeros((2, 2), dtype=np.uint8), 1, 0, np.zeros(2, dtype=bool))
+    with pytest.raises(ValueError):
+        snapshot.cells[0, 0] = 1
+
+
+def test_thread_matches_engine():
+    """Test that the thread's generations are the engine's generations."""
+    start = np.random.default_rng(0).integers(0, 2, (30, 30), dtype=np.uint8)
+    simulation = SimulationThread(create_engine("numpy"), start, interval=0.0, batch=2)
+    simulation.start()
+    try:
+        snapshot = None
+        while snapshot is None or snapshot.generation < 10:
+            wait_for(lambda: simulation.mailbox._snapshot is not None)
+            snapshot = simulation.mailbox.take()
+    finally:
+        simulation.stop()
+    assert not simulation.alive
+    assert snapshot.generation % 2 == 0
+    assert np.array_equal(snapshot.cells, create_engine("numpy").advance(start, snapshot.generation))
+
+
+def test_load_starts_new_epoch():
+    """Test that loading a board marks later snapshots with a new epoch."""
+    simulation = SimulationThread(create_engine("numpy"), np.zeros((10, 10), dtype=np.uint8), interval=0.001)
+    simulation.start()
+    try:
+        blinker = np.zeros((10, 10), dtype=np.uint8)
+        blinker[5, 4:7] = 1
+        assert simulation.load(blinker) == 1
+        wait_for(lambda: (snapshot := simulation.mailbox.take()) is not None and snapshot.epoch == 1)
+    finally:
+        simulation.stop()
+    assert simulation.generation > 0
+
+
+def test_canvas_shows_thread_generations(canvas):
+    """Test that the canvas picks up generations computed by the simulation thread."""
+    canvas.toggle_cell(4, 5)
+    canvas.toggle_cell(5, 5)
+    canvas.toggle_cell(6, 5)
+    canvas.refresh_interval = 10.0
+    simulation = canvas.start_simulation()
+    try:
+        # The first batch is computed straight away, the next one only after the interval
+        wait_for(lambda: simulation.generation == 1)
+        assert canvas.collect_generation()
+        assert canvas.matrix[4:7, 5].tolist() == [1, 1, 1]
+        assert canvas.matrix[5, 4] == 0
+        assert not canvas.collect_generation()
+    finally:
+        canvas.stop_simulation(simulation)
+    assert canvas.simulation is None
+
+
+def test_canvas_edits_reach_thread(canvas):
+    """Test that cells drawn while running are handed to the simulation thread."""
+    canvas.refresh_interval = 0.2
+    simulation = canvas.start_simulation()
+    try:
+        canvas.toggle_cell(4, 5)
+        canvas.toggle_cell(5, 5)
+        canvas.toggle_cell(6, 5)
+        wait_for(lambda: simulation.mailbox._snapshot is not None)
+        # The snapshot predates the edit, so it is dropped and the edited board loaded
+        assert not canvas.collect_generation()
+        assert simulation.epoch == 1
+        assert canvas.matrix[5, 4:7].tolist() == [1, 1, 1]
+
+        wait_for(lambda: canvas.collect_generation())
+        assert canvas.matrix[4:7, 5].tolist() == [1, 1, 1]
+    finally:
+        canvas.stop_simulation(simulation)
+
+
+@pytest.mark.parametrize("engine", ["bitpacked", "tiled"])
+def test_canvas_edits_match_numpy(engine):
+    """Test that drawing and loading patterns, between steps and while running, gives the NumPy engine's generations."""
+    canvas = Canvas(width=40, height=30, engine=engine)
+    canvas.random()
+    random.seed(0)
+
+    def step_and_compare():
+        expected = NumPyEngine().next_generation(canvas.matrix[:30, :40])
+        canvas.step()
+        assert np.array_equal(canvas.matrix[:30, :40], expected)
+
+    for generation in range(12):
+        if generation % 3 == 1:
+            canvas.toggle_cell(generation, 7)
+            canvas.toggle_cell(generation + 1, 7)
+        if generation == 5:
+            canvas.add_random_glider()
+        if generation == 8:
+            canvas.load_pattern(np.ones((3, 8), dtype=np.uint8))
+        step_and_compare()
+
+    canvas.refresh_interval = 0.0
+    simulation = canvas.start_simulation()
+    try:
+        wait_for(canvas.collect_generation)
+        canvas.toggle_cell(20, 20)
+        canvas.add_random_pulsar()
+        wait_for(canvas.collect_generation)
+    finally:
+        canvas.stop_simulation(simulation)
+    for _ in range(3):
+        step_and_compare()
+        canvas.toggle_cell(2, 2)
+
+
+def test_thread_keeps_spare_margin():
+    """Test that snapshots have the requested spare rows and columns, always dead."""
+    start = np.random.default_rng(1).integers(0, 2, (12, 15), dtype=np.uint8)
+    simulation = SimulationThread(create_engine("numpy"), start, interval=0.0, spare=1)
+    simulation.start()
+    try:
+        wait_for(lambda: simulation.mailbox._snapshot is not None)
+        snapshot = simulation.mailbox.take()
+    finally:
+        simulation.stop()
+    assert snapshot.cells.shape == (13, 16)
+    assert not snapshot.cells[12].any()
+    assert not snapshot.cells[:, 15].any()
+    assert np.array_equal(snapshot.cells[:12, :15], create_engine("numpy").advance(start, snapshot.generation))
+
+
+def test_canvas_adopts_snapshots(canvas):
+    """Test that shown generations are the thread's snapshots, copied only when edited."""
+    for x in (4, 5, 6):
+        canvas.toggle_cell(x, 5)
+    canvas.refresh_interval = 10.0
+    simulation = canvas.start_simulation()
+    try:
+        wait_for(lambda: simulation.mailbox._snapshot is not None)
+        snapshot = simulation.mailbox._snapshot
+        assert canvas.collect_generation()
+        assert canvas.matrix is snapshot.cells
+        assert not canvas.matrix.flags.writeable
+
+        canvas.toggle_cell(0, 0)
+        assert canvas.matrix is not snapshot.cells
+        assert canvas.matrix[0, 0] == 1
+        assert not snapshot.cells[0, 0]
+    finally:
+        canvas.stop_simulation(simulation)
+
+    # Stepping after running writes into a buffer of its own
+    canvas.step()
+    canvas.step()
+    assert canvas.back_matrix.flags.writeable
+
+
+def test_step_waits_for_thread(canvas):
+    """Test that stepping is ignored while the simulation thread owns the engine."""
+    canvas.toggle_cell(4, 5)
+    canvas.refresh_interval = 10.0
+    simulation = canvas.start_simulation()
+    try:
+        canvas.step()
+        assert canvas.matrix[5, 4] == 1
+    finally:
+        canvas.stop_simulation(simulation)
+    canvas.step()
+    assert canvas.matrix[5, 4] == 0
+
+
+def test_plan_batch_follows_target_rate():
+    """Test that batches make up what the rate asks for since the anchor, capped by the measured cost."""
+    simulation = SimulationThread(create_engine("numpy"), np.zeros((10, 10), dtype=np.uint8), 0.1, target_rate=100)
+    assert simulation.plan_batch(0.0) == 0
+    simulation.cost = 0.001
+    assert simulation.plan_batch(0.1) == 10
+    simulation.generation += 10
+    # Rounding doesn't drift: 2.5 generations are owed after 0.125s
+    assert simulation.plan_batch(0.125) == 2
+    simulation.generation += 2
+    assert simulation.plan_batch(0.13) == 1
+
+    # When generations cost more than the rate allows, batches fill the interval and
+    # the missed generations are not made up later
+    simulation.cost = 0.02
+    assert simulation.plan_batch(1.0) == 5
+    simulation.generation += 5
+    assert simulation.plan_batch(1.1) == 5
+
+
+def test_plan_batch_as_fast_as_possible():
+    """Test that an unlimited rate fills each interval with as many generations as fit."""
+    simulation = SimulationThread(create_engine("numpy"), np.zeros((10, 10), dtype=np.uint8), 0.1, target_rate=math.inf)
+    assert simulation.plan_batch(0.0) == 1
+    simulation.cost = 0.004
+    assert simulation.plan_batch(0.0) == 25
+    assert simulation.wait_time(0.0, 0.05) == 0.0
+
+
+def test_thread_reaches_target_rate():
+    """Test that the thread runs close to the requested generations per second."""
+    simulation = SimulationThread(create_engine("numpy"), np.zeros((20, 20), dtype=np.uint8), 0.02, target_rate=200)
+    simulation.start()
+    time.sleep(0.5)
+    simulation.stop()
+    assert 60 <= simulation.generation <= 110
+    assert simulation.achieved_rate == pytest.approx(200, rel=0.5)
+
+
+def test_canvas_rate_text(canvas):
+    """Test that the overlay shows the achieved and requested rates while running."""
+    assert canvas.rate_text() is None
+    canvas.target_rate = 50.0
+    canvas.refresh_interval = 10.0
+    simulation = canvas.start_simulation()
+    try:
+        assert simulation.interval == canvas.FRAME_BUDGET
+        assert canvas.rate_text().endswith(" / 50 generations/sec")
+        canvas.target_rate = math.inf
+        canvas.update_simulation_speed()
+        assert simulation.target_rate == math.inf
+        assert canvas.rate_text().endswith(" / max generations/sec")
+    finally:
+        canvas.stop_simulation(simulation)
+    assert canvas.rate_text() is None
+
+
+def test_dirty_regions_flush_once(canvas, monkeypatch):
+    """Test that regions marked between frames are repainted with a single refresh."""
+    refreshes = []
+    monkeypatch.setattr(canvas, "refresh", lambda *regions: refreshes.append(regions))
+    first, second = Region(0, 0, 2, 1), Region(2, 0, 2, 1)
+    canvas.mark_dirty(first)
+    canvas.mark_dirty(second, first)
+    assert canvas.flush_dirty() == 2
+    assert len(refreshes) == 1
+    assert set(refreshes[0]) == {first, second}
+    assert canvas.flush_dirty() == 0
+    assert len(refreshes) == 1
+
+    # Marking the whole canvas swallows the regions around it
+    canvas.mark_dirty(first)
+    canvas.mark_dirty()
+    canvas.mark_dirty(second)
+    assert canvas.flush_dirty() == 1
+    assert refreshes[-1] == ()
+
+
+def test_step_refreshes_once(canvas, monkeypatch):
+    """Test that a step's changed cells are refreshed with one call, one region per changed row."""
+    for x in (4, 5, 6):
+        canvas.toggle_cell(x, 5)
+    refreshes = []
+    monkeypatch.setattr(canvas, "refresh", lambda *regions: refreshes.append(regions))
+    canvas.step()
+    assert len(refreshes) == 1
+    # The blinker's ends die and a cell is born above and below the middle
+    assert set(refreshes[0]) == {Region(10, 4, 2, 1), Region(8, 5, 6, 1), Region(10, 6, 2, 1)}
+
+
+def test_changed_spans(canvas):
+    """Test that each changed row reports its first and last changed column."""
+    old = canvas.matrix.copy()
+    canvas.matrix[2, 3] = 1
+    canvas.matrix[2, 7] = 1
+    canvas.matrix[8, 0] = 1
+    rows, first, last = canvas.changed_spans(old)
+    assert rows.tolist() == [2, 8]
+    assert first.tolist() == [3, 0]
+    assert last.tolist() == [7, 0]
+
+    rows, _, _ = canvas.changed_spans(canvas.matrix)
+    assert len(rows) == 0
+
+
+def test_changed_spans_continuous(canvas):
+    """Test that changes to continuous cells are found however small."""
+    canvas.set_rule("orbium")
+    old = canvas.matrix.copy()
+    canvas.matrix[4, 6] = np.float32(1e-6)
+    rows, first, last = canvas.changed_spans(old)
+    assert (rows.tolist(), first.tolist(), last.tolist()) == ([4], [6], [6])
+
+
+def test_frames_skip_intermediate_generations(canvas, monkeypatch):
+    """Test that only the newest generation is shown when several were computed since the last frame."""
+    for x in (4, 5, 6):
+        canvas.toggle_cell(x, 5)
+    canvas.target_rate = math.inf
+    refreshes = []
+    monkeypatch.setattr(canvas, "refresh", lambda *regions: refreshes.append(regions))
+    simulation = canvas.start_simulation()
+    try:
+        wait_for(lambda: simulation.generation >= 5)
+        assert canvas.collect_generation()
+        assert refreshes == []
+        _ = canvas.flush_dirty()
+        assert len(refreshes) <= 1
+    finally:
+        canvas.stop_simulation(simulation)
+    # The blinker has period 2
+    expected = [1, 1, 1] if canvas._shown_generation % 2 == 0 else [0, 1, 0]
+    assert canvas._shown_generation >= 5
+    assert canvas.matrix[5, 4:7].tolist() == expected
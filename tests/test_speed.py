@@ -1,5 +1,7 @@
 """Tests for simulation speed control."""
+import math
 import pytest
+from src.textual_game_of_life.canvas import Canvas
 from src.textual_game_of_life.tui import CellularAutomatonTui
 
 
@@ -65,3 +67,39 @@ def test_speed_and_generation(app):
     # For maximum speed, multiple generations might be computed in a single step
     # This is hard to test precisely, but we can verify that the pattern changed
     assert app.canvas.matrix[5, 5] == 1, "Blinker should have evolved"
+
+
+def test_target_rate_speed(app):
+    """Test that faster and slower double and halve a target rate."""
+    app.canvas.target_rate = 8.0
+    app.action_increase_speed()
+    assert app.canvas.target_rate == 16.0
+    app.action_decrease_speed()
+    app.action_decrease_speed()
+    app.action_decrease_speed()
+    app.action_decrease_speed()
+    assert app.canvas.target_rate == 1.0
+    app.action_decrease_speed()
+    assert app.canvas.target_rate == 1.0
+
+
+def test_max_speed(app):
+    """Test that max speed toggles as-fast-as-possible mode and slower leaves it."""
+    app.action_max_speed()
+    assert math.isinf(app.canvas.target_rate)
+    app.action_increase_speed()
+    assert math.isinf(app.canvas.target_rate)
+    app.action_max_speed()
+    assert app.canvas.target_rate is None
+    assert app.canvas.refresh_interval == 0.5
+
+    app.action_max_speed()
+    app.action_decrease_speed()
+    assert app.canvas.target_rate == app.canvas.MIN_TARGET_RATE
+
+
+def test_rate_zero_is_unlimited():
+    """Test that a rate of 0 asks for as fast as possible."""
+    assert math.isinf(Canvas(rate=0).target_rate)
+    assert Canvas(rate=30).target_rate == 30
+    assert Canvas().target_rate is None
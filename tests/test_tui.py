@@ -1,6 +1,6 @@
 import json
 import os
-from unittest.mock import mock_open, patch
+from unittest.mock import MagicMock, mock_open, patch
 import numpy as np
 
 
@@ -102,3 +102,35 @@ def test_save_load_game(app, monkeypatch):
         assert app.canvas.canvas_width == test_data["canvas_width"]
         assert app.canvas.canvas_height == test_data["canvas_height"]
         assert app.canvas.matrix.tolist() == test_data["matrix"]
+
+
+def test_cycle_display(app):
+    """Test that the display action cycles through the display modes."""
+    assert app.canvas.display_mode == "blocks"
+    app.action_cycle_display()
+    assert app.canvas.display_mode == "half"
+    assert app.canvas.message == "Display mode: half"
+    app.action_cycle_display()
+    assert app.canvas.display_mode == "braille"
+    app.action_cycle_display()
+    assert app.canvas.display_mode == "blocks"
+
+
+def test_pan_action(app):
+    """Test that the pan action moves the view by a quarter of it."""
+    app.canvas.pan_steps = MagicMock()
+    app.action_pan(1, -1)
+    app.canvas.pan_steps.assert_called_once_with(1, -1)
+
+
+def test_zoom_actions(app):
+    """Test that the zoom actions zoom by powers of two and switch how blocks are shown."""
+    app.action_zoom_out()
+    app.action_zoom_out()
+    assert app.canvas.zoom == 4
+    assert app.canvas.message == "Zoom 1:4"
+    app.action_zoom_in()
+    assert app.canvas.zoom == 2
+    app.action_cycle_zoom_reduce()
+    assert app.canvas.zoom_reduce == "density"
+    assert app.canvas.message == "Zoomed out blocks shaded by density"
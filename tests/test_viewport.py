@@ -0,0 +1,179 @@
+"""Tests for the view onto boards bigger than the terminal."""
+from unittest.mock import MagicMock, PropertyMock, patch
+import pytest
+from rich.style import Style
+from textual.geometry import Offset, Region, Size
+from src.textual_game_of_life.canvas import Canvas
+
+WHITE = Style(bgcolor="#ffffff")
+BLACK = Style(bgcolor="#000000")
+
+
+@pytest.fixture
+def big_canvas():
+    """Return a 40x30 canvas in a widget with room for 10x10 cells."""
+    with (
+        patch.object(Canvas, "white", new_callable=PropertyMock, return_value=WHITE),
+        patch.object(Canvas, "black", new_callable=PropertyMock, return_value=BLACK),
+        patch.object(Canvas, "cursor", new_callable=PropertyMock, return_value=Style(bgcolor="red")),
+        patch.object(Canvas, "size", new_callable=PropertyMock, return_value=Size(20, 10)),
+    ):
+        canvas = Canvas(width=40, height=30)
+        canvas.cursor_square = Offset(-1, -1)
+        yield canvas
+
+
+def test_view_stays_on_board(big_canvas):
+    """Test that panning moves the view over the board without leaving it."""
+    canvas = big_canvas
+    assert canvas.view == Region(0, 0, 10, 10)
+    canvas.pan(5, 3)
+    assert canvas.view == Region(5, 3, 10, 10)
+    canvas.pan(100, 100)
+    assert canvas.view == Region(30, 20, 10, 10)
+    # A quarter of the view per step
+    canvas.pan_steps(-1, -2)
+    assert canvas.view == Region(28, 16, 10, 10)
+    canvas.pan(-100, 0)
+    assert canvas.view_origin == Offset(0, 16)
+
+
+def test_render_reads_view_only(big_canvas):
+    """Test that lines are rendered from the cells in view, however big the board."""
+    canvas = big_canvas
+    canvas.matrix[25, 33] = 1
+    canvas.pan(30, 20)
+    line = canvas.render_line(5)
+    assert line.cell_length == 20
+    styles = [segment.style for segment in line for _ in range(len(segment.text) // 2)]
+    assert styles == [WHITE, WHITE, WHITE, BLACK] + [WHITE] * 6
+    assert len(canvas.row_states(25)) == 10
+
+    # The pointer and the regions to refresh are relative to the view
+    assert canvas.cell_at(MagicMock(pointer_x=6.0, pointer_y=5.0)) == Offset(33, 25)
+    assert canvas.get_square_region(Offset(33, 25)) == Region(6, 5, 2, 1)
+
+
+def test_changes_out_of_view_not_refreshed(big_canvas):
+    """Test that only changes inside the view are refreshed."""
+    canvas = big_canvas
+    canvas.pan(10, 10)
+    old = canvas.matrix.copy()
+    canvas.matrix[0, 0] = 1
+    canvas.matrix[12, 11:14] = 1
+    rows, first, last = canvas.changed_spans(old)
+    assert (rows.tolist(), first.tolist(), last.tolist()) == ([12], [11], [13])
+
+    canvas.mark_dirty = MagicMock()
+    canvas.refresh_changes(old)
+    assert canvas.mark_dirty.call_args.args == (Region(2, 2, 6, 1),)
+
+
+def test_mouse_wheel_pans(big_canvas):
+    """Test that the mouse wheel pans the view, sideways with shift."""
+    canvas = big_canvas
+    canvas.on_mouse_scroll_down(MagicMock(shift=False))
+    assert canvas.view.offset == Offset(0, canvas.WHEEL_CELLS)
+    canvas.on_mouse_scroll_down(MagicMock(shift=True))
+    canvas.on_mouse_scroll_up(MagicMock(shift=False))
+    assert canvas.view.offset == Offset(canvas.WHEEL_CELLS, 0)
+
+
+def test_right_drag_pans(big_canvas):
+    """Test that dragging with the right button keeps the grabbed cell under the pointer."""
+    canvas = big_canvas
+    canvas.capture_mouse = MagicMock()
+    canvas.release_mouse = MagicMock()
+    canvas.pan(10, 10)
+    canvas.on_mouse_down(MagicMock(button=3, pointer_x=10.0, pointer_y=5.0))
+    canvas.on_mouse_move(MagicMock(button=3, pointer_x=4.0, pointer_y=2.0))
+    assert canvas.view.offset == Offset(13, 13)
+    canvas.on_mouse_up(MagicMock())
+    canvas.on_mouse_move(MagicMock(button=0, pointer_x=0.0, pointer_y=0.0))
+    assert canvas.view.offset == Offset(13, 13)
+    assert canvas.cursor_square == Offset(13, 13)
+
+
+def test_pyramid_reduces_blocks(big_canvas):
+    """Test that each zoom level keeps the largest cell or the live cell count of each block."""
+    canvas = big_canvas
+    canvas.matrix[0, 0] = 1
+    canvas.matrix[2:4, 2:4] = 1
+    canvas.matrix[29, 39] = 1
+    canvas.board_changed()
+    assert canvas.pyramid_level(2)[:2, :2].tolist() == [[1, 0], [0, 1]]
+    assert canvas.pyramid_level(4)[0, 0] == 1
+    # Blocks past the edges of the board count as dead
+    assert canvas.pyramid_level(32).shape == (1, 2)
+    assert canvas.pyramid_level(32).tolist() == [[1, 1]]
+
+    canvas.cycle_zoom_reduce()
+    assert canvas.pyramid_level(2)[:2, :2].tolist() == [[1, 0], [0, 4]]
+    assert canvas.pyramid_level(4)[0, 0] == 5
+    assert canvas.pyramid_level(64).tolist() == [[6]]
+
+
+def test_pyramid_cached_until_board_changes(big_canvas):
+    """Test that the reduced board is reused while panning and rebuilt once the board changes."""
+    canvas = big_canvas
+    level = canvas.pyramid_level(4)
+    canvas.zoom = 2
+    canvas.pan(4, 4)
+    _ = canvas.render_line(0)
+    assert canvas.pyramid_level(4) is level
+
+    canvas.toggle_cell(5, 5)
+    assert canvas.pyramid_level(4) is not level
+    assert canvas.pyramid_level(4)[1, 1] == 1
+
+    # Steps swap in a new generation
+    level = canvas.pyramid_level(2)
+    canvas.step()
+    assert canvas.pyramid_level(2) is not level
+
+
+def test_zoomed_rendering(big_canvas):
+    """Test that zoomed out, each drawn cell is a block and the view covers more of the board."""
+    canvas = big_canvas
+    canvas.matrix[9, 21] = 1
+    canvas.board_changed()
+    assert canvas.zoom_out() == 2
+    assert canvas.view == Region(0, 0, 20, 20)
+    assert canvas.shown_view == Region(0, 0, 10, 10)
+    canvas.pan(20, 0)
+    assert canvas.view == Region(20, 0, 20, 20)
+    line = canvas.render_line(4)
+    assert line.cell_length == 20
+    styles = [segment.style for segment in line for _ in range(len(segment.text) // 2)]
+    assert styles == [BLACK] + [WHITE] * 9
+
+    # The pointer picks the block's first cell, and a cell repaints its block
+    assert canvas.cell_at(MagicMock(pointer_x=0.0, pointer_y=4.0)) == Offset(20, 8)
+    assert canvas.get_square_region(Offset(21, 9)) == Region(0, 4, 2, 1)
+    canvas.cursor_square = Offset(21, 9)
+    assert canvas.render_line(4).crop(0, 2).text == "  "
+    assert list(canvas.render_line(4))[0].style.bgcolor == canvas.cursor_style.bgcolor
+
+    # Zooming is capped, and zooming back in keeps the middle of the view
+    for _ in range(10):
+        _ = canvas.zoom_out()
+    assert canvas.zoom == canvas.MAX_ZOOM
+    assert canvas.view == Region(0, 0, 40, 30)
+    assert canvas.zoom_in() == 32
+    canvas.set_zoom(1)
+    assert canvas.view == Region(15, 10, 10, 10)
+
+
+def test_zoomed_density_shading(big_canvas):
+    """Test that with density reduction, blocks are shaded by their live fraction."""
+    canvas = big_canvas
+    canvas.matrix[0:2, 0] = 1
+    canvas.matrix[0:2, 2:4] = 1
+    canvas.board_changed()
+    canvas.set_zoom(2)
+    assert canvas.cycle_zoom_reduce() == "density"
+    assert canvas.shaded
+    assert canvas.row_states(0)[:3].tolist() == [8, 15, 0]
+    assert len(canvas.palette) == canvas.GRADIENT_LEVELS
+    assert canvas.cycle_zoom_reduce() == "max"
+    assert canvas.row_states(0)[:3].tolist() == [1, 1, 0]